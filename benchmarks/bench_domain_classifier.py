@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+问题域分类基准测试
+
+随机生成不同规模的触发词表（中英文混合），比较：
+    逐词查找  对每个触发词做一次 `in` 检查（原 if 链的做法），耗时随词表规模线性增长
+    自动机    DomainClassifier（Aho-Corasick），对问题扫描一遍，耗时只与问题长度有关
+输出各规模下的构建耗时、单次分类耗时与吞吐量。
+
+用法：
+    python benchmarks/bench_domain_classifier.py --domains 100 300 1000 --terms-per-domain 10 --queries 2000
+"""
+import sys
+import argparse
+import random
+import time
+
+# 设置UTF-8编码（Windows兼容）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.domain_classifier import DomainClassifier
+
+CJK = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经"
+ASCII = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_vocabulary(rng: random.Random, domains: int, terms_per_domain: int) -> dict:
+    vocabulary = {}
+    for d in range(domains):
+        terms = {}
+        while len(terms) < terms_per_domain:
+            if rng.random() < 0.5:
+                term = "".join(rng.choice(CJK) for _ in range(rng.randint(2, 4)))
+            else:
+                term = "".join(rng.choice(ASCII) for _ in range(rng.randint(4, 9)))
+            terms[term] = round(rng.uniform(0.5, 2.0), 2)
+        vocabulary[f"domain_{d}"] = terms
+    return vocabulary
+
+
+def make_queries(rng: random.Random, vocabulary: dict, count: int, length: int) -> list:
+    all_terms = [term for terms in vocabulary.values() for term in terms]
+    queries = []
+    for _ in range(count):
+        parts = []
+        while sum(map(len, parts)) < length:
+            parts.append(rng.choice(all_terms) if rng.random() < 0.2 else rng.choice(CJK) * 3)
+        queries.append(" ".join(parts)[:length])
+    return queries
+
+
+def naive_classify(vocabulary: dict, query: str) -> str:
+    query = query.lower()
+    scores = {}
+    for domain, terms in vocabulary.items():
+        for term, weight in terms.items():
+            if term in query:
+                scores[domain] = scores.get(domain, 0.0) + weight
+    return max(scores, key=scores.get) if scores else "default"
+
+
+def timed(classify, queries: list) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        classify(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--domains", type=int, nargs="+", default=[100, 300, 1000], help="问题域数量（可给多个）")
+    parser.add_argument("--terms-per-domain", type=int, default=10, help="每个问题域的触发词数")
+    parser.add_argument("--queries", type=int, default=2000, help="每个规模的分类次数")
+    parser.add_argument("--length", type=int, default=60, help="问题长度（字符）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 86)
+    print(f"问题域分类（问题长度 {args.length} 字符，每个规模 {args.queries} 次）")
+    print("=" * 86)
+    print(
+        f"{'问题域':>8}{'触发词':>10}{'构建(ms)':>12}{'逐词查找(μs)':>16}"
+        f"{'自动机(μs)':>14}{'加速比':>10}{'吞吐(次/秒)':>14}"
+    )
+    for domains in args.domains:
+        rng = random.Random(args.seed)
+        vocabulary = make_vocabulary(rng, domains, args.terms_per_domain)
+        queries = make_queries(rng, vocabulary, args.queries, args.length)
+
+        start = time.perf_counter()
+        classifier = DomainClassifier(vocabulary)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        naive = timed(lambda query: naive_classify(vocabulary, query), queries)
+        automaton = timed(classifier.classify, queries)
+        print(
+            f"{domains:>8}{classifier.term_count:>10}{build_ms:>12.1f}{naive:>16.1f}"
+            f"{automaton:>14.1f}{naive / automaton:>9.1f}x{1e6 / automaton:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+思想分布向量检索基准测试
+
+随机生成不同规模的思想分布条目（常用汉字组成的三段观点），构建 IdeaIndex 后：
+    查询  取某个条目的一个观点截去首尾作为问题，统计 top-k 检索耗时（p50 / p95）与 top-1 命中率
+    插入  在已构建的索引上逐条插入新条目的耗时（p50 与均值，均值含缓冲区转段与段合并）
+需要 numpy。
+
+用法：
+    python benchmarks/bench_idea_index.py --sizes 1000 10000 100000 --queries 500
+"""
+import sys
+import argparse
+import random
+import time
+
+# 设置UTF-8编码（Windows兼容）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.idea_index import IdeaIndex
+
+# 常用汉字区段
+ALPHABET = [chr(0x4E00 + i) for i in range(3000)]
+
+
+def phrase(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def make_entries(rng: random.Random, count: int, length: int) -> list:
+    return [
+        (f"domain_{i}", "，".join(phrase(rng, length) for _ in range(3)))
+        for i in range(count)
+    ]
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def bench(size: int, args) -> dict:
+    rng = random.Random(args.seed)
+    entries = make_entries(rng, size, args.length)
+
+    start = time.perf_counter()
+    index = IdeaIndex()
+    index.add_many(entries)
+    build_s = time.perf_counter() - start
+
+    latencies, hits = [], 0
+    for _ in range(args.queries):
+        key, text = entries[rng.randrange(size)]
+        view = rng.choice(text.split("，"))
+        query = view[2:-2] + "？"
+        start = time.perf_counter()
+        results = index.search(query, k=args.k)
+        latencies.append(time.perf_counter() - start)
+        hits += bool(results) and results[0][0] == key
+
+    inserts = []
+    for i in range(args.inserts):
+        text = "，".join(phrase(rng, args.length) for _ in range(3))
+        start = time.perf_counter()
+        index.add(f"new_{i}", text)
+        inserts.append(time.perf_counter() - start)
+
+    return {
+        "build_s": build_s,
+        "p50_us": percentile(latencies, 0.5) * 1e6,
+        "p95_us": percentile(latencies, 0.95) * 1e6,
+        "recall": hits / args.queries,
+        "insert_p50_us": percentile(inserts, 0.5) * 1e6,
+        "insert_mean_us": sum(inserts) / len(inserts) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="索引中的条目数（可给多个）")
+    parser.add_argument("--queries", type=int, default=500, help="每个规模的查询次数")
+    parser.add_argument("--inserts", type=int, default=2000, help="每个规模的逐条插入次数")
+    parser.add_argument("--length", type=int, default=25, help="每个观点的字数")
+    parser.add_argument("--k", type=int, default=5, help="每次检索返回的条目数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("=" * 90)
+    print(f"思想分布向量检索（top-{args.k}，每个规模 {args.queries} 次查询、{args.inserts} 次插入）")
+    print("=" * 90)
+    print(
+        f"{'条目数':>8}{'构建(s)':>10}{'查询p50(μs)':>14}{'查询p95(μs)':>14}"
+        f"{'top-1命中率':>14}{'插入p50(μs)':>14}{'插入均值(μs)':>16}"
+    )
+    for size in args.sizes:
+        r = bench(size, args)
+        print(
+            f"{size:>8}{r['build_s']:>10.1f}{r['p50_us']:>14.0f}{r['p95_us']:>14.0f}"
+            f"{r['recall']:>14.1%}{r['insert_p50_us']:>14.0f}{r['insert_mean_us']:>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
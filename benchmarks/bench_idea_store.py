@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+思想分布目录基准测试
+
+生成不同规模的目录文件，比较：
+    整体加载  json 读入全部问题域构建字典（原先每个采样器在 __init__ 中构建字典的做法）
+    IdeaStore 内存映射 + 二分查找，打开耗时与规模无关
+输出打开耗时、首次（未缓存）查找与缓存命中的查找耗时。
+
+用法：
+    python benchmarks/bench_idea_store.py --sizes 1000 10000 100000 --lookups 2000
+"""
+import sys
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+# 设置UTF-8编码（Windows兼容）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.idea_store import IdeaStore, write_idea_store
+
+
+def make_distributions(count: int) -> dict:
+    return {
+        f"domain_{i:07d}": {
+            "mu": f"在法治框架下寻求平衡的主流观点（问题域 {i}）",
+            "positive_tail": f"主张激进变革的前沿观点（问题域 {i}）",
+            "negative_tail": f"强调传统与谨慎的保守观点（问题域 {i}）",
+        }
+        for i in range(count)
+    }
+
+
+def load_all(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return {record["domain"]: record for record in map(json.loads, f)}
+
+
+def bench(size: int, lookups: int, tmp: str) -> dict:
+    path = os.path.join(tmp, f"ideas_{size}.jsonl")
+    write_idea_store(make_distributions(size), path)
+    domains = [f"domain_{random.randrange(size):07d}" for _ in range(lookups)]
+
+    start = time.perf_counter()
+    load_all(path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    store = IdeaStore(path, cache_size=lookups)
+    open_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for domain in domains:
+        store.get(domain)
+    cold_us = (time.perf_counter() - start) / lookups * 1e6
+
+    start = time.perf_counter()
+    for domain in domains:
+        store.get(domain)
+    warm_us = (time.perf_counter() - start) / lookups * 1e6
+    store.close()
+
+    return {
+        "mb": os.path.getsize(path) / 1024 / 1024,
+        "load_ms": load_ms,
+        "open_ms": open_ms,
+        "cold_us": cold_us,
+        "warm_us": warm_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="目录中的问题域数量（可给多个）")
+    parser.add_argument("--lookups", type=int, default=2000, help="每个规模的查找次数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    print("=" * 84)
+    print(f"思想分布目录（每个规模随机查找 {args.lookups} 次）")
+    print("=" * 84)
+    print(
+        f"{'问题域':>10}{'文件(MB)':>10}{'整体加载(ms)':>16}{'打开(ms)':>12}"
+        f"{'首次查找(μs)':>16}{'缓存命中(μs)':>16}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            r = bench(size, args.lookups, tmp)
+            print(
+                f"{size:>10}{r['mb']:>10.1f}{r['load_ms']:>16.1f}{r['open_ms']:>12.3f}"
+                f"{r['cold_us']:>16.1f}{r['warm_us']:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+导入耗时基准测试（带回归预算）
+
+每个入口在全新的解释器中导入多次，取中位数与预算比较；
+同时检查可选 SDK（openai、dashscope、transformers、requests、aiohttp）未被导入。
+任一入口超出预算或导入了 SDK 时以非零状态退出，可直接用于 CI。
+
+用法：
+    python benchmarks/bench_import_time.py --runs 7
+    python benchmarks/bench_import_time.py --scale 2   # 在较慢的机器上放宽预算
+"""
+import sys
+import argparse
+import json
+import os
+import statistics
+import subprocess
+
+# 设置UTF-8编码（Windows兼容）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 入口 → 导入耗时预算（毫秒）
+# 惰性只在包入口（philosofia.__getattr__）；核心模块在顶部导入 asyncio、concurrent.futures 等标准库，
+# 预算包含这部分固定开销，用于发现可选 SDK 或其他重模块被提前导入
+BUDGETS_MS = {
+    "import philosofia": 10,
+    "from philosofia.core.llm_interface import MockLLM": 100,
+    "from philosofia import PhilosophicallyAugmentedAgentSystem": 120,
+}
+
+OPTIONAL_SDKS = ("openai", "dashscope", "transformers", "requests", "aiohttp")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "sdks": [m for m in {sdks!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str, runs: int) -> dict:
+    """在全新解释器中执行 statement，返回耗时中位数与被导入的 SDK"""
+    timings, sdks = [], set()
+    code = _PROBE.format(statement=statement, sdks=OPTIONAL_SDKS)
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output)
+        timings.append(result["ms"])
+        sdks.update(result["sdks"])
+    return {"median_ms": statistics.median(timings), "sdks": sorted(sdks)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="导入耗时基准测试")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--scale", type=float, default=1.0, help="预算放大倍数")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"导入耗时基准（每个入口 {args.runs} 次取中位数）")
+    print("=" * 70)
+    failed = False
+    for statement, budget in BUDGETS_MS.items():
+        result = measure(statement, args.runs)
+        budget *= args.scale
+        ok = result["median_ms"] <= budget and not result["sdks"]
+        failed = failed or not ok
+        print(
+            f"{'✓' if ok else '✗'} {statement:<60} "
+            f"{result['median_ms']:6.1f} ms（预算 {budget:.0f} ms）"
+            + (f"  已导入 SDK: {', '.join(result['sdks'])}" if result["sdks"] else "")
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 回答解析基准测试
+
+构造数 KB 的采样、道德检验与归零校准回答（每段之后附若干行推理），比较：
+    逐行扫描  旧实现：每个字段各自切分、逐行匹配一遍全文
+    分段解析  SectionParser：预编译标签，每个回答只扫描一遍
+另外给出同一内容以 JSON 输出时的解析耗时。
+
+用法：
+    python benchmarks/bench_parsing.py --lines 40 --repeat 2000
+"""
+import sys
+import argparse
+import json
+import time
+
+# 设置UTF-8编码（Windows兼容）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.heat_death_calibrator import HeatDeathCalibrationModule
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.moral_validator import MoralValidator
+from philosofia.core.normal_sampler import NormalDistributionSamplingGenerator
+
+REASONING_LINE = "从义务论与后果主义两方面考察，该判断需要兼顾个体尊严与社会整体的长期利益。"
+
+
+# ---------------------------------------------------------------------------
+# 旧实现（逐行扫描），仅用于对照
+# ---------------------------------------------------------------------------
+
+def legacy_sampling(text):
+    perspectives, current_key, current = {}, None, []
+    labels = (
+        ("稳健共识 (μ)", ("稳健共识", "(μ)")),
+        ("前沿探索 (+2σ)", ("前沿探索", "+2σ")),
+        ("传统警示 (-2σ)", ("传统警示", "-2σ")),
+    )
+    for line in text.split("\n"):
+        line = line.strip()
+        for name, keys in labels:
+            if any(key in line for key in keys) or (name.startswith("稳健") and "mu" in line.lower()):
+                if current_key:
+                    perspectives[current_key] = " ".join(current).strip()
+                current_key = name
+                current = [line.split(":", 1)[-1].strip() if ":" in line else ""]
+                break
+        else:
+            if current_key and line:
+                current.append(line)
+    if current_key:
+        perspectives[current_key] = " ".join(current).strip()
+
+    synthesis, in_synthesis = [], False
+    for line in text.split("\n"):
+        line = line.strip()
+        if "合题" in line or "synthesis" in line.lower():
+            in_synthesis = True
+            if ":" in line:
+                synthesis.append(line.split(":", 1)[-1].strip())
+        elif in_synthesis and line:
+            synthesis.append(line)
+    return perspectives, " ".join(synthesis)
+
+
+def legacy_check(text, chinese_key, english_key):
+    for line in text.split("\n"):
+        line = line.lower()
+        if chinese_key in line or english_key in line:
+            if ("通过" in line or "pass" in line) and "失败" not in line and "fail" not in line:
+                return True
+            if "失败" in line or "fail" in line:
+                return False
+    return False
+
+
+def legacy_validation(text):
+    text = text.lower()
+    return {
+        "universalizable": legacy_check(text, "可普遍化", "universaliz"),
+        "humanity_respected": legacy_check(text, "人性目的", "humanity"),
+        "autonomous": legacy_check(text, "自主性", "autonom"),
+    }
+
+
+def legacy_calibration(text, raw_response):
+    lower = text.lower()
+    passed = ("通过" in lower or "pass" in lower) and not ("失败" in lower or "fail" in lower)
+    lines = text.split("\n")
+    reason = ""
+    for i, line in enumerate(lines):
+        if "归零检验" in line or "heat death" in line.lower():
+            reason = lines[i + 1].strip() if i + 1 < len(lines) else ""
+            break
+    lens = "意义源于有限理性存在者的自我立法。"
+    for i, line in enumerate(text.split("\n")):
+        if "校准透镜" in line or "lens" in line.lower():
+            lens = line.split(":", 1)[-1].strip() if ":" in line else lines[i + 1].strip()
+            break
+    calibrated = f"{raw_response}\n\n[宇宙校准] {lens}"
+    for i, line in enumerate(text.split("\n")):
+        if "校准后的回答" in line or "calibrated" in line.lower():
+            calibrated = lines[i + 1].strip() if i + 1 < len(lines) else ""
+            break
+    return {"passed": passed, "reason": reason}, calibrated
+
+
+# ---------------------------------------------------------------------------
+# 回答构造
+# ---------------------------------------------------------------------------
+
+def make_response(headers, lines: int) -> str:
+    body = "\n".join(REASONING_LINE for _ in range(lines))
+    return "\n\n".join(f"{header}\n{body}" for header in headers)
+
+
+def make_cases(lines: int) -> list:
+    ndsg = NormalDistributionSamplingGenerator(llm=MockLLM())
+    validator = MoralValidator(llm=MockLLM())
+    calibrator = HeatDeathCalibrationModule(llm=MockLLM())
+    body = " ".join(REASONING_LINE for _ in range(lines))
+
+    sampling = make_response(
+        ["稳健共识 (μ): 平衡的观点", "前沿探索 (+2σ): 激进的观点",
+         "传统警示 (-2σ): 保守的观点", "辩证合题: 渐进的合题"],
+        lines,
+    )
+    validation = make_response(
+        ["可普遍化: 通过 - 不会导致矛盾", "人性目的: 通过 - 尊重人性", "自主性: 失败 - 限制了选择"],
+        lines,
+    )
+    calibration = make_response(
+        ["归零检验: 通过 - 维护了理性尊严", "校准透镜: 星辰终将熄灭", "校准后的回答: 在有限中守护尊严"],
+        lines,
+    )
+    return [
+        (
+            "采样",
+            sampling,
+            json.dumps({"mu": body, "positive_tail": body, "negative_tail": body, "synthesis": body},
+                       ensure_ascii=False),
+            legacy_sampling,
+            ndsg._parse_sections,
+        ),
+        (
+            "道德检验",
+            validation,
+            json.dumps({"universalizable": True, "humanity_respected": True, "autonomous": False,
+                        "reasoning": body}, ensure_ascii=False),
+            legacy_validation,
+            validator._parse_validation_response,
+        ),
+        (
+            "归零校准",
+            calibration,
+            json.dumps({"heat_death_passed": True, "reason": body, "lens": body,
+                        "calibrated_response": body}, ensure_ascii=False),
+            lambda text: legacy_calibration(text, "原始回答"),
+            lambda text: calibrator._calibration_result({"response": text}, "原始回答", "moral"),
+        ),
+    ]
+
+
+def timed(parse, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=40, help="每段之后的推理行数")
+    parser.add_argument("--repeat", type=int, default=2000, help="每种回答的解析次数")
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"LLM 回答解析（每段附 {args.lines} 行推理，每种回答解析 {args.repeat} 次）")
+    print("=" * 78)
+    print(f"{'回答':<10}{'大小(KB)':>10}{'逐行扫描(μs)':>16}{'分段解析(μs)':>16}{'加速比':>10}{'JSON(μs)':>14}")
+    for name, text, json_text, legacy, parse in make_cases(args.lines):
+        old = timed(legacy, text, args.repeat)
+        new = timed(parse, text, args.repeat)
+        json_us = timed(parse, json_text, args.repeat)
+        size = len(text.encode("utf-8")) / 1024
+        print(f"{name:<10}{size:>10.1f}{old:>16.1f}{new:>16.1f}{old / new:>9.2f}x{json_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
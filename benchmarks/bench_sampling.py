@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+初始采样模式基准测试
+
+以模拟 LLM（首字延迟 + 按输出 token 计的生成耗时）比较两种采样模式：
+    single   一次调用生成三视角与合题
+    parallel 三个视角并发短调用，再用一次调用生成合题
+输出每次采样的平均耗时、LLM 调用次数与输入 / 输出 token 数。
+
+用法：
+    python benchmarks/bench_sampling.py --requests 20 --ttft-ms 50 --ms-per-token 2
+"""
+import sys
+import argparse
+import threading
+import time
+
+# 设置UTF-8编码（Windows兼容）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.normal_sampler import SAMPLING_MODES, NormalDistributionSamplingGenerator
+from philosofia.core.rate_limiter import estimate_tokens
+
+QUERIES = [
+    "AI是否应该拥有权利？",
+    "为了公共安全，应该监控所有公民吗？",
+    "生命伦理的边界在哪里？",
+]
+
+
+class SimulatedLLM(MockLLM):
+    """按输出长度模拟生成耗时的 LLM，并统计调用次数与 token 用量"""
+
+    def __init__(self, ttft: float, per_token: float, section_tokens: int, synthesis_tokens: int):
+        self.ttft = ttft
+        self.per_token = per_token
+        self.section_tokens = section_tokens
+        self.synthesis_tokens = synthesis_tokens
+        self.calls = self.prompt_tokens = self.completion_tokens = 0
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        if "请给出 **" in prompt:  # parallel 模式的单个视角
+            text = "思" * min(self.section_tokens, max_tokens)
+        elif "请综合这三个视角" in prompt:  # parallel 模式的合题
+            text = "辩证合题: " + "合" * min(self.synthesis_tokens, max_tokens)
+        else:  # single 模式的完整回答
+            section = "思" * self.section_tokens
+            text = (
+                f"稳健共识 (μ): {section}\n前沿探索 (+2σ): {section}\n"
+                f"传统警示 (-2σ): {section}\n辩证合题: {'合' * self.synthesis_tokens}"
+            )
+        completion = estimate_tokens(text)
+        time.sleep(self.ttft + completion * self.per_token)
+        with self.lock:
+            self.calls += 1
+            self.prompt_tokens += estimate_tokens((system_prompt or "") + prompt)
+            self.completion_tokens += completion
+        return text
+
+
+def bench(mode: str, args) -> dict:
+    llm = SimulatedLLM(
+        args.ttft_ms / 1000, args.ms_per_token / 1000, args.section_tokens, args.synthesis_tokens
+    )
+    ndsg = NormalDistributionSamplingGenerator(llm=llm, sampling_mode=mode)
+    start = time.perf_counter()
+    for i in range(args.requests):
+        ndsg.generate(QUERIES[i % len(QUERIES)])
+    elapsed = time.perf_counter() - start
+    return {
+        "ms": elapsed / args.requests * 1000,
+        "calls": llm.calls / args.requests,
+        "prompt_tokens": llm.prompt_tokens / args.requests,
+        "completion_tokens": llm.completion_tokens / args.requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="每种模式的采样次数")
+    parser.add_argument("--ttft-ms", type=float, default=50, help="每次调用的首字延迟（毫秒）")
+    parser.add_argument("--ms-per-token", type=float, default=2, help="每个输出 token 的生成耗时（毫秒）")
+    parser.add_argument("--section-tokens", type=int, default=120, help="每个视角的输出 token 数")
+    parser.add_argument("--synthesis-tokens", type=int, default=150, help="合题的输出 token 数")
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(
+        f"初始采样模式（每种模式 {args.requests} 次，首字 {args.ttft_ms:g}ms，"
+        f"{args.ms_per_token:g}ms/token）"
+    )
+    print("=" * 78)
+    print(f"{'模式':<10}{'平均耗时(ms)':>14}{'调用次数':>10}{'输入 token':>14}{'输出 token':>14}{'总 token':>12}")
+    results = {}
+    for mode in SAMPLING_MODES:
+        r = results[mode] = bench(mode, args)
+        total = r["prompt_tokens"] + r["completion_tokens"]
+        print(
+            f"{mode:<10}{r['ms']:>14.1f}{r['calls']:>10.0f}"
+            f"{r['prompt_tokens']:>14.0f}{r['completion_tokens']:>14.0f}{total:>12.0f}"
+        )
+    speedup = results["single"]["ms"] / results["parallel"]["ms"]
+    print(f"\nparallel 相对 single 的延迟加速比: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+推理链追踪级别基准测试
+
+以 MockLLM 执行多次 respond，比较 off / summary / full 三个级别下
+单次回答耗时、JSON 序列化耗时与序列化后的大小。
+
+用法：
+    python benchmarks/bench_trace.py --requests 500
+"""
+import sys
+import argparse
+import json
+import time
+
+# 设置UTF-8编码（Windows兼容）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.trace import TRACE_LEVELS
+
+QUERIES = [
+    "AI是否应该拥有权利？",
+    "为了公共安全，应该监控所有公民吗？",
+    "生命伦理的边界在哪里？",
+]
+
+
+def bench(trace: str, requests: int) -> dict:
+    agent = PhilosophicallyAugmentedAgentSystem(llm=MockLLM(), trace=trace)
+    respond_time = dump_time = size = 0
+    for i in range(requests):
+        start = time.perf_counter()
+        result = agent.respond(QUERIES[i % len(QUERIES)])
+        middle = time.perf_counter()
+        payload = json.dumps(result, ensure_ascii=False)
+        end = time.perf_counter()
+        respond_time += middle - start
+        dump_time += end - middle
+        size += len(payload.encode("utf-8"))
+    return {
+        "respond_us": respond_time / requests * 1e6,
+        "dump_us": dump_time / requests * 1e6,
+        "bytes": size / requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="每个级别的回答次数")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"推理链追踪级别（每个级别 {args.requests} 次回答，MockLLM）")
+    print("=" * 70)
+    print(f"{'级别':<10}{'回答耗时(μs)':>16}{'序列化耗时(μs)':>18}{'序列化大小(B)':>18}")
+    for trace in TRACE_LEVELS:
+        r = bench(trace, args.requests)
+        print(f"{trace:<10}{r['respond_us']:>16.1f}{r['dump_us']:>18.1f}{r['bytes']:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+火山引擎后端连接复用基准测试
+
+在本地启动一个兼容 Chat Completions 的桩服务器，对比：
+1. 每次调用 requests.post（每次新建 TCP 连接，旧实现）
+2. VolcanoEngineLLM 的长连接会话（连接池 + keep-alive）
+
+用法：
+    python benchmarks/bench_volcano_session.py --calls 300 --threads 8
+"""
+import sys
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 设置UTF-8编码（Windows兼容）
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import requests
+
+from philosofia.core.llm_interface import VolcanoEngineLLM
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """返回固定回答的桩接口，并统计服务器端建立的连接数"""
+
+    protocol_version = "HTTP/1.1"  # 支持 keep-alive
+    disable_nagle_algorithm = True  # 避免响应头与响应体分包写出时触发延迟 ACK
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubHandler.lock:
+            StubHandler.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps(
+            {"choices": [{"message": {"role": "assistant", "content": "归零校准完成"}}]}
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stub_server():
+    """在后台线程中启动桩服务器"""
+    ThreadingHTTPServer.request_queue_size = 256
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(label, call, calls, threads):
+    """执行 calls 次调用并打印单次延迟统计"""
+    StubHandler.connections = 0
+    latencies = []
+
+    def timed(i):
+        start = time.perf_counter()
+        call(f"问题{i}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(timed, range(calls)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<24} 平均 {statistics.mean(latencies) * 1000:7.3f} ms  "
+        f"p50 {statistics.median(latencies) * 1000:7.3f} ms  "
+        f"p95 {p95 * 1000:7.3f} ms  "
+        f"吞吐 {calls / elapsed:8.1f} 次/秒  "
+        f"连接数 {StubHandler.connections}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="火山引擎后端连接复用基准测试")
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    url = f"http://127.0.0.1:{server.server_port}/api/v3/chat/completions"
+    llm = VolcanoEngineLLM(
+        access_key="bench", secret_key="bench", api_url=url, pool_maxsize=args.threads
+    )
+
+    def fresh_connection(prompt):
+        headers, data = llm._build_request(prompt, None, 0.7, 100)
+        requests.post(url, headers=headers, json=data, timeout=30).json()
+
+    print("=" * 70)
+    print(f"火山引擎后端连接复用基准（{args.calls} 次调用，{args.threads} 线程）")
+    print("=" * 70)
+    run("每次新建连接", fresh_connection, args.calls, args.threads)
+    run("长连接会话", llm.generate, args.calls, args.threads)
+
+    llm.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""测试共用的 Mock LLM"""
+import asyncio
+import time
+
+from philosofia.core.llm_interface import MockLLM
+
+
+class SlowLLM(MockLLM):
+    """
+    每次推理调用耗时 delay 秒的 Mock LLM
+
+    Args:
+        delay: 每次调用的耗时（秒）
+        slow_marker: 提示中包含该字符串时改用 slow_delay 作为耗时
+        slow_delay: 含 slow_marker 的提示的耗时（秒）
+
+    被取消的异步调用次数记录在 cancelled 中。
+    """
+
+    def __init__(self, delay=0.1, slow_marker=None, slow_delay=None):
+        self.delay = delay
+        self.slow_marker = slow_marker
+        self.slow_delay = slow_delay
+        self.cancelled = 0
+
+    def delay_for(self, prompt):
+        if self.slow_marker is not None and self.slow_marker in prompt:
+            return self.slow_delay
+        return self.delay
+
+    def generate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        time.sleep(self.delay_for(prompt))
+        return super().generate_with_reasoning(prompt, system_prompt, temperature)
+
+    async def agenerate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        try:
+            await asyncio.sleep(self.delay_for(prompt))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return super().generate_with_reasoning(prompt, system_prompt, temperature)
@@ -1,10 +1,57 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from .core.agent_system import PhilosophicallyAugmentedAgentSystem
-from .core.llm_interface import LLMInterface, create_llm, get_default_llm
+if TYPE_CHECKING:
+    from .core.agent_pool import AgentPool, get_agent_pool
+    from .core.agent_system import PhilosophicallyAugmentedAgentSystem
+    from .core.errors import LLMError
+    from .core.llm_cache import CachedLLM
+    from .core.llm_interface import LLMInterface, create_llm, get_default_llm
+    from .core.llm_router import RouterLLM
 
 __version__ = "0.1.0"
 
+__all__ = [
+    "PhilosophicallyAugmentedAgentSystem",
+    "AgentPool",
+    "get_agent_pool",
+    "LLMError",
+    "CachedLLM",
+    "LLMInterface",
+    "create_llm",
+    "get_default_llm",
+    "RouterLLM",
+    "ask_philosophically",
+    "aask_philosophically",
+]
+
+# 导出名 → 所在模块；首次访问时才导入，使 import philosofia 不加载核心模块
+_LAZY_EXPORTS = {
+    "PhilosophicallyAugmentedAgentSystem": ".core.agent_system",
+    "AgentPool": ".core.agent_pool",
+    "get_agent_pool": ".core.agent_pool",
+    "LLMError": ".core.errors",
+    "CachedLLM": ".core.llm_cache",
+    "LLMInterface": ".core.llm_interface",
+    "create_llm": ".core.llm_interface",
+    "get_default_llm": ".core.llm_interface",
+    "RouterLLM": ".core.llm_router",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value  # 缓存，之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 def ask_philosophically(
     question: str,
@@ -14,22 +61,36 @@ def ask_philosophically(
 ) -> dict:
     """
     对输入问题给出哲学增强回答。
-    
+
     Args:
         question: 用户问题
-        llm_backend: LLM 后端类型 ("mock", "openai", "local", "qwen", "deepseek", "volcano")
+        llm_backend: LLM 后端类型 ("mock", "openai", "local", "qwen", "deepseek", "volcano", "router")
         use_llm: 是否使用 LLM 进行推理（False 则使用预设答案）
         **llm_kwargs: 传递给 LLM 的参数（如 api_key, model 等）
-        
+
     Returns:
         包含回答和推理链的字典
+
+    相同后端与参数的调用通过进程级智能体池（get_agent_pool()）复用 LLM 客户端与智能体；
+    不再需要时可调用 get_agent_pool().close() 关闭客户端。
+    """
+    from .core.agent_pool import get_agent_pool
+
+    return get_agent_pool().respond(question, llm_backend, use_llm, **llm_kwargs)
+
+
+async def aask_philosophically(
+    question: str,
+    llm_backend: str = "mock",
+    use_llm: bool = True,
+    **llm_kwargs,
+) -> dict:
     """
-    # 创建 LLM 实例
-    if use_llm:
-        llm = create_llm(backend=llm_backend, **llm_kwargs)
-    else:
-        llm = None
-
-    # 创建智能体系统
-    agent = PhilosophicallyAugmentedAgentSystem(llm=llm, use_llm=use_llm)
-    return agent.respond(question)
\ No newline at end of file
+    ask_philosophically 的异步版本：在当前事件循环中通过异步 LLM 调用完成整个流程
+
+    参数与返回值同 ask_philosophically，同样复用进程级智能体池。
+    异步客户端绑定当前事件循环，循环结束前应调用 await get_agent_pool().aclose() 关闭。
+    """
+    from .core.agent_pool import get_agent_pool
+
+    return await get_agent_pool().arespond(question, llm_backend, use_llm, **llm_kwargs)
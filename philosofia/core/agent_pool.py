@@ -0,0 +1,242 @@
+"""
+智能体池：按 (后端, use_llm, LLM 参数) 复用 LLM 客户端与智能体实例
+同一配置的重复调用共享已建立连接的客户端，并复用空闲的智能体，
+避免每次提问都重新创建客户端、连接池与各个推理模块
+"""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .agent_system import PhilosophicallyAugmentedAgentSystem
+from .llm_interface import LLMInterface, create_llm
+
+
+def _freeze(value: Any) -> Any:
+    """把 LLM 参数转换为可哈希的键"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class _PoolEntry:
+    """同一配置共享的 LLM 与空闲智能体"""
+
+    __slots__ = ("llm", "use_llm", "idle", "in_use", "closing")
+
+    def __init__(self, llm: Optional[LLMInterface], use_llm: bool):
+        self.llm = llm
+        self.use_llm = use_llm
+        self.idle: List[PhilosophicallyAugmentedAgentSystem] = []
+        self.in_use = 0
+        self.closing = False  # 已被移出池，最后一个智能体归还时关闭 LLM
+
+    def close_llm(self):
+        self.idle.clear()
+        if self.llm is not None:
+            self.llm.close()
+
+
+class AgentPool:
+    """
+    线程安全的智能体池
+
+    借出的智能体同一时刻只属于一个调用方，调用方可以在借出期间调整其配置（如 max_retries）；
+    同一配置下的智能体共享一个 LLM 实例。用法：
+        with AgentPool() as pool:
+            result = pool.respond("AI是否应该拥有权利？", llm_backend="qwen")
+
+        async with AgentPool() as pool:  # 退出时另外关闭当前事件循环上的异步客户端
+            result = await pool.arespond("AI是否应该拥有权利？", llm_backend="qwen")
+    """
+
+    def __init__(self, max_entries: int = 8, max_idle_agents: int = 8):
+        """
+        Args:
+            max_entries: 保留的配置数上限，超出时按 LRU 顺序关闭无人使用的配置
+            max_idle_agents: 每个配置保留的空闲智能体数上限
+        """
+        self.max_entries = max_entries
+        self.max_idle_agents = max_idle_agents
+        self.llms_created = 0
+        self.agents_created = 0
+        self._entries: "OrderedDict[Tuple, _PoolEntry]" = OrderedDict()
+        self._borrowed: Dict[int, _PoolEntry] = {}  # id(智能体) → 所属配置
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, llm_backend: str = "mock", use_llm: bool = True, **llm_kwargs
+    ) -> PhilosophicallyAugmentedAgentSystem:
+        """借出一个智能体（用完后必须调用 release 归还）"""
+        # use_llm=False 时不使用 LLM，后端与参数无关
+        key = (llm_backend, True, _freeze(llm_kwargs)) if use_llm else (None, False, ())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.in_use += 1  # 占用后该配置不会被淘汰
+                if entry.idle:
+                    agent = entry.idle.pop()
+                    self._borrowed[id(agent)] = entry
+                    return agent
+
+        if entry is None:
+            # 在锁外创建客户端；并发创建同一配置时只保留先完成的一个
+            llm = create_llm(backend=llm_backend, **llm_kwargs) if use_llm else None
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = _PoolEntry(llm, use_llm)
+                    self.llms_created += use_llm
+                    llm = None
+                entry.in_use += 1
+            if llm is not None:
+                llm.close()
+
+        try:
+            agent = PhilosophicallyAugmentedAgentSystem(llm=entry.llm, use_llm=entry.use_llm)
+        except BaseException:
+            self._return_entry(entry)
+            raise
+        with self._lock:
+            self.agents_created += 1
+            self._borrowed[id(agent)] = entry
+        self._evict()
+        return agent
+
+    def release(self, agent: PhilosophicallyAugmentedAgentSystem):
+        """归还借出的智能体"""
+        with self._lock:
+            entry = self._borrowed.pop(id(agent), None)
+            if entry is None:
+                return
+            if not entry.closing and len(entry.idle) < self.max_idle_agents:
+                entry.idle.append(agent)
+        self._return_entry(entry)
+
+    def _return_entry(self, entry: _PoolEntry):
+        """解除对配置的占用；已移出池的配置在最后一次占用解除时关闭"""
+        with self._lock:
+            entry.in_use -= 1
+            close_now = entry.closing and entry.in_use == 0
+        if close_now:
+            entry.close_llm()
+        self._evict()
+
+    @contextmanager
+    def agent(
+        self, llm_backend: str = "mock", use_llm: bool = True, **llm_kwargs
+    ) -> Iterator[PhilosophicallyAugmentedAgentSystem]:
+        """借出智能体的上下文管理器，退出时自动归还"""
+        agent = self.acquire(llm_backend, use_llm, **llm_kwargs)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def respond(
+        self, question: str, llm_backend: str = "mock", use_llm: bool = True, **llm_kwargs
+    ) -> Dict[str, Any]:
+        """借出智能体回答问题"""
+        with self.agent(llm_backend, use_llm, **llm_kwargs) as agent:
+            return agent.respond(question)
+
+    async def arespond(
+        self, question: str, llm_backend: str = "mock", use_llm: bool = True, **llm_kwargs
+    ) -> Dict[str, Any]:
+        """respond 的异步版本"""
+        with self.agent(llm_backend, use_llm, **llm_kwargs) as agent:
+            return await agent.arespond(question)
+
+    def _evict(self):
+        """按 LRU 顺序关闭无人使用的配置，直到不超过上限"""
+        evicted = []
+        with self._lock:
+            excess = len(self._entries) - self.max_entries
+            for key in list(self._entries):
+                if excess <= 0:
+                    break
+                if self._entries[key].in_use == 0:
+                    evicted.append(self._entries.pop(key))
+                    excess -= 1
+        for entry in evicted:
+            entry.close_llm()
+
+    def close(self):
+        """
+        关闭池中所有 LLM 客户端（可重复调用）
+
+        仍被借出的智能体不受影响，其 LLM 在归还时关闭；关闭后池仍可继续使用。
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            idle = []
+            for entry in entries:
+                if entry.in_use:
+                    entry.closing = True
+                else:
+                    idle.append(entry)
+        for entry in idle:
+            entry.close_llm()
+
+    async def aclose(self):
+        """
+        close 的异步版本：先关闭空闲配置的 LLM 在当前事件循环上的异步客户端，再关闭池
+
+        在事件循环结束前调用（如 asyncio.run 的主协程末尾），异步连接池随之释放。
+        """
+        with self._lock:
+            llms = [
+                entry.llm for entry in self._entries.values()
+                if entry.llm is not None and not entry.in_use
+            ]
+        for llm in llms:
+            await llm.aclose()
+        self.close()
+
+    def __enter__(self) -> "AgentPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def __aenter__(self) -> "AgentPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        """池中的配置数、借出与空闲的智能体数，以及累计创建次数"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "in_use": sum(entry.in_use for entry in self._entries.values()),
+                "idle": sum(len(entry.idle) for entry in self._entries.values()),
+                "llms_created": self.llms_created,
+                "agents_created": self.agents_created,
+            }
+
+
+# 进程级默认智能体池（ask_philosophically 使用）
+_default_pool: Optional[AgentPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_agent_pool() -> AgentPool:
+    """获取（首次调用时创建）进程级默认智能体池"""
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = AgentPool()
+    return _default_pool
@@ -1,12 +1,28 @@
-from typing import Dict, List, Optional
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
 
 from .cosmic_context import CosmicContextEstimator
+from .deadline import Deadline, get_deadline_executor
 from .entropy_awareness import EntropyAwareReasoner
+from .errors import LLMError
+from .fused_reasoner import FusedReasoner
 from .heat_death_calibrator import HeatDeathCalibrationModule
 from .lifecycle_modeler import LifecycleModeler
 from .llm_interface import LLMInterface, get_default_llm
 from .moral_validator import MoralValidator
-from .normal_sampler import NormalDistributionSamplingGenerator
+from .normal_sampler import NormalDistributionSamplingGenerator, check_sampling_mode
+from .rate_limiter import estimate_tokens
+from .request_context import RequestContext
+from .speculation import AsyncSpeculativeCall, SpeculationStats, SpeculativeCall
+from .stage_events import StageEvent
+from .stage_graph import StageGraph, get_stage_executor
+from .trace import check_trace_level
 
 
 class PhilosophicallyAugmentedAgentSystem:
@@ -14,6 +30,12 @@ class PhilosophicallyAugmentedAgentSystem:
         self,
         llm: Optional[LLMInterface] = None,
         use_llm: bool = True,
+        parallel_stages: Optional[bool] = None,
+        fused: bool = False,
+        speculative_retry: bool = False,
+        speculation_stats: Optional[SpeculationStats] = None,
+        trace: str = "full",
+        sampling_mode: str = "single",
     ) -> None:
         """
         初始化哲学增强型智能体系统
@@ -21,156 +43,773 @@ class PhilosophicallyAugmentedAgentSystem:
         Args:
             llm: LLM 接口实例（如果为 None，使用默认 LLM）
             use_llm: 是否使用 LLM 进行推理（False 则使用预设答案和规则）
+            parallel_stages: 是否在线程池中并发执行相互独立的阶段
+                （None 表示仅在使用 LLM 时并发；纯规则模式各阶段耗时极短，串行更快）
+            fused: 是否启用融合推理：一次 LLM 调用以 JSON 同时返回三视角、合题、
+                道德检验与归零校准，输出无效时退回多次调用路径
+            speculative_retry: 是否推测式重试：道德检验的同时提前开始偏向 μ 的重新采样，
+                检验通过则丢弃，以额外 token 换取每次重试少一轮往返
+            speculation_stats: 推测式重试的成本统计（可在同一租户的多个智能体之间共享）
+            trace: 推理链追踪级别：off 不记录；summary 只记录步骤名称与描述；
+                full 另外记录各阶段 LLM 的完整推理结果
+            sampling_mode: 初始采样模式：single 一次调用生成三视角与合题；
+                parallel 三个视角并发短调用后再生成合题（可在每次 respond 时覆盖）
         """
         self.llm = llm or get_default_llm()
         self.use_llm = use_llm
+        self.parallel_stages = use_llm if parallel_stages is None else parallel_stages
+        self.fused = fused
+        self.speculative_retry = speculative_retry
+        self.speculation_stats = speculation_stats or SpeculationStats()
+        self.trace = check_trace_level(trace)
 
         # 初始化各个模块，传递 LLM 实例
         self.mv = MoralValidator(llm=self.llm, use_llm=use_llm)
         self.hdcm = HeatDeathCalibrationModule(llm=self.llm, use_llm=use_llm)
         self.ndsg = NormalDistributionSamplingGenerator(
-            llm=self.llm, use_llm=use_llm
+            llm=self.llm, use_llm=use_llm, sampling_mode=sampling_mode
         )
         self.lifecycle_modeler = LifecycleModeler()
         self.cosmic_context = CosmicContextEstimator()
         self.entropy_awareness = EntropyAwareReasoner()
+        self.fused_reasoner = FusedReasoner(llm=self.llm)
         self.max_retries = 3  # 避免无限循环
 
-        # 推理链追踪
-        self.reasoning_chain: List[Dict] = []
+        # 推理链、截止时间等单次请求的状态保存在 RequestContext 中，智能体可被多个线程同时使用
+        # 各 LLM 阶段的近期耗时（秒，EWMA），用于预判阶段是否会超出截止时间（各请求共享）
+        self.stage_latency: Dict[str, float] = {}
+        self._latency_lock = threading.Lock()
 
-    def respond(self, user_query: str) -> Dict[str, any]:
+    def respond(
+        self,
+        user_query: str,
+        budget_ms: Optional[float] = None,
+        deadline: Optional[float] = None,
+        sampling_mode: Optional[str] = None,
+    ) -> Dict[str, any]:
         """
         端到端哲学回答生成（带推理链追踪）
+
+        Args:
+            user_query: 用户问题
+            budget_ms: 延迟预算（毫秒）
+            deadline: 截止时间点（time.monotonic() 的取值）；与 budget_ms 同时提供时取较早者
+            sampling_mode: 本次回答的初始采样模式（None 表示使用智能体的默认模式）
+
+        设置预算后，剩余时间不足以完成（或等待超时）的 LLM 阶段改用规则路径：
+        采样用预设答案、道德检验用规则匹配、归零校准用规则校准；
+        这些阶段记录在输出的 degraded_stages 中。
         """
-        # 重置推理链
-        self.reasoning_chain = []
+        for event in self.respond_iter(user_query, budget_ms, deadline, sampling_mode):
+            pass
+        return event.data
+
+    async def arespond(
+        self,
+        user_query: str,
+        budget_ms: Optional[float] = None,
+        deadline: Optional[float] = None,
+        sampling_mode: Optional[str] = None,
+    ) -> Dict[str, any]:
+        """
+        respond 的异步版本
+
+        采样、道德检验与归零校准通过 LLM 的异步接口调用，不占用线程；
+        参数与返回格式同 respond。取消该协程或阶段超出截止时间时，进行中的 LLM 调用被取消。
+        """
+        async for event in self.arespond_iter(user_query, budget_ms, deadline, sampling_mode):
+            pass
+        return event.data
+
+    def respond_iter(
+        self,
+        user_query: str,
+        budget_ms: Optional[float] = None,
+        deadline: Optional[float] = None,
+        sampling_mode: Optional[str] = None,
+    ) -> Iterator[StageEvent]:
+        """
+        逐阶段回答：每个流水线阶段完成时产出 StageEvent，最后产出完整输出
+
+        参数同 respond。事件依次为 domain、perspectives，之后 moral、lifecycle、cosmic、
+        entropy、calibration 按完成顺序产出，最后的 result 事件的 data 与 respond 的返回值相同
+        （各事件的 data 见 stage_events 模块）。
+        """
+        if sampling_mode is not None:
+            check_sampling_mode(sampling_mode)
+        ctx = self._begin_request(Deadline.from_args(budget_ms, deadline))
 
         # 步骤1: 自动识别问题域
         domain = self._classify_domain(user_query)
-        self._add_reasoning_step("问题域分类", f"识别问题域：{domain}")
+        ctx.add_step("问题域分类", f"识别问题域：{domain}")
+        yield StageEvent("domain", domain)
+
+        # fused_rejected：融合推理的道德检验未通过，多次调用路径直接从重新采样开始
+        result, graph, fused_rejected = None, None, False
+        if self.fused and self.use_llm:
+            calibration_type = self._calibration_type(user_query, domain)
+            try:
+                fused = self._bounded(
+                    ctx,
+                    "融合推理",
+                    lambda: self.fused_reasoner.reason(user_query, calibration_type),
+                    lambda: None,
+                )
+            except LLMError as e:
+                self._record_fused_failure(ctx, e)
+            else:
+                if fused is not None:
+                    result, graph = self._apply_fused(
+                        ctx, user_query, domain, fused, calibration_type
+                    )
+                    fused_rejected = graph is None
 
         # 步骤2: 初始正态采样
-        result = self.ndsg.generate(user_query, domain)
-        synthesis = result["synthesis"]
-        if "reasoning" in result:
-            self._add_reasoning_step(
+        if result is None:
+            result = self._bounded(
+                ctx,
                 "正态采样生成",
-                "生成三视角（μ, +2σ, -2σ）",
-                result["reasoning"],
+                lambda: self.ndsg.generate(user_query, domain, sampling_mode),
+                lambda: self.ndsg._generate_with_rules(user_query, domain),
             )
+            self._add_sampling_step(ctx, result)
+        yield StageEvent("perspectives", result["perspectives"])
 
-        retry_count = 0
-        moral_ok = False
+        # 步骤3-8（融合推理的阶段图只含规则计算，在当前线程中依次执行）
+        executor = None
+        if graph is None:
+            graph = self._response_graph(ctx, user_query, domain, result, fused_rejected)
+            executor = get_stage_executor() if self.parallel_stages else None
+        stages = {}
+        for name, value in graph.iter_run(executor):
+            stages[name] = value
+            yield self._stage_event(name, value)
+        yield StageEvent("result", self._assemble_output(ctx, stages))
 
-        # 步骤3: 道德检验循环
-        while not moral_ok and retry_count < self.max_retries:
-            # 提取合题作为待检验行动/主张
-            action_claim = self._extract_action_from_synthesis(synthesis)
-            self._add_reasoning_step(
-                "提取行动主张", f"从合题中提取：{action_claim[:50]}..."
-            )
+    async def arespond_iter(
+        self,
+        user_query: str,
+        budget_ms: Optional[float] = None,
+        deadline: Optional[float] = None,
+        sampling_mode: Optional[str] = None,
+    ) -> AsyncIterator[StageEvent]:
+        """respond_iter 的异步版本（async for 迭代）"""
+        if sampling_mode is not None:
+            check_sampling_mode(sampling_mode)
+        ctx = self._begin_request(Deadline.from_args(budget_ms, deadline))
 
-            # 执行道德三重检验
-            moral_result = self.mv.validate(action_claim, context=user_query)
-            if "reasoning" in moral_result:
-                self._add_reasoning_step(
-                    "道德三重检验",
-                    f"可普遍化: {moral_result['universalizable']}, "
-                    f"人性目的: {moral_result['humanity_respected']}, "
-                    f"自主性: {moral_result['autonomous']}",
-                    moral_result["reasoning"],
+        # 步骤1: 自动识别问题域
+        domain = self._classify_domain(user_query)
+        ctx.add_step("问题域分类", f"识别问题域：{domain}")
+        yield StageEvent("domain", domain)
+
+        # fused_rejected：融合推理的道德检验未通过，多次调用路径直接从重新采样开始
+        result, graph, fused_rejected = None, None, False
+        if self.fused and self.use_llm:
+            calibration_type = self._calibration_type(user_query, domain)
+            try:
+                fused = await self._abounded(
+                    ctx,
+                    "融合推理",
+                    lambda: self.fused_reasoner.areason(user_query, calibration_type),
+                    lambda: None,
                 )
+            except LLMError as e:
+                self._record_fused_failure(ctx, e)
             else:
-                self._add_reasoning_step(
-                    "道德三重检验",
-                    f"可普遍化: {moral_result['universalizable']}, "
-                    f"人性目的: {moral_result['humanity_respected']}, "
-                    f"自主性: {moral_result['autonomous']}",
-                )
+                if fused is not None:
+                    result, graph = self._apply_fused(
+                        ctx, user_query, domain, fused, calibration_type
+                    )
+                    fused_rejected = graph is None
+
+        # 步骤2: 初始正态采样
+        if result is None:
+            result = await self._abounded(
+                ctx,
+                "正态采样生成",
+                lambda: self.ndsg.agenerate(user_query, domain, sampling_mode),
+                lambda: self.ndsg._generate_with_rules(user_query, domain),
+            )
+            self._add_sampling_step(ctx, result)
+        yield StageEvent("perspectives", result["perspectives"])
+
+        # 步骤3-8
+        if graph is None:
+            graph = self._aresponse_graph(ctx, user_query, domain, result, fused_rejected)
+        stages = {}
+        async for name, value in graph.aiter_run():
+            stages[name] = value
+            yield self._stage_event(name, value)
+        yield StageEvent("result", self._assemble_output(ctx, stages))
 
-            if (
-                moral_result["universalizable"]
-                and moral_result["humanity_respected"]
-                and moral_result["autonomous"]
-            ):
-                moral_ok = True
-                self._add_reasoning_step("道德检验", "通过道德三重检验")
+    def respond_many(
+        self,
+        questions: Iterable[str],
+        max_workers: int = 8,
+        ordered: bool = True,
+        executor: str = "thread",
+        agent_factory: Optional[Callable[[], "PhilosophicallyAugmentedAgentSystem"]] = None,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        批量回答：在有界工作池中处理大量问题，逐个产出结果
+
+        问题按需从 questions 中读取，同时在途的问题不超过 max_pending 个，
+        因此可以直接传入生成器，处理百万级问题时内存占用保持平稳。
+
+        Args:
+            questions: 问题的可迭代对象
+            max_workers: 工作线程/进程数
+            ordered: True 按输入顺序产出；False 按完成顺序产出（不被慢问题阻塞）
+            executor: "thread" 或 "process"
+            agent_factory: 为每个工作线程/进程创建智能体的无参函数。线程模式默认
+                所有线程共用本实例；进程模式默认在子进程中使用 get_default_llm()，
+                自定义时必须可被 pickle（模块级函数或 functools.partial）
+            max_pending: 最大在途问题数（默认 2 * max_workers）
+
+        Yields:
+            {"index": 序号, "question": 问题, "result": respond 的输出（失败时为 None）,
+             "error": 错误信息（成功时为 None）}
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"不支持的执行器类型：{executor}（可选 thread / process）")
+        max_workers = max(1, max_workers)
+        max_pending = max(max_workers, max_pending or 2 * max_workers)
+
+        if executor == "thread":
+            pool = ThreadPoolExecutor(max_workers, thread_name_prefix="philosofia-respond")
+            if agent_factory is None:
+                # 请求状态保存在各自的上下文中，所有工作线程共用本实例
+                submit = partial(pool.submit, self.respond)
             else:
-                # 道德失败 → 调整采样策略（降低尾部权重，强化μ）
-                self._add_reasoning_step(
-                    "道德检验", f"未通过，进行第 {retry_count + 1} 次重试"
-                )
-                result = self.ndsg.generate_with_bias(
-                    query=user_query,
-                    domain=domain,
-                    bias_toward_mu=True,
-                )
-                synthesis = result["synthesis"]
-                if "reasoning" in result:
-                    self._add_reasoning_step(
-                        "调整采样策略", "生成偏向稳健共识的回答", result["reasoning"]
-                    )
-                retry_count += 1
+                local = threading.local()
 
-        # 步骤4: 熵感知评估
-        entropy_assessment = self.entropy_awareness.assess_entropy_impact(
-            synthesis, [result["synthesis"]]
+                def run(question: str) -> Dict[str, Any]:
+                    agent = getattr(local, "agent", None)
+                    if agent is None:
+                        agent = local.agent = agent_factory()
+                    return agent.respond(question)
+
+                submit = partial(pool.submit, run)
+        else:
+            factory = agent_factory or partial(
+                PhilosophicallyAugmentedAgentSystem,
+                use_llm=self.use_llm,
+                parallel_stages=self.parallel_stages,
+                fused=self.fused,
+                speculative_retry=self.speculative_retry,
+                trace=self.trace,
+                sampling_mode=self.ndsg.sampling_mode,
+            )
+            pool = ProcessPoolExecutor(
+                max_workers, initializer=_init_worker_agent, initargs=(factory,)
+            )
+            submit = partial(pool.submit, _worker_respond)
+
+        try:
+            yield from _bounded_map(submit, questions, max_pending, ordered)
+        finally:
+            pool.shutdown(wait=True)
+
+    def respond_stream(self, user_query: str) -> Iterator[Dict[str, Any]]:
+        """
+        流式哲学回答：采样阶段边生成边产出，缩短首字节时间
+
+        依次产出以下事件：
+            {"event": "delta", "text": 采样阶段 LLM 的增量文本}（可能多次）
+            {"event": "perspectives", "perspectives": 初始采样的三视角}
+            {"event": "synthesis", "text": 经道德与宇宙校准的合题}
+            {"event": "done", "result": 与 respond 返回值格式相同的完整输出}
+
+        若道德检验触发重新采样，最终结果中的 perspectives 为重新采样后的视角。
+        流式采样总是一次调用生成三视角与合题（single 模式）。
+        """
+        ctx = self._begin_request(None)
+
+        # 步骤1: 自动识别问题域
+        domain = self._classify_domain(user_query)
+        ctx.add_step("问题域分类", f"识别问题域：{domain}")
+
+        # 步骤2: 初始正态采样（流式）
+        stream = self.ndsg.generate_stream(user_query, domain)
+        while True:
+            try:
+                piece = next(stream)
+            except StopIteration as stop:
+                result = stop.value
+                break
+            yield {"event": "delta", "text": piece}
+        self._add_sampling_step(ctx, result)
+        yield {"event": "perspectives", "perspectives": result["perspectives"]}
+
+        final_output = self._complete_response(ctx, user_query, domain, result)
+        yield {"event": "synthesis", "text": final_output["dialectical_synthesis"]}
+        yield {"event": "done", "result": final_output}
+
+    def _begin_request(self, deadline: Optional[Deadline]) -> RequestContext:
+        """创建本次请求的上下文"""
+        return RequestContext(self.trace, deadline)
+
+    def _bounded(
+        self, ctx: RequestContext, stage: str, call: Callable[[], Any], fallback: Callable[[], Any]
+    ) -> Any:
+        """
+        在截止时间内执行 LLM 阶段 call
+
+        剩余时间不超过该阶段的近期耗时，或等待超时时，改用规则路径 fallback
+        （超时的调用在限时调用线程池中继续执行，结果被丢弃）。未设置截止时间时直接执行 call。
+        call 在独立于阶段线程池的限时调用线程池中执行，阶段线程不会等待同一线程池中排队的任务。
+        """
+        if ctx.deadline is None:
+            return call()
+        remaining = ctx.deadline.remaining()
+        if remaining <= self.stage_latency.get(stage, 0.0):
+            return self._degrade(ctx, stage, fallback)
+
+        start = time.perf_counter()
+        future = get_deadline_executor().submit(call)
+        try:
+            value = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            future.cancel()
+            return self._degrade(ctx, stage, fallback)
+        self._observe_latency(stage, time.perf_counter() - start)
+        return value
+
+    async def _abounded(
+        self, ctx: RequestContext, stage: str, call: Callable[[], Any], fallback: Callable[[], Any]
+    ) -> Any:
+        """_bounded 的异步版本：call 返回协程，超时时被取消"""
+        if ctx.deadline is None:
+            return await call()
+        remaining = ctx.deadline.remaining()
+        if remaining <= self.stage_latency.get(stage, 0.0):
+            return self._degrade(ctx, stage, fallback)
+
+        start = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(call(), remaining)
+        except asyncio.TimeoutError:
+            return self._degrade(ctx, stage, fallback)
+        self._observe_latency(stage, time.perf_counter() - start)
+        return value
+
+    def _degrade(self, ctx: RequestContext, stage: str, fallback: Callable[[], Any]) -> Any:
+        """记录阶段降级并执行规则路径"""
+        ctx.record_degraded(stage)
+        # 衰减耗时估计，使偶发的慢调用不会让该阶段一直被跳过
+        with self._latency_lock:
+            if stage in self.stage_latency:
+                self.stage_latency[stage] *= 0.5
+        return fallback()
+
+    def _observe_latency(self, stage: str, latency: float):
+        """更新阶段耗时的 EWMA 估计"""
+        with self._latency_lock:
+            previous = self.stage_latency.get(stage)
+            self.stage_latency[stage] = (
+                latency if previous is None else 0.8 * previous + 0.2 * latency
+            )
+
+    def _apply_fused(
+        self,
+        ctx: RequestContext,
+        user_query: str,
+        domain: str,
+        fused: Dict,
+        calibration_type: str,
+    ) -> tuple:
+        """
+        把融合推理结果转换为各模块的结果格式并记入推理链
+
+        Returns:
+            (采样结果, 步骤3-7的阶段图)；道德检验未通过时阶段图为 None，
+            由多次调用路径沿用该检验结论，直接从重新采样开始（不再重复检验）
+        """
+        ctx.add_step("融合推理", "单次调用生成三视角、合题、道德检验与归零校准", fused)
+        perspectives = {
+            "稳健共识 (μ)": fused["perspectives"]["mu"],
+            "前沿探索 (+2σ)": fused["perspectives"]["positive_tail"],
+            "传统警示 (-2σ)": fused["perspectives"]["negative_tail"],
+        }
+        result = self.ndsg._assemble_result(perspectives, fused["synthesis"], domain, None)
+
+        moral = fused["moral"]
+        moral_result = {
+            "universalizable": moral["universalizable"],
+            "humanity_respected": moral["humanity_respected"],
+            "autonomous": moral["autonomous"],
+            "reasoning": {"response": moral["reasoning"]},
+        }
+        if not self._record_moral_result(ctx, moral_result):
+            ctx.add_step("道德检验", "融合推理未通过道德检验，转入多次调用路径")
+            return result, None
+
+        calibration = fused["calibration"]
+        calibration_result = {
+            "calibrated_response": calibration["calibrated_response"],
+            "heat_death_check": {
+                "passed": calibration["heat_death_passed"],
+                "reason": calibration["reason"]
+                or ("归零检验完成" if calibration["heat_death_passed"] else "未能通过归零检验"),
+            },
+            "calibration_type": calibration_type,
+        }
+        graph = self._build_stage_graph(
+            user_query,
+            domain,
+            lambda: (result, True),
+            lambda **_: calibration_result,
         )
+        return result, graph
+
+    def _record_fused_failure(self, ctx: RequestContext, error: LLMError):
+        """融合推理调用失败或输出无效时，把原因记入推理链"""
+        ctx.add_step("LLM 调用失败", f"融合推理退回多次调用路径：{error}")
+
+    def _add_sampling_step(self, ctx: RequestContext, result: Dict):
+        """记录初始正态采样步骤"""
+        if "reasoning" in result:
+            ctx.add_step("正态采样生成", "生成三视角（μ, +2σ, -2σ）", result["reasoning"])
+        self._record_llm_error(ctx, "正态采样生成", result)
+
+    def _record_llm_error(self, ctx: RequestContext, stage: str, result: Dict):
+        """模块因 LLM 调用失败退回规则路径时，把失败原因记入推理链"""
+        if "llm_error" in result:
+            ctx.add_step("LLM 调用失败", f"{stage}退回规则路径：{result['llm_error']}")
 
+    def _complete_response(
+        self, ctx: RequestContext, user_query: str, domain: str, result: Dict
+    ) -> Dict[str, any]:
+        """
+        在初始采样结果之上执行道德检验、校准与上下文注入（步骤3-8）
+
+        步骤按依赖图执行：生灭周期与宇宙上下文不依赖合题，与道德检验并发；
+        合题确定后，熵评估与归零校准并发。
+        """
+        graph = self._response_graph(ctx, user_query, domain, result)
+        stages = graph.run(get_stage_executor() if self.parallel_stages else None)
+        return self._assemble_output(ctx, stages)
+
+    def _response_graph(
+        self,
+        ctx: RequestContext,
+        user_query: str,
+        domain: str,
+        result: Dict,
+        rejected: bool = False,
+    ) -> StageGraph:
+        """多次调用路径的步骤3-7阶段图（rejected 见 _run_moral_checks）"""
+        return self._build_stage_graph(
+            user_query,
+            domain,
+            lambda: self._run_moral_checks(ctx, user_query, domain, result, rejected),
+            lambda **kwargs: self._bounded(
+                ctx,
+                "归零校准",
+                lambda: self.hdcm.calibrate(**kwargs),
+                lambda: self._calibrate_with_rules(**kwargs),
+            ),
+        )
+
+    def _aresponse_graph(
+        self,
+        ctx: RequestContext,
+        user_query: str,
+        domain: str,
+        result: Dict,
+        rejected: bool = False,
+    ) -> StageGraph:
+        """_response_graph 的异步版本：LLM 阶段以协程并发执行"""
+        return self._build_stage_graph(
+            user_query,
+            domain,
+            lambda: self._arun_moral_checks(ctx, user_query, domain, result, rejected),
+            lambda **kwargs: self._abounded(
+                ctx,
+                "归零校准",
+                lambda: self.hdcm.acalibrate(**kwargs),
+                lambda: self._calibrate_with_rules(**kwargs),
+            ),
+        )
+
+    def _build_stage_graph(
+        self, user_query: str, domain: str, moral_checks, calibrate
+    ) -> StageGraph:
+        """构造步骤3-7的阶段依赖图（moral_checks 与 calibrate 可以是同步或异步函数）"""
+        graph = StageGraph()
+        # 步骤3: 道德检验循环（返回最终采样结果与是否通过）
+        graph.add("moral", moral_checks)
+        # 步骤6: 生灭周期建模；步骤7: 宇宙上下文注入
+        graph.add("lifecycle", lambda: self._assess_lifecycles(user_query))
+        graph.add("cosmic", self.cosmic_context.estimate_cosmic_state)
+        # 步骤4: 熵感知评估
+        graph.add(
+            "entropy",
+            lambda moral: self.entropy_awareness.assess_entropy_impact(
+                moral[0]["synthesis"], [moral[0]["synthesis"]]
+            ),
+            deps=("moral",),
+        )
         # 步骤5: 归零校准（即使道德通过也需校准）
-        calibration_result = self.hdcm.calibrate(
-            raw_response=synthesis,
-            query_context={
-                "keywords": self._extract_keywords(user_query),
-                "type": domain,
-            },
-            reasoning_chain=[result["synthesis"]],
+        graph.add(
+            "calibration",
+            lambda moral: calibrate(
+                raw_response=moral[0]["synthesis"],
+                query_context=self._calibration_context(user_query, domain),
+                reasoning_chain=[moral[0]["synthesis"]],
+            ),
+            deps=("moral",),
         )
-        calibrated_synthesis = calibration_result["calibrated_response"]
+        return graph
 
-        # 步骤6: 生灭周期建模（提取关键概念）
-        key_concepts = self._extract_concepts(user_query)
-        lifecycle_analyses = {}
-        for concept in key_concepts[:3]:  # 最多分析3个概念
-            lifecycle_analyses[concept] = self.lifecycle_modeler.assess_lifecycle(
-                concept
+    def _calibrate_with_rules(
+        self, raw_response: str, query_context: dict, reasoning_chain: List[str]
+    ) -> Dict:
+        """归零校准的规则路径（参数同 hdcm.calibrate）"""
+        return self.hdcm._calibrate_with_rules(raw_response, query_context)
+
+    def _calibration_context(self, user_query: str, domain: str) -> Dict[str, Any]:
+        """归零校准使用的问题上下文"""
+        return {"keywords": self._extract_keywords(user_query), "type": domain}
+
+    def _calibration_type(self, user_query: str, domain: str) -> str:
+        """归零校准的问题类型"""
+        return self.hdcm._calibration_type(self._calibration_context(user_query, domain))
+
+    def _stage_event(self, name: str, value: Any) -> StageEvent:
+        """把阶段图中一个阶段的结果转换为对外的阶段事件"""
+        if name == "moral":
+            result, moral_ok = value
+            return StageEvent(name, {"passed": moral_ok, "perspectives": result["perspectives"]})
+        if name == "calibration":
+            return StageEvent(
+                name,
+                {
+                    "dialectical_synthesis": value["calibrated_response"],
+                    "heat_death_check": value.get("heat_death_check", {}),
+                },
             )
+        return StageEvent(name, value)
 
-        # 步骤7: 宇宙上下文注入
-        cosmic_state = self.cosmic_context.estimate_cosmic_state()
+    def _assemble_output(self, ctx: RequestContext, stages: Dict[str, Any]) -> Dict[str, any]:
+        """步骤8: 组装最终输出"""
+        result, moral_ok = stages["moral"]
+        calibration_result = stages["calibration"]
+        self._record_llm_error(ctx, "归零校准", calibration_result)
 
-        # 步骤8: 组装最终输出
         final_output = {
             "perspectives": result["perspectives"],
-            "dialectical_synthesis": calibrated_synthesis,
+            "dialectical_synthesis": calibration_result["calibrated_response"],
             "moral_status": "passed" if moral_ok else "compromised_after_retry",
             "cosmic_context": self.cosmic_context.get_cosmic_context_string(),
-            "cosmic_state": cosmic_state,
-            "entropy_assessment": entropy_assessment,
-            "lifecycle_analyses": lifecycle_analyses,
+            "cosmic_state": stages["cosmic"],
+            "entropy_assessment": stages["entropy"],
+            "lifecycle_analyses": stages["lifecycle"],
             "calibration_info": {
                 "heat_death_check": calibration_result.get("heat_death_check", {}),
                 "calibration_type": calibration_result.get("calibration_type", "general"),
             },
             "cosmic_mapping": result.get("cosmic_mapping", {}),
-            "reasoning_chain": self.reasoning_chain,  # 添加推理链
+            "reasoning_chain": [step.to_dict() for step in ctx.reasoning_chain],  # 添加推理链
+            "degraded_stages": list(ctx.degraded_stages),  # 因超出时间预算改用规则路径的阶段
         }
 
         return final_output
 
-    def _add_reasoning_step(
-        self, step_name: str, description: str, details: Optional[Dict] = None
-    ):
-        """添加推理步骤到推理链"""
-        step = {
-            "step": len(self.reasoning_chain) + 1,
-            "name": step_name,
-            "description": description,
-        }
-        if details:
-            step["details"] = details
-        self.reasoning_chain.append(step)
+    def _run_moral_checks(
+        self,
+        ctx: RequestContext,
+        user_query: str,
+        domain: str,
+        result: Dict,
+        rejected: bool = False,
+    ) -> tuple:
+        """
+        道德检验循环，未通过时重新采样
+
+        Args:
+            rejected: result 已经检验过且未通过（融合推理的结论，已记入推理链），
+                首轮不再检验，直接重新采样
+
+        Returns:
+            (最终采样结果, 是否通过道德检验)
+        """
+        for retry_count in range(self.max_retries):
+            speculation = None
+            if not (rejected and retry_count == 0):
+                # 提取合题作为待检验行动/主张，执行道德三重检验
+                action_claim = self._extract_moral_claim(ctx, result["synthesis"])
+                speculation = self._speculate_resample(ctx, user_query, domain)
+                try:
+                    moral_result = self._bounded(
+                        ctx,
+                        "道德三重检验",
+                        lambda: self.mv.validate(action_claim, context=user_query),
+                        lambda: self.mv._validate_with_rules(action_claim, user_query),
+                    )
+                except BaseException:
+                    if speculation is not None:
+                        speculation.discard()
+                    raise
+                if self._record_moral_result(ctx, moral_result):
+                    if speculation is not None:
+                        speculation.discard()
+                    return result, True
+
+            # 道德失败 → 调整采样策略（降低尾部权重，强化μ）
+            ctx.add_step("道德检验", f"未通过，进行第 {retry_count + 1} 次重试")
+            if speculation is not None:
+                resample = speculation.result
+            else:
+                resample = partial(
+                    self.ndsg.generate_with_bias,
+                    query=user_query,
+                    domain=domain,
+                    bias_toward_mu=True,
+                )
+            result = self._bounded(
+                ctx,
+                "调整采样策略",
+                resample,
+                lambda: self._resample_with_rules(user_query, domain, speculation),
+            )
+            self._record_resample(ctx, result)
+        return result, False
+
+    async def _arun_moral_checks(
+        self,
+        ctx: RequestContext,
+        user_query: str,
+        domain: str,
+        result: Dict,
+        rejected: bool = False,
+    ) -> tuple:
+        """_run_moral_checks 的异步版本"""
+        for retry_count in range(self.max_retries):
+            speculation = None
+            if not (rejected and retry_count == 0):
+                action_claim = self._extract_moral_claim(ctx, result["synthesis"])
+                speculation = self._aspeculate_resample(ctx, user_query, domain)
+                try:
+                    moral_result = await self._abounded(
+                        ctx,
+                        "道德三重检验",
+                        lambda: self.mv.avalidate(action_claim, context=user_query),
+                        lambda: self.mv._validate_with_rules(action_claim, user_query),
+                    )
+                except BaseException:
+                    if speculation is not None:
+                        speculation.discard()
+                    raise
+                if self._record_moral_result(ctx, moral_result):
+                    if speculation is not None:
+                        speculation.discard()
+                    return result, True
+
+            ctx.add_step("道德检验", f"未通过，进行第 {retry_count + 1} 次重试")
+            if speculation is not None:
+                resample = speculation.result
+            else:
+                resample = partial(
+                    self.ndsg.agenerate_with_bias,
+                    query=user_query,
+                    domain=domain,
+                    bias_toward_mu=True,
+                )
+            result = await self._abounded(
+                ctx,
+                "调整采样策略",
+                resample,
+                lambda: self._resample_with_rules(user_query, domain, speculation),
+            )
+            self._record_resample(ctx, result)
+        return result, False
+
+    def _speculate_resample(
+        self, ctx: RequestContext, user_query: str, domain: str
+    ) -> Optional[SpeculativeCall]:
+        """推测式重试开启时，在线程池中提前启动偏向 μ 的重新采样"""
+        if not (self.speculative_retry and self.use_llm) or ctx.expired():
+            return None
+        return SpeculativeCall(
+            lambda: self.ndsg.generate_with_bias(
+                query=user_query, domain=domain, bias_toward_mu=True
+            ),
+            get_stage_executor(),
+            self.speculation_stats,
+            lambda result: self._resample_tokens(user_query, result),
+        )
+
+    def _aspeculate_resample(
+        self, ctx: RequestContext, user_query: str, domain: str
+    ) -> Optional[AsyncSpeculativeCall]:
+        """_speculate_resample 的异步版本"""
+        if not (self.speculative_retry and self.use_llm) or ctx.expired():
+            return None
+        return AsyncSpeculativeCall(
+            lambda: self.ndsg.agenerate_with_bias(
+                query=user_query, domain=domain, bias_toward_mu=True
+            ),
+            self.speculation_stats,
+            lambda result: self._resample_tokens(user_query, result),
+        )
+
+    def _resample_with_rules(self, user_query: str, domain: str, speculation=None) -> Dict:
+        """重新采样的规则路径（丢弃已启动的推测采样）"""
+        if speculation is not None:
+            speculation.discard()
+        return self.ndsg._generate_with_rules(user_query, domain, bias_toward_mu=True)
+
+    def _resample_tokens(self, user_query: str, result: Optional[Dict]) -> int:
+        """估算一次重新采样消耗的 token（result 为 None 时只计提示部分）"""
+        system_prompt, prompt = self.ndsg._build_biased_prompts(user_query)
+        tokens = estimate_tokens(system_prompt + prompt)
+        if result is not None and "reasoning" in result:
+            tokens += estimate_tokens(result["reasoning"]["response"])
+        return tokens
+
+    def _extract_moral_claim(self, ctx: RequestContext, synthesis: str) -> str:
+        """从合题中提取待检验的行动主张，并记入推理链"""
+        action_claim = self._extract_action_from_synthesis(synthesis)
+        ctx.add_step("提取行动主张", f"从合题中提取：{action_claim[:50]}...")
+        return action_claim
+
+    def _record_moral_result(self, ctx: RequestContext, moral_result: Dict) -> bool:
+        """记录一次道德三重检验，返回是否通过"""
+        summary = (
+            f"可普遍化: {moral_result['universalizable']}, "
+            f"人性目的: {moral_result['humanity_respected']}, "
+            f"自主性: {moral_result['autonomous']}"
+        )
+        ctx.add_step("道德三重检验", summary, moral_result.get("reasoning"))
+        self._record_llm_error(ctx, "道德三重检验", moral_result)
+
+        passed = (
+            moral_result["universalizable"]
+            and moral_result["humanity_respected"]
+            and moral_result["autonomous"]
+        )
+        if passed:
+            ctx.add_step("道德检验", "通过道德三重检验")
+        return passed
+
+    def _record_resample(self, ctx: RequestContext, result: Dict):
+        """记录道德检验失败后的重新采样"""
+        if "reasoning" in result:
+            ctx.add_step("调整采样策略", "生成偏向稳健共识的回答", result["reasoning"])
+        self._record_llm_error(ctx, "调整采样策略", result)
+
+    def _assess_lifecycles(self, user_query: str) -> Dict[str, Dict]:
+        """对问题中的关键概念做生灭周期建模"""
+        key_concepts = self._extract_concepts(user_query)
+        lifecycle_analyses = {}
+        for concept in key_concepts[:3]:  # 最多分析3个概念
+            lifecycle_analyses[concept] = self.lifecycle_modeler.assess_lifecycle(
+                concept
+            )
+        return lifecycle_analyses
 
     def _classify_domain(self, query: str) -> str:
         """复用NDSG的分类逻辑"""
@@ -210,4 +849,54 @@ class PhilosophicallyAugmentedAgentSystem:
             "or",
         }
         concepts = [kw for kw in keywords if kw not in stopwords and len(kw) > 1]
-        return concepts[:5]  # 返回前5个概念
\ No newline at end of file
+        return concepts[:5]  # 返回前5个概念
+
+
+def _bounded_map(
+    submit: Callable[[str], Any], questions: Iterable[str], max_pending: int, ordered: bool
+) -> Iterator[Dict[str, Any]]:
+    """以最多 max_pending 个在途任务执行 submit，产出 respond_many 的结果项"""
+    def item(index: int, question: str, future) -> Dict[str, Any]:
+        try:
+            return {"index": index, "question": question, "result": future.result(), "error": None}
+        except Exception as e:
+            return {"index": index, "question": question, "result": None, "error": str(e)}
+
+    iterator = enumerate(questions)
+    window = deque()  # (序号, 问题, future)，按提交顺序排列
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(window) < max_pending:
+                try:
+                    index, question = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                window.append((index, question, submit(question)))
+            if not window:
+                return
+            if ordered:
+                yield item(*window.popleft())
+            else:
+                done, _ = wait([future for _, _, future in window], return_when=FIRST_COMPLETED)
+                for entry in [entry for entry in window if entry[2] in done]:
+                    window.remove(entry)
+                    yield item(*entry)
+    finally:
+        # 调用方提前停止迭代时，取消尚未开始的问题
+        for _, _, future in window:
+            future.cancel()
+
+
+# 进程模式下每个工作进程持有的智能体
+_worker_agent: Optional[PhilosophicallyAugmentedAgentSystem] = None
+
+
+def _init_worker_agent(factory: Callable[[], PhilosophicallyAugmentedAgentSystem]):
+    global _worker_agent
+    _worker_agent = factory()
+
+
+def _worker_respond(question: str) -> Dict[str, Any]:
+    return _worker_agent.respond(question)
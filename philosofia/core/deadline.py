@@ -0,0 +1,63 @@
+"""
+请求截止时间：为一次回答设置延迟预算
+各 LLM 阶段只在剩余时间内等待，超时或预计会超时的阶段改用规则路径
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class Deadline:
+    """基于 time.monotonic 的截止时间"""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_args(
+        cls, budget_ms: Optional[float] = None, deadline: Optional[float] = None
+    ) -> Optional["Deadline"]:
+        """
+        由延迟预算或截止时间创建（两者都提供时取较早者，都未提供时返回 None）
+
+        Args:
+            budget_ms: 从现在起的延迟预算（毫秒）
+            deadline: 截止时间点（time.monotonic() 的取值）
+        """
+        candidates = []
+        if budget_ms is not None:
+            if budget_ms < 0:
+                raise ValueError(f"budget_ms 不能为负数：{budget_ms}")
+            candidates.append(time.monotonic() + budget_ms / 1000)
+        if deadline is not None:
+            candidates.append(deadline)
+        return cls(min(candidates)) if candidates else None
+
+    def remaining(self) -> float:
+        """剩余秒数（已超时为 0）"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+# 限时执行 LLM 阶段使用的线程池（首次使用时创建）。
+# 与阶段线程池分开：阶段线程在此等待 LLM 调用，若共用一个线程池，繁忙时被等待的调用会排在
+# 等待者之后，即使后端正常也会超时降级。超时被放弃的调用在此继续执行，直到后端自身的请求超时。
+_deadline_executor = None
+_deadline_executor_lock = threading.Lock()
+
+
+def get_deadline_executor() -> ThreadPoolExecutor:
+    """获取进程级共享的限时调用线程池"""
+    global _deadline_executor
+    if _deadline_executor is None:
+        with _deadline_executor_lock:
+            if _deadline_executor is None:
+                _deadline_executor = ThreadPoolExecutor(
+                    max_workers=64, thread_name_prefix="philosofia-deadline"
+                )
+    return _deadline_executor
@@ -0,0 +1,152 @@
+"""
+问题域分类：多模式串匹配（Aho-Corasick 自动机）
+触发词表从数据文件加载，构建一次后在进程内共享；
+分类耗时与问题长度成线性关系，与词表规模无关
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 默认触发词表：{问题域: {触发词: 权重}}
+DEFAULT_DOMAINS_PATH = os.path.join(os.path.dirname(__file__), "data", "domains.json")
+
+# 输出项：(触发词编号, 问题域编号, 权重, 长度, 需要左边界, 需要右边界)
+_Output = Tuple[int, int, float, int, bool, bool]
+
+
+def _is_word_char(ch: str) -> bool:
+    """英文单词字符：英文触发词（如 "ai"）两侧不能紧挨这些字符，避免匹配到 "said" 之类的单词内部"""
+    return ch.isascii() and (ch.isalnum() or ch == "_")
+
+
+class DomainClassifier:
+    """
+    基于 Aho-Corasick 自动机的问题域分类器
+
+    所有触发词（统一转为小写）编译成一个自动机，对问题扫描一遍即可找出全部命中的触发词；
+    每个问题域的得分为命中触发词的权重之和（同一触发词只计一次）。
+    得分相同时按问题域在词表中的顺序取前者。
+    """
+
+    def __init__(self, domains: Dict[str, Dict[str, float]], default: str = "default"):
+        """
+        Args:
+            domains: {问题域: {触发词: 权重}}
+            default: 没有命中任何触发词时返回的问题域
+        """
+        self.domains = tuple(domains)
+        self.default = default
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[_Output]] = [[]]
+        term_count = 0
+
+        # 1. 构建字典树
+        for domain_index, terms in enumerate(domains.values()):
+            for term, weight in terms.items():
+                key = term.strip().lower()
+                if not key:
+                    raise ValueError(f"触发词不能为空（问题域：{self.domains[domain_index]}）")
+                node = 0
+                for ch in key:
+                    child = goto[node].get(ch)
+                    if child is None:
+                        child = len(goto)
+                        goto[node][ch] = child
+                        goto.append({})
+                        outputs.append([])
+                    node = child
+                outputs[node].append((
+                    term_count,
+                    domain_index,
+                    float(weight),
+                    len(key),
+                    _is_word_char(key[0]),
+                    _is_word_char(key[-1]),
+                ))
+                term_count += 1
+
+        # 2. 广度优先计算失败指针，并把失败指针所指节点的输出并入本节点
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                outputs[child] = outputs[child] + outputs[fail[child]]
+                queue.append(child)
+
+        self.term_count = term_count
+        self._goto = goto
+        self._fail = fail
+        self._outputs: List[Optional[Tuple[_Output, ...]]] = [
+            tuple(output) if output else None for output in outputs
+        ]
+
+    def _matches(self, text: str) -> Iterator[Tuple[int, _Output]]:
+        """扫描一遍文本，产出 (结束位置, 输出项)"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for i, ch in enumerate(text):
+            child = goto[node].get(ch)
+            while child is None and node:
+                node = fail[node]
+                child = goto[node].get(ch)
+            node = child or 0
+            if outputs[node] is not None:
+                for output in outputs[node]:
+                    yield i, output
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """各问题域的加权得分，按得分从高到低排列（没有命中的问题域不在结果中）"""
+        text = query.lower()
+        last = len(text) - 1
+        seen = set()
+        totals: Dict[int, float] = {}
+        for end, (term_id, domain_index, weight, length, left, right) in self._matches(text):
+            if term_id in seen:
+                continue
+            start = end - length + 1
+            if left and start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if right and end < last and _is_word_char(text[end + 1]):
+                continue
+            seen.add(term_id)
+            totals[domain_index] = totals.get(domain_index, 0.0) + weight
+        ranked = sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        return {self.domains[index]: score for index, score in ranked}
+
+    def classify(self, query: str) -> str:
+        """得分最高的问题域；没有命中任何触发词时返回 default"""
+        for domain in self.scores(query):
+            return domain
+        return self.default
+
+
+def load_domain_classifier(path: Optional[str] = None) -> DomainClassifier:
+    """
+    从 JSON 文件加载分类器
+
+    文件格式：{"default": "default", "domains": {问题域: {触发词: 权重}}}
+    """
+    with open(path or DEFAULT_DOMAINS_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return DomainClassifier(data["domains"], default=data.get("default", "default"))
+
+
+# 进程级默认分类器
+_default_classifier: Optional[DomainClassifier] = None
+_default_classifier_lock = threading.Lock()
+
+
+def get_domain_classifier() -> DomainClassifier:
+    """获取（首次调用时从默认词表构建）进程级默认分类器"""
+    global _default_classifier
+    if _default_classifier is None:
+        with _default_classifier_lock:
+            if _default_classifier is None:
+                _default_classifier = load_domain_classifier()
+    return _default_classifier
@@ -0,0 +1,113 @@
+"""
+LLM 调用的结构化异常
+后端不再把异常转换成 "[LLM 错误: ...]" 字符串返回，而是抛出以下异常；retryable 标记是否值得重试
+"""
+from typing import Optional
+
+
+class LLMError(Exception):
+    """LLM 调用失败"""
+
+    retryable = False
+
+    def __init__(
+        self,
+        message: str,
+        backend: Optional[str] = None,
+        status_code: Optional[int] = None,
+    ):
+        super().__init__(message)
+        self.backend = backend
+        self.status_code = status_code
+
+    def __str__(self) -> str:
+        message = super().__str__()
+        return f"[{self.backend}] {message}" if self.backend else message
+
+
+class LLMTimeoutError(LLMError):
+    """请求超时"""
+
+    retryable = True
+
+
+class LLMConnectionError(LLMError):
+    """网络连接失败"""
+
+    retryable = True
+
+
+class LLMRateLimitError(LLMError):
+    """服务端限流（HTTP 429）"""
+
+    retryable = True
+
+    def __init__(self, *args, retry_after: Optional[float] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+
+
+class LLMServerError(LLMError):
+    """服务端错误（HTTP 5xx）"""
+
+    retryable = True
+
+
+class LLMAPIError(LLMError):
+    """其他 API 错误（如 400 参数错误、401 鉴权失败），重试无效"""
+
+
+class LLMOutputError(LLMError):
+    """模型输出无法解析或不符合要求的结构（如 generate_json 的 schema）"""
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """从各 SDK 的异常中提取 HTTP 状态码"""
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after_from_headers(headers) -> Optional[float]:
+    """读取响应头中的 Retry-After（秒）"""
+    try:
+        return float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+def error_from_status(
+    status_code: int,
+    message: str,
+    backend: Optional[str] = None,
+    retry_after: Optional[float] = None,
+) -> LLMError:
+    """根据 HTTP 状态码构造对应的异常"""
+    if status_code == 429:
+        return LLMRateLimitError(
+            message, backend=backend, status_code=status_code, retry_after=retry_after
+        )
+    if status_code >= 500:
+        return LLMServerError(message, backend=backend, status_code=status_code)
+    return LLMAPIError(message, backend=backend, status_code=status_code)
+
+
+def classify_error(error: BaseException, backend: Optional[str] = None) -> LLMError:
+    """把 SDK / HTTP 库抛出的异常归类为 LLMError"""
+    if isinstance(error, LLMError):
+        return error
+
+    message = str(error) or type(error).__name__
+    status = status_code_of(error)
+    if status is not None and status >= 400:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        return error_from_status(status, message, backend, retry_after_from_headers(headers))
+
+    name = type(error).__name__.lower()
+    # asyncio.TimeoutError 在 Python 3.11 之前不是 TimeoutError 的子类，按类名识别
+    if isinstance(error, TimeoutError) or "timeout" in name:
+        return LLMTimeoutError(message, backend=backend)
+    if isinstance(error, ConnectionError) or "connect" in name:
+        return LLMConnectionError(message, backend=backend)
+    return LLMError(message, backend=backend)
@@ -0,0 +1,127 @@
+"""
+融合推理：一次 LLM 调用同时完成正态采样、道德三重检验与归零校准
+模型以一个 JSON 对象返回三视角、合题、三项康德式检验结论与校准透镜，
+按 FUSED_SCHEMA 校验后直接组装为各模块的结果格式
+"""
+from typing import Any, Dict, Optional
+
+from .heat_death_calibrator import CALIBRATION_TYPE_PROMPTS
+from .llm_interface import LLMInterface, get_default_llm
+
+_TEXT = {"type": "string", "minLength": 1}
+
+FUSED_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["perspectives", "synthesis", "moral", "calibration"],
+    "properties": {
+        "perspectives": {
+            "type": "object",
+            "required": ["mu", "positive_tail", "negative_tail"],
+            "properties": {
+                "mu": _TEXT,
+                "positive_tail": _TEXT,
+                "negative_tail": _TEXT,
+            },
+        },
+        "synthesis": _TEXT,
+        "moral": {
+            "type": "object",
+            "required": ["universalizable", "humanity_respected", "autonomous", "reasoning"],
+            "properties": {
+                "universalizable": {"type": "boolean"},
+                "humanity_respected": {"type": "boolean"},
+                "autonomous": {"type": "boolean"},
+                "reasoning": {"type": "string"},
+            },
+        },
+        "calibration": {
+            "type": "object",
+            "required": ["heat_death_passed", "reason", "lens", "calibrated_response"],
+            "properties": {
+                "heat_death_passed": {"type": "boolean"},
+                "reason": {"type": "string"},
+                "lens": _TEXT,
+                "calibrated_response": _TEXT,
+            },
+        },
+    },
+}
+
+_SYSTEM_PROMPT = """你是一个哲学推理系统，需要在一次回答中完成三项工作：
+1. 基于正态分布的思想光谱生成三个视角，并综合为辩证合题
+2. 对合题执行康德式道德三重检验（可普遍化、人性目的、自主性）
+3. 以宇宙终将热寂为调节性理念执行归零检验，并给出校准透镜
+
+只输出一个 JSON 对象，不要输出代码块标记或其他文字。"""
+
+_PROMPT_TEMPLATE = """问题：{query}
+{type_prompt}
+
+请按以下步骤推理：
+1. 稳健共识 (μ)：主流、平衡的观点（约68%的人会认同）
+   前沿探索 (+2σ)：激进、创新的观点（约2.5%的人会认同）
+   传统警示 (-2σ)：保守、谨慎的观点（约2.5%的人会认同）
+2. 辩证合题：综合三个视角，尽量给出能通过道德三重检验的立场
+3. 道德三重检验：如果所有人都这样做是否导致矛盾？是否把人当作纯粹手段？是否尊重自主选择？
+4. 归零检验：合题是否在承认宇宙有限性的前提下仍维护了理性的尊严（并避免虚无主义）？
+   生成一句宇宙校准的哲学箴言，并在合题基础上写出校准后的回答
+
+输出以下结构的 JSON（布尔值表示检验是否通过）：
+{{
+  "perspectives": {{"mu": "...", "positive_tail": "...", "negative_tail": "..."}},
+  "synthesis": "...",
+  "moral": {{"universalizable": true, "humanity_respected": true, "autonomous": true, "reasoning": "..."}},
+  "calibration": {{"heat_death_passed": true, "reason": "...", "lens": "...", "calibrated_response": "..."}}
+}}"""
+
+
+class FusedReasoner:
+    """单次调用的融合推理器"""
+
+    def __init__(self, llm: Optional[LLMInterface] = None, temperature: float = 0.5):
+        """
+        Args:
+            llm: LLM 接口实例（如果为 None，使用默认 LLM）
+            temperature: 融合调用的温度（介于采样 0.8 与检验 0.3 之间）
+        """
+        self.llm = llm or get_default_llm()
+        self.temperature = temperature
+
+    def build_prompts(self, query: str, calibration_type: str = "general") -> tuple:
+        """
+        构造融合推理的提示
+
+        Returns:
+            (system_prompt, prompt)
+        """
+        prompt = _PROMPT_TEMPLATE.format(
+            query=query, type_prompt=CALIBRATION_TYPE_PROMPTS[calibration_type]
+        )
+        return _SYSTEM_PROMPT, prompt
+
+    def reason(self, query: str, calibration_type: str = "general") -> Dict[str, Any]:
+        """
+        执行融合推理，返回符合 FUSED_SCHEMA 的字典
+
+        Raises:
+            LLMError: 调用失败；输出无法解析或不符合 schema 时为 LLMOutputError
+        """
+        system_prompt, prompt = self.build_prompts(query, calibration_type)
+        return self.llm.generate_json(
+            prompt,
+            system_prompt=system_prompt,
+            schema=FUSED_SCHEMA,
+            temperature=self.temperature,
+            max_tokens=2000,
+        )
+
+    async def areason(self, query: str, calibration_type: str = "general") -> Dict[str, Any]:
+        """reason 的异步版本"""
+        system_prompt, prompt = self.build_prompts(query, calibration_type)
+        return await self.llm.agenerate_json(
+            prompt,
+            system_prompt=system_prompt,
+            schema=FUSED_SCHEMA,
+            temperature=self.temperature,
+            max_tokens=2000,
+        )
@@ -1,6 +1,25 @@
 from typing import Dict, List, Optional
 
+from .errors import LLMError
 from .llm_interface import LLMInterface, get_default_llm
+from .section_parser import Section, SectionParser, parse_verdict, strip_verdict
+
+
+# 各问题类型在校准提示中的说明
+CALIBRATION_TYPE_PROMPTS = {
+    "moral": "这是一个道德问题。",
+    "epistemic": "这是一个知识论问题。",
+    "aesthetic": "这是一个美学问题。",
+    "general": "这是一个一般性问题。",
+}
+
+# 校准回答的分段（段名与融合推理 JSON 的字段名一致；reason 只出现在 JSON 回答中）
+CALIBRATION_SECTIONS = SectionParser({
+    "heat_death_passed": ("归零检验", "heat death"),
+    "reason": (),
+    "lens": ("校准透镜", "lens"),
+    "calibrated_response": ("校准后的回答", "calibrated"),
+})
 
 
 class HeatDeathCalibrationModule:
@@ -34,14 +53,55 @@ class HeatDeathCalibrationModule:
         执行归零校准：在宇宙有限性的背景下校准回答
         """
         if self.use_llm:
-            return self._calibrate_with_llm(raw_response, query_context, reasoning_chain)
+            try:
+                return self._calibrate_with_llm(raw_response, query_context, reasoning_chain)
+            except LLMError as e:
+                # LLM 调用失败时退回规则校准
+                result = self._calibrate_with_rules(raw_response, query_context)
+                result["llm_error"] = str(e)
+                return result
         else:
             return self._calibrate_with_rules(raw_response, query_context)
 
+    async def acalibrate(
+        self, raw_response: str, query_context: dict, reasoning_chain: List[str]
+    ) -> Dict:
+        """calibrate 的异步版本（通过 LLM 的异步接口调用）"""
+        if not self.use_llm:
+            return self._calibrate_with_rules(raw_response, query_context)
+
+        system_prompt, prompt, calibration_type = self._build_calibration_prompts(
+            raw_response, query_context
+        )
+        try:
+            response = await self.llm.agenerate_with_reasoning(
+                prompt, system_prompt=system_prompt, temperature=0.5
+            )
+        except LLMError as e:
+            result = self._calibrate_with_rules(raw_response, query_context)
+            result["llm_error"] = str(e)
+            return result
+        return self._calibration_result(response, raw_response, calibration_type)
+
     def _calibrate_with_llm(
         self, raw_response: str, query_context: dict, reasoning_chain: List[str]
     ) -> Dict:
         """使用 LLM 进行归零校准"""
+        system_prompt, prompt, calibration_type = self._build_calibration_prompts(
+            raw_response, query_context
+        )
+        response = self.llm.generate_with_reasoning(
+            prompt, system_prompt=system_prompt, temperature=0.5
+        )
+        return self._calibration_result(response, raw_response, calibration_type)
+
+    def _build_calibration_prompts(self, raw_response: str, query_context: dict) -> tuple:
+        """
+        构造归零校准的提示
+
+        Returns:
+            (system_prompt, prompt, calibration_type)
+        """
         system_prompt = """你是一个宇宙感知型哲学家，擅长在宇宙有限性的背景下校准判断。
 你需要执行"归零检验"：此回答是否在承认宇宙有限性的前提下，仍维护了理性的尊严？
 
@@ -51,18 +111,8 @@ class HeatDeathCalibrationModule:
 - 理性尊严不因有限性而减损"""
 
         # 判断问题类型
-        if self._is_moral_question(query_context):
-            calibration_type = "moral"
-            type_prompt = "这是一个道德问题。"
-        elif self._is_epistemic_question(query_context):
-            calibration_type = "epistemic"
-            type_prompt = "这是一个知识论问题。"
-        elif self._is_aesthetic_question(query_context):
-            calibration_type = "aesthetic"
-            type_prompt = "这是一个美学问题。"
-        else:
-            calibration_type = "general"
-            type_prompt = "这是一个一般性问题。"
+        calibration_type = self._calibration_type(query_context)
+        type_prompt = CALIBRATION_TYPE_PROMPTS[calibration_type]
 
         prompt = f"""{type_prompt}
 
@@ -83,16 +133,29 @@ class HeatDeathCalibrationModule:
 校准透镜: [你的哲学箴言]
 校准后的回答: [在原始回答基础上添加宇宙校准]"""
 
-        response = self.llm.generate_with_reasoning(
-            prompt, system_prompt=system_prompt, temperature=0.5
-        )
+        return system_prompt, prompt, calibration_type
 
+    def _calibration_type(self, query_context: dict) -> str:
+        """判断问题类型：moral / epistemic / aesthetic / general"""
+        if self._is_moral_question(query_context):
+            return "moral"
+        if self._is_epistemic_question(query_context):
+            return "epistemic"
+        if self._is_aesthetic_question(query_context):
+            return "aesthetic"
+        return "general"
+
+    def _calibration_result(
+        self, response: Dict, raw_response: str, calibration_type: str
+    ) -> Dict:
+        """解析 LLM 的校准结果"""
         llm_response = response["response"]
 
         # 解析响应
-        heat_death_check = self._parse_heat_death_check(llm_response)
-        lens = self._parse_lens(llm_response)
-        calibrated_response = self._parse_calibrated_response(llm_response, raw_response)
+        sections = CALIBRATION_SECTIONS.parse(llm_response)
+        heat_death_check = self._parse_heat_death_check(sections, llm_response)
+        lens = self._parse_lens(sections)
+        calibrated_response = self._parse_calibrated_response(sections, raw_response, lens)
 
         return {
             "calibrated_response": calibrated_response,
@@ -101,47 +164,40 @@ class HeatDeathCalibrationModule:
             "reasoning": response,
         }
 
-    def _parse_heat_death_check(self, text: str) -> Dict:
-        """解析归零检验结果"""
-        text_lower = text.lower()
-        passed = "通过" in text_lower or "pass" in text_lower
-        if "失败" in text_lower or "fail" in text_lower:
-            passed = False
+    def _parse_heat_death_check(self, sections: Dict[str, Section], text: str) -> Dict:
+        """解析归零检验结果；回答中没有归零检验段时按全文判断"""
+        section = sections.get("heat_death_passed")
+        passed = section.verdict() if section is not None else None
+        if passed is None:
+            passed = parse_verdict(text) is True
 
         # 提取原因
-        reason = ""
-        lines = text.split("\n")
-        for i, line in enumerate(lines):
-            if "归零检验" in line or "heat death" in line.lower():
-                if i + 1 < len(lines):
-                    reason = lines[i + 1].strip()
-                break
+        if "reason" in sections:
+            reason = sections["reason"].text
+        else:
+            reason = strip_verdict(section.text) if section is not None else ""
 
         if not reason:
             reason = "归零检验完成" if passed else "未能通过归零检验"
 
         return {"passed": passed, "reason": reason}
 
-    def _parse_lens(self, text: str) -> str:
+    def _parse_lens(self, sections: Dict[str, Section]) -> str:
         """解析校准透镜"""
-        lines = text.split("\n")
-        for i, line in enumerate(lines):
-            if "校准透镜" in line or "lens" in line.lower():
-                if ":" in line:
-                    return line.split(":", 1)[-1].strip()
-                elif i + 1 < len(lines):
-                    return lines[i + 1].strip()
+        section = sections.get("lens")
+        if section is not None and section.text:
+            return section.text
         return "意义源于有限理性存在者的自我立法。"
 
-    def _parse_calibrated_response(self, text: str, raw_response: str) -> str:
+    def _parse_calibrated_response(
+        self, sections: Dict[str, Section], raw_response: str, lens: str
+    ) -> str:
         """解析校准后的回答"""
-        lines = text.split("\n")
-        for i, line in enumerate(lines):
-            if "校准后的回答" in line or "calibrated" in line.lower():
-                if i + 1 < len(lines):
-                    return lines[i + 1].strip()
+        section = sections.get("calibrated_response")
+        if section is not None and section.text:
+            return section.text
         # 如果没有找到，在原始回答基础上添加校准
-        return f"{raw_response}\n\n[宇宙校准] {self._parse_lens(text)}"
+        return f"{raw_response}\n\n[宇宙校准] {lens}"
 
     def _calibrate_with_rules(
         self, raw_response: str, query_context: dict
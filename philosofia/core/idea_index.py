@@ -0,0 +1,275 @@
+"""
+思想分布的本地向量检索：哈希字符 n-gram 向量 + 稀疏内积 top-k
+问题落在所有触发词之外时，用它找到最相近的问题域，而不是一律退回 default。
+离线、仅用 CPU，需要 numpy（pip install numpy）
+"""
+import math
+import re
+import threading
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("需要安装 numpy 库：pip install numpy")
+    return numpy
+
+
+class _Segment:
+    """
+    不可变的稀疏矩阵段（按特征排序的 CSC）：features 为出现过的特征，
+    第 j 个特征的条目编号与权重为 ids / weights[indptr[j]:indptr[j + 1]]
+    """
+
+    __slots__ = ("features", "indptr", "ids", "weights")
+
+    def __init__(self, np, features, ids, weights):
+        # 稳定排序，同一特征内条目编号保持递增
+        order = np.argsort(features, kind="stable")
+        features = features[order]
+        self.ids = ids[order]
+        self.weights = weights[order]
+        self.features, starts = np.unique(features, return_index=True)
+        self.indptr = np.append(starts, len(features))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def entries(self, np) -> tuple:
+        """展开为 (特征, 条目编号, 权重) 三个并列数组，用于合并"""
+        return np.repeat(self.features, np.diff(self.indptr)), self.ids, self.weights
+
+    def gather(self, np, features, weights) -> Optional[tuple]:
+        """取出查询特征所在的列：(条目编号, 权重 × 查询权重)；没有命中时返回 None"""
+        pos = np.searchsorted(self.features, features)
+        pos[pos == len(self.features)] = 0
+        hit = self.features[pos] == features
+        pos, weights = pos[hit], weights[hit]
+        starts = self.indptr[pos]
+        lengths = self.indptr[pos + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return None
+        # 各列的下标区间拼接为一个下标数组
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+        return self.ids[offsets], self.weights[offsets] * np.repeat(weights, lengths)
+
+
+class IdeaIndex:
+    """
+    哈希 n-gram 检索索引
+
+    每个条目的文本切成字符 n-gram（小写，连续的标点与空白压缩为一个空格），
+    哈希到 dim 维，按对数词频取 L2 归一化的稀疏向量，按列（特征）保存在 NumPy 数组中。
+    查询时只读取查询中出现的特征所在的列，按 IDF 加权累加内积，得分为余弦相似度（0~1）。
+
+    条目向量与 IDF 无关，插入不需要重算已有条目：新条目先进入内存中的小缓冲区（按特征分组的列表），
+    缓冲区满 buffer_size 个条目时转为一个不可变的 NumPy 段，相近大小的段逐级合并，
+    段数保持在 O(log n)，每个条目被合并的次数也是 O(log n)。
+
+    写入加锁；查询不加锁，每次查询读取写入时整体替换的快照，可与写入并发。
+    哈希使用 Python 内置 hash，索引只在内存中使用，不同进程的哈希碰撞不同不影响结果的含义。
+    """
+
+    def __init__(
+        self,
+        ngram_range: Tuple[int, int] = (2, 3),
+        dim: int = 1 << 20,
+        min_score: float = 0.05,
+        buffer_size: int = 1024,
+    ):
+        """
+        Args:
+            ngram_range: n-gram 的最小与最大长度（字符）；文本短于最小长度时整体作为一个特征
+            dim: 哈希维数（2 的幂）
+            min_score: 采样器采用检索结果的最低相似度
+            buffer_size: 缓冲区转为 NumPy 段的条目数
+        """
+        if dim <= 0 or dim & (dim - 1):
+            raise ValueError(f"哈希维数必须是 2 的幂：{dim}")
+        if not 1 <= ngram_range[0] <= ngram_range[1]:
+            raise ValueError(f"无效的 n-gram 范围：{ngram_range}")
+        self._np = _require_numpy()
+        self.ngram_range = ngram_range
+        self.dim = dim
+        self.min_score = min_score
+        self.buffer_size = buffer_size
+        self._keys: List[str] = []
+        self._df = Counter()  # 特征 → 包含该特征的条目数
+        # 查询读取的快照：(各段, 缓冲区 {特征: (条目编号列表, 权重列表)}, 缓冲区条目数)
+        self._state = ((), {}, 0)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _features(self, text: str) -> dict:
+        """文本的哈希 n-gram 计数 {特征: 次数}"""
+        text = " ".join(_TOKEN.findall(text.lower()))
+        low, high = self.ngram_range
+        mask = self.dim - 1
+        if 0 < len(text) < low:
+            return {hash(text) & mask: 1}
+        counts = {}
+        for n in range(low, min(high, len(text)) + 1):
+            for feature in [hash(text[i : i + n]) & mask for i in range(len(text) - n + 1)]:
+                counts[feature] = counts.get(feature, 0) + 1
+        return counts
+
+    def _vector(self, text: str) -> Tuple[list, list]:
+        """条目向量：对数词频，L2 归一化"""
+        counts = self._features(text)
+        weights = [1.0 + math.log(count) for count in counts.values()]
+        norm = math.sqrt(sum(w * w for w in weights)) or 1.0
+        return list(counts), [w / norm for w in weights]
+
+    def add(self, key: str, text: str) -> int:
+        """插入一个条目，返回其编号"""
+        return self.add_many([(key, text)])
+
+    def add_many(self, items: Iterable[Tuple[str, str]]) -> int:
+        """
+        批量插入条目 (key, text)，返回最后一个条目的编号（没有条目时为 -1）
+
+        不少于 buffer_size 个条目的批次直接构建为一个段。
+        """
+        np = self._np
+        vectors = [(key, self._vector(text)) for key, text in items]
+        with self._lock:
+            first = len(self._keys)
+            segments, buffer, buffered = self._state
+            if len(vectors) >= self.buffer_size:
+                features, ids, weights = [], [], []
+                for offset, (_, (item_features, item_weights)) in enumerate(vectors):
+                    features.extend(item_features)
+                    ids.extend([first + offset] * len(item_features))
+                    weights.extend(item_weights)
+                segment = _Segment(
+                    np,
+                    np.asarray(features, dtype=np.int64),
+                    np.asarray(ids, dtype=np.int32),
+                    np.asarray(weights, dtype=np.float32),
+                )
+                segments = self._merge(segments + (segment,))
+            else:
+                # 缓冲区原地追加：查询只取登记过的条目（编号小于查询开始时的条目数）
+                for offset, (_, (item_features, item_weights)) in enumerate(vectors):
+                    for feature, weight in zip(item_features, item_weights):
+                        column = buffer.get(feature)
+                        if column is None:
+                            column = buffer[feature] = ([], [])
+                        column[0].append(first + offset)
+                        column[1].append(weight)
+                buffered += len(vectors)
+                if buffered >= self.buffer_size:
+                    segments = self._merge(segments + (self._flush(buffer),))
+                    buffer, buffered = {}, 0
+
+            for _, (features, _) in vectors:
+                self._df.update(features)
+            self._state = (segments, buffer, buffered)
+            # 最后登记条目：查询只看到已完整写入的条目
+            self._keys.extend(key for key, _ in vectors)
+            return len(self._keys) - 1
+
+    def _flush(self, buffer: dict) -> _Segment:
+        """把缓冲区转为段"""
+        np = self._np
+        lengths = [len(ids) for ids, _ in buffer.values()]
+        return _Segment(
+            np,
+            np.repeat(np.fromiter(buffer, dtype=np.int64, count=len(buffer)), lengths),
+            np.asarray([i for ids, _ in buffer.values() for i in ids], dtype=np.int32),
+            np.asarray([w for _, weights in buffer.values() for w in weights], dtype=np.float32),
+        )
+
+    def _merge(self, segments: tuple) -> tuple:
+        """最后一段不小于前一段的一半时与之合并，段的大小从前往后至少减半"""
+        np = self._np
+        while len(segments) > 1 and 2 * len(segments[-1]) >= len(segments[-2]):
+            older, newer = segments[-2].entries(np), segments[-1].entries(np)
+            merged = _Segment(np, *(np.concatenate(pair) for pair in zip(older, newer)))
+            segments = segments[:-2] + (merged,)
+        return segments
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """与查询最相近的 k 个条目 [(key, 相似度)]，按相似度从高到低"""
+        np = self._np
+        keys = self._keys
+        size = len(keys)
+        segments, buffer, _ = self._state
+        counts = self._features(query)
+        if not size or not counts or k <= 0:
+            return []
+
+        # 查询向量：对数词频 × IDF
+        features = list(counts)
+        query_weights = [
+            (1.0 + math.log(count)) * (math.log((size + 1) / (self._df.get(feature, 0) + 1)) + 1.0)
+            for feature, count in counts.items()
+        ]
+        scale = 1.0 / math.sqrt(sum(w * w for w in query_weights))
+
+        id_parts, weight_parts = [], []
+        feature_array = np.asarray(features, dtype=np.int64)
+        weight_array = np.asarray(query_weights, dtype=np.float32)
+        for segment in segments:
+            gathered = segment.gather(np, feature_array, weight_array)
+            if gathered is not None:
+                id_parts.append(gathered[0])
+                weight_parts.append(gathered[1])
+        buffer_ids, buffer_weights = [], []
+        for feature, weight in zip(features, query_weights):
+            column = buffer.get(feature)
+            if column is not None:
+                # 并发写入时两个列表可能相差一个元素，取共同的前缀
+                length = min(len(column[0]), len(column[1]))
+                buffer_ids.extend(column[0][:length])
+                buffer_weights.extend(w * weight for w in column[1][:length])
+        if buffer_ids:
+            id_parts.append(np.asarray(buffer_ids, dtype=np.int32))
+            weight_parts.append(np.asarray(buffer_weights, dtype=np.float32))
+        if not id_parts:
+            return []
+
+        ids = np.concatenate(id_parts)
+        weights = np.concatenate(weight_parts).astype(np.float64)
+        if len(keys) > size:
+            # 查询期间有新条目写入
+            live = ids < size
+            ids, weights = ids[live], weights[live]
+        if len(ids) * 8 >= size:
+            candidates = None
+            scores = np.bincount(ids, weights)
+        else:
+            # 命中的条目远少于总数时只在命中的条目上累加
+            candidates, inverse = np.unique(ids, return_inverse=True)
+            scores = np.bincount(inverse, weights)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (keys[i if candidates is None else candidates[i]], float(scores[i]) * scale)
+            for i in top.tolist()
+            if scores[i] > 0
+        ]
+
+
+def build_idea_index(store, **kwargs) -> IdeaIndex:
+    """
+    用思想分布目录（IdeaStore 或 {问题域: 分布} 字典）构建检索索引
+
+    每个问题域的文本为问题域名称与 μ / +2σ / -2σ 三个观点（不含 default）；kwargs 传给 IdeaIndex。
+    """
+    index = IdeaIndex(**kwargs)
+    index.add_many(
+        (domain, " ".join([domain.replace("_", " ")] + list(dist.values())))
+        for domain, dist in store.items()
+        if domain != "default"
+    )
+    return index
@@ -0,0 +1,156 @@
+"""
+思想分布目录：磁盘上按问题域排序的 JSON Lines 文件
+每行一个问题域 {"domain": ..., "mu": ..., "positive_tail": ..., "negative_tail": ...}，
+打开时只做内存映射，按问题域二分查找所在行，启动耗时与目录规模无关；
+同一文件在进程内只打开一次，所有采样器共享同一个只读目录
+"""
+import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Tuple
+
+# 默认目录
+DEFAULT_IDEA_STORE_PATH = os.path.join(os.path.dirname(__file__), "data", "idea_distributions.jsonl")
+
+# 每个问题域的字段
+IDEA_FIELDS = ("mu", "positive_tail", "negative_tail")
+
+# 目录文件每行的开头；二分查找时只解码问题域这一个字段
+_LINE_PREFIX = b'{"domain": '
+
+
+def write_idea_store(distributions: Dict[str, Dict[str, str]], path: str):
+    """
+    把 {问题域: {mu, positive_tail, negative_tail}} 写成按问题域排序的目录文件
+
+    IdeaStore 依赖行的顺序做二分查找，目录文件应当由本函数生成。
+    """
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for domain in sorted(distributions):
+            if not isinstance(domain, str):
+                raise ValueError(f"问题域名称必须是字符串：{domain!r}")
+            dist = distributions[domain]
+            missing = [field for field in IDEA_FIELDS if field not in dist]
+            if missing:
+                raise ValueError(f"问题域 {domain} 缺少字段：{', '.join(missing)}")
+            record = {"domain": domain}
+            record.update((field, dist[field]) for field in IDEA_FIELDS)
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class IdeaStore:
+    """
+    只读的思想分布目录（线程安全）
+
+    支持 `domain in store`、`store[domain]`、`store.get(domain, default)`；
+    返回的分布是新字典，修改不影响目录。最近读取的问题域缓存在内存中。
+    """
+
+    def __init__(self, path: str = DEFAULT_IDEA_STORE_PATH, cache_size: int = 1024):
+        """
+        Args:
+            path: 目录文件（由 write_idea_store 生成）
+            cache_size: 缓存的问题域数上限
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Optional[Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._decoder = json.JSONDecoder()
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # 空文件无法映射，视为空目录
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def _find(self, domain: str) -> Optional[Dict[str, str]]:
+        """在映射的文件中二分查找问题域所在行"""
+        data = self._data
+        decode_key = self._decoder.raw_decode
+        lo, hi = 0, len(data)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b"\n", 0, mid) + 1
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(data)
+            key = decode_key(data[start + len(_LINE_PREFIX) : end].decode("utf-8"))[0]
+            if key == domain:
+                record = json.loads(data[start:end])
+                return {field: record[field] for field in IDEA_FIELDS}
+            if key < domain:
+                lo = end + 1
+            else:
+                hi = start
+        return None
+
+    def _lookup(self, domain: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            if domain in self._cache:
+                self._cache.move_to_end(domain)
+                return self._cache[domain]
+            dist = self._find(domain)
+            self._cache[domain] = dist
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return dist
+
+    def get(self, domain: str, default: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+        """问题域的思想分布；不存在时返回 default"""
+        dist = self._lookup(domain)
+        return dict(dist) if dist is not None else default
+
+    def __getitem__(self, domain: str) -> Dict[str, str]:
+        dist = self._lookup(domain)
+        if dist is None:
+            raise KeyError(domain)
+        return dict(dist)
+
+    def __contains__(self, domain: object) -> bool:
+        return isinstance(domain, str) and self._lookup(domain) is not None
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """按问题域顺序遍历整个目录（顺序读取，不经过缓存）"""
+        data = self._data
+        start = 0
+        while start < len(data):
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(data)
+            if end > start:
+                record = json.loads(data[start:end])
+                yield record["domain"], {field: record[field] for field in IDEA_FIELDS}
+            start = end + 1
+
+    def close(self):
+        """关闭内存映射与文件（可重复调用）"""
+        with self._lock:
+            if self._data:
+                self._data.close()
+                self._data = b""
+            self._file.close()
+            self._cache.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# 进程级共享目录：路径 → IdeaStore
+_shared_stores: Dict[str, IdeaStore] = {}
+_shared_stores_lock = threading.Lock()
+
+
+def get_idea_store(path: Optional[str] = None) -> IdeaStore:
+    """获取（首次调用时打开）进程内共享的目录，默认为包内自带的目录"""
+    path = os.path.abspath(path or DEFAULT_IDEA_STORE_PATH)
+    store = _shared_stores.get(path)
+    if store is None:
+        with _shared_stores_lock:
+            store = _shared_stores.get(path)
+            if store is None:
+                store = _shared_stores[path] = IdeaStore(path)
+    return store
@@ -0,0 +1,76 @@
+"""
+结构化输出：从模型回答中提取 JSON 对象，并按 JSON Schema 的常用子集校验
+支持的关键字：type、properties、required、items、enum、minLength
+"""
+import json
+from typing import Any, Dict, Optional
+
+from .errors import LLMOutputError
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "number": (int, float),
+    "integer": int,
+}
+
+
+def extract_json(text: str) -> Any:
+    """
+    从模型回答中提取 JSON
+
+    兼容 ```json 代码块以及 JSON 前后夹带说明文字的回答；无法解析时抛出 ValueError。
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1]
+        text = text.rsplit("```", 1)[0]
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("回答中没有 JSON 对象")
+    return json.loads(text[start : end + 1])
+
+
+def validate_json(value: Any, schema: Dict[str, Any], path: str = "$"):
+    """按 schema 校验 value，不符合时抛出 ValueError（错误信息包含字段路径）"""
+    expected = schema.get("type")
+    if expected is not None:
+        python_type = _TYPES[expected]
+        # bool 是 int 的子类，数值类型不接受布尔值
+        if not isinstance(value, python_type) or (
+            isinstance(value, bool) and expected in ("number", "integer")
+        ):
+            raise ValueError(f"{path} 应为 {expected}，实际为 {type(value).__name__}")
+    if "enum" in schema and value not in schema["enum"]:
+        raise ValueError(f"{path} 应为 {schema['enum']} 之一，实际为 {value!r}")
+    if isinstance(value, str) and len(value.strip()) < schema.get("minLength", 0):
+        raise ValueError(f"{path} 长度不足 {schema['minLength']}")
+    if isinstance(value, dict):
+        for key in schema.get("required", ()):
+            if key not in value:
+                raise ValueError(f"{path} 缺少字段 {key}")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                validate_json(value[key], sub_schema, f"{path}.{key}")
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            validate_json(item, schema["items"], f"{path}[{i}]")
+
+
+def parse_json_output(
+    text: str, schema: Optional[Dict[str, Any]] = None, backend: Optional[str] = None
+) -> Any:
+    """提取并校验模型输出的 JSON，失败时抛出 LLMOutputError"""
+    try:
+        value = extract_json(text)
+        if schema is not None:
+            validate_json(value, schema)
+    except ValueError as e:  # json.JSONDecodeError 是 ValueError 的子类
+        raise LLMOutputError(f"结构化输出无效：{e}", backend=backend) from e
+    return value
@@ -0,0 +1,347 @@
+"""
+LLM 响应缓存：包装任意 LLMInterface，对相同请求直接返回缓存结果
+两级缓存：有界内存 LRU（可选 TTL） + 可选的 SQLite 磁盘层（进程重启后仍有效）
+"""
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional
+
+from .llm_interface import LLMInterface
+
+# 缓存未命中标记（缓存值本身可能是空字符串）
+_MISSING = object()
+
+
+class LRUCache:
+    """线程安全的有界 LRU 缓存（内存层）"""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: 最大条目数，超出后淘汰最久未使用的条目
+            ttl: 条目存活时间（秒），None 表示永不过期
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """读取缓存，未命中或已过期返回 _MISSING"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.expirations += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, expires_at: Optional[float] = None):
+        """写入缓存（expires_at 为 None 时按 ttl 计算过期时间）"""
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCacheStore:
+    """基于 SQLite 的持久化缓存（磁盘层）"""
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        """
+        Args:
+            path: SQLite 数据库文件路径
+            ttl: 条目存活时间（秒），None 表示永不过期
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def get(self, key: str) -> Any:
+        """读取缓存，返回 (值, 过期时间)；未命中或已过期返回 _MISSING"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return _MISSING
+        return json.loads(value), expires_at
+
+    def set(self, key: str, value: Any) -> Optional[float]:
+        """写入缓存，返回过期时间"""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+        return expires_at
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLM(LLMInterface):
+    """
+    带缓存的 LLM 包装器
+
+    缓存键由后端类型、模型、系统提示、用户提示、温度和 max_tokens 共同决定。
+    注意：temperature > 0 时缓存会让相同请求始终返回同一次采样结果。
+    """
+
+    def __init__(
+        self,
+        llm: LLMInterface,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        disk_path: Optional[str] = None,
+    ):
+        """
+        初始化缓存包装器
+
+        Args:
+            llm: 被包装的 LLM 实例
+            max_entries: 内存 LRU 的最大条目数
+            ttl: 缓存存活时间（秒），None 表示永不过期
+            disk_path: SQLite 缓存文件路径（None 表示只使用内存缓存）
+        """
+        self.llm = llm
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.disk = SQLiteCacheStore(disk_path, ttl=ttl) if disk_path else None
+        self._stats_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _make_key(self, method: str, **params) -> str:
+        """根据后端、模型与请求参数生成缓存键"""
+        identity = {
+            "method": method,
+            "backend": type(self.llm).__name__,
+            "model": getattr(self.llm, "model", None) or getattr(self.llm, "model_name", None),
+        }
+        identity.update(params)
+        raw = json.dumps(identity, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Any:
+        """依次查询内存层与磁盘层"""
+        value = self.memory.get(key)
+        if value is not _MISSING:
+            with self._stats_lock:
+                self.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                self.memory.set(key, value, expires_at)  # 提升到内存层
+                with self._stats_lock:
+                    self.disk_hits += 1
+                return value
+
+        with self._stats_lock:
+            self.misses += 1
+        return _MISSING
+
+    def _store(self, key: str, value: Any):
+        """写入两级缓存（调用失败时后端抛出 LLMError，不会走到这里，因此错误不会被缓存）"""
+        expires_at = self.disk.set(key, value) if self.disk is not None else None
+        self.memory.set(key, value, expires_at)
+
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """带缓存的文本生成"""
+        key = self._make_key(
+            "generate",
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        cached = self._lookup(key)
+        if cached is not _MISSING:
+            return cached
+        response = self.llm.generate(prompt, system_prompt, temperature, max_tokens)
+        self._store(key, response)
+        return response
+
+    def generate_with_reasoning(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """带缓存的推理生成"""
+        key = self._make_key(
+            "generate_with_reasoning",
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+        )
+        cached = self._lookup(key)
+        if cached is not _MISSING:
+            return copy.deepcopy(cached)
+        result = self.llm.generate_with_reasoning(prompt, system_prompt, temperature)
+        # 缓存与调用方各持一份，调用方修改结果不会影响缓存
+        self._store(key, copy.deepcopy(result))
+        return result
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """带缓存的流式生成（命中时一次性产出，未命中时边转发边累积）"""
+        key = self._make_key(
+            "generate",
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        cached = self._lookup(key)
+        if cached is not _MISSING:
+            yield cached
+            return
+        pieces = []
+        for piece in self.llm.generate_stream(prompt, system_prompt, temperature, max_tokens):
+            pieces.append(piece)
+            yield piece
+        response = "".join(pieces)
+        self._store(key, response)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """带缓存的异步文本生成"""
+        key = self._make_key(
+            "generate",
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        cached = self._lookup(key)
+        if cached is not _MISSING:
+            return cached
+        response = await self.llm.agenerate(prompt, system_prompt, temperature, max_tokens)
+        self._store(key, response)
+        return response
+
+    async def agenerate_with_reasoning(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """带缓存的异步推理生成"""
+        key = self._make_key(
+            "generate_with_reasoning",
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+        )
+        cached = self._lookup(key)
+        if cached is not _MISSING:
+            return copy.deepcopy(cached)
+        result = await self.llm.agenerate_with_reasoning(prompt, system_prompt, temperature)
+        # 缓存与调用方各持一份，调用方修改结果不会影响缓存
+        self._store(key, copy.deepcopy(result))
+        return result
+
+    def close(self):
+        """关闭磁盘缓存与被包装的 LLM"""
+        if self.disk is not None:
+            self.disk.close()
+        self.llm.close()
+
+    async def aclose(self):
+        """关闭被包装的 LLM 在当前事件循环上的异步客户端"""
+        await self.llm.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        缓存统计信息
+
+        Returns:
+            {
+                "hits": 总命中数,
+                "memory_hits": 内存层命中数,
+                "disk_hits": 磁盘层命中数,
+                "misses": 未命中数,
+                "evictions": 内存层 LRU 淘汰数,
+                "expirations": 内存层过期清除数,
+                "size": 内存层当前条目数
+            }
+        """
+        with self._stats_lock:
+            return {
+                "hits": self.memory_hits + self.disk_hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.memory.evictions,
+                "expirations": self.memory.expirations,
+                "size": len(self.memory),
+            }
+
+    def clear(self):
+        """清空两级缓存"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
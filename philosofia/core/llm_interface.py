@@ -3,8 +3,59 @@ LLM 接口层：支持多种大语言模型后端
 支持：OpenAI API、本地模型（通过 transformers）、模拟模式（用于测试）
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any
+import asyncio
+import functools
+import json
 import os
+import re
+import threading
+import warnings
+import weakref
+
+from .errors import LLMError, classify_error, error_from_status, retry_after_from_headers
+from .model_registry import ModelRegistry, get_model_registry
+from .rate_limiter import NO_LIMIT, RateLimiter, estimate_tokens
+from .retry import HedgePolicy, RetryPolicy, acall_with_retry, call_with_retry
+
+
+# API 后端共用的推理提示模板
+_REASONING_PROMPT_TEMPLATE = """请逐步思考以下问题，并展示你的推理过程：
+
+问题：{prompt}
+
+请按以下格式回答：
+1. 首先分析问题的核心
+2. 从多个角度思考（至少3个视角）
+3. 综合判断并给出结论
+
+你的回答："""
+
+
+def _parse_reasoning_steps(response: str) -> List[Dict[str, Any]]:
+    """从按步骤组织的回答中解析推理步骤（简单解析，实际可以更复杂）"""
+    reasoning_steps = []
+    current_step = None
+    for line in response.split("\n"):
+        if line.strip().startswith(("1.", "2.", "3.", "首先", "其次", "最后")):
+            if current_step:
+                reasoning_steps.append(current_step)
+            current_step = {"step": len(reasoning_steps) + 1, "content": line.strip()}
+        elif current_step:
+            current_step["content"] += "\n" + line.strip()
+
+    if current_step:
+        reasoning_steps.append(current_step)
+
+    return reasoning_steps or [{"step": 1, "content": response}]
+
+
+def _batch_item(
+    index: int, response: Optional[str] = None, error: Optional[str] = None
+) -> Dict[str, Any]:
+    """构造批量生成的单项结果"""
+    return {"index": index, "response": response, "error": error}
 
 
 class LLMInterface(ABC):
@@ -51,6 +102,164 @@ class LLMInterface(ABC):
         """
         pass
 
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """
+        流式生成文本：逐段产出增量文本，拼接后与 generate 的结果一致
+
+        默认实现在完整生成后一次性产出；支持流式输出的后端会覆盖此方法。
+        """
+        yield self.generate(prompt, system_prompt, temperature, max_tokens)
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        批量生成文本：以有界并发执行多个提示，结果顺序与输入一致
+
+        Args:
+            prompts: 用户提示列表
+            system_prompt: 所有提示共用的系统提示
+            temperature: 温度参数
+            max_tokens: 每个提示的最大token数
+            max_concurrency: 最大并发请求数
+
+        Returns:
+            与 prompts 一一对应的列表，每项为
+            {"index": 序号, "response": 生成文本（失败时为 None）, "error": 错误信息（成功时为 None）}
+        """
+        def run(index: int, prompt: str) -> Dict[str, Any]:
+            try:
+                response = self.generate(prompt, system_prompt, temperature, max_tokens)
+            except Exception as e:
+                return _batch_item(index, error=str(e))
+            return _batch_item(index, response=response)
+
+        if not prompts:
+            return []
+        workers = max(1, min(max_concurrency, len(prompts)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, range(len(prompts)), prompts))
+
+    async def agenerate_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """批量生成文本的异步版本（返回格式同 generate_batch）"""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(index: int, prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    response = await self.agenerate(
+                        prompt, system_prompt, temperature, max_tokens
+                    )
+                except Exception as e:
+                    return _batch_item(index, error=str(e))
+            return _batch_item(index, response=response)
+
+        return list(
+            await asyncio.gather(*(run(i, prompt) for i, prompt in enumerate(prompts)))
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """
+        异步生成文本
+
+        默认实现把同步的 generate 交给线程池执行；
+        API 后端会覆盖为基于异步客户端的原生实现，从而在单个事件循环中复用连接。
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.generate, prompt, system_prompt, temperature, max_tokens
+            ),
+        )
+
+    async def agenerate_with_reasoning(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """异步生成文本并返回推理过程（返回格式同 generate_with_reasoning）"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.generate_with_reasoning, prompt, system_prompt, temperature
+            ),
+        )
+
+    def generate_json(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 1500,
+    ) -> Any:
+        """
+        生成 JSON 结构化输出
+
+        提示中应说明所需的 JSON 结构；回答中的 JSON 被提取出来并按 schema 校验，
+        无法解析或不符合 schema 时抛出 LLMOutputError。
+        """
+        from .json_output import parse_json_output
+
+        response = self.generate(prompt, system_prompt, temperature, max_tokens)
+        return parse_json_output(response, schema, getattr(self, "backend_name", None))
+
+    async def agenerate_json(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 1500,
+    ) -> Any:
+        """generate_json 的异步版本"""
+        from .json_output import parse_json_output
+
+        response = await self.agenerate(prompt, system_prompt, temperature, max_tokens)
+        return parse_json_output(response, schema, getattr(self, "backend_name", None))
+
+    def close(self):
+        """
+        释放客户端、连接池等资源（可重复调用）；默认实现不做任何事
+
+        异步客户端的连接池绑定创建它的事件循环，无法在这里同步关闭，见 aclose。
+        """
+
+    async def aclose(self):
+        """
+        关闭当前事件循环上的异步客户端（可重复调用）；默认实现不做任何事
+
+        应在事件循环结束前于该循环中调用，否则异步连接池要等到垃圾回收时才被释放。
+        之后在该循环中的异步调用会按需创建新的客户端。
+        """
+
 
 class MockLLM(LLMInterface):
     """
@@ -121,29 +330,162 @@ class MockLLM(LLMInterface):
             "confidence": 0.7,
         }
 
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """模拟流式输出：按标点切分为若干片段逐段产出"""
+        response = self.generate(prompt, system_prompt, temperature, max_tokens)
+        for piece in re.findall(r"[^，。！？,.!?]*[，。！？,.!?]?", response):
+            if piece:
+                yield piece
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """模拟生成无 I/O，直接在事件循环中执行"""
+        return self.generate(prompt, system_prompt, temperature, max_tokens)
 
-class OpenAILLM(LLMInterface):
-    """OpenAI API 接口"""
+    async def agenerate_with_reasoning(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """模拟推理过程（异步版本）"""
+        return self.generate_with_reasoning(prompt, system_prompt, temperature)
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-3.5-turbo"):
-        """
-        初始化 OpenAI LLM
-        
-        Args:
-            api_key: OpenAI API 密钥（如果为 None，从环境变量读取）
-            model: 使用的模型名称
-        """
+
+class _ChatCompletionLLM(LLMInterface):
+    """
+    Chat Completions 风格 API 后端的公共实现
+    OpenAI、千问兼容模式、DeepSeek、火山引擎方舟使用相同的消息格式与推理提示
+    """
+
+    # 后端名称（用于错误信息与限流器命名）
+    backend_name = "openai"
+
+    # generate_with_reasoning 返回的置信度，子类按模型能力覆盖
+    reasoning_confidence = 0.8
+
+    # 客户端限流器（见 rate_limiter.get_rate_limiter），None 表示不限流
+    rate_limiter: Optional[RateLimiter] = None
+
+    # 可重试错误（超时、连接失败、429、5xx）的重试策略；对冲策略默认关闭
+    retry_policy: Optional[RetryPolicy] = RetryPolicy()
+    hedge_policy: Optional[HedgePolicy] = None
+
+    def _configure_resilience(
+        self,
+        rate_limiter: Optional[RateLimiter],
+        retry: Optional[RetryPolicy],
+        hedge: Optional[HedgePolicy],
+    ):
+        """设置限流、重试与对冲策略（retry 为 None 时使用默认重试策略）"""
+        self.rate_limiter = rate_limiter
+        if retry is not None:
+            self.retry_policy = retry
+        self.hedge_policy = hedge
+
+    def _limiter(self):
+        """当前后端的限流器（未配置时返回不做限制的空实现）"""
+        return self.rate_limiter or NO_LIMIT
+
+    @staticmethod
+    def _token_cost(prompt: str, system_prompt: Optional[str], max_tokens: int) -> int:
+        """预估一次调用消耗的 token 数（输入估算 + 输出上限）"""
+        return estimate_tokens(prompt + (system_prompt or "")) + max_tokens
+
+    def _init_openai_client(self, api_key: Optional[str], base_url: Optional[str] = None):
+        """创建 OpenAI 兼容的同步客户端，并记录参数以便按需创建异步客户端"""
+        import openai
+
+        # 重试由 retry_policy 统一负责，关闭 SDK 自带的重试以免叠加
+        self._client_kwargs = {"api_key": api_key, "max_retries": 0}
+        if base_url:
+            self._client_kwargs["base_url"] = base_url
+        self.client = openai.OpenAI(**self._client_kwargs)
+        # 异步客户端的连接池绑定事件循环，因此按事件循环分别创建
+        self._async_client_class = openai.AsyncOpenAI
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def close(self):
+        """关闭同步客户端的连接池（异步客户端需在各自的事件循环中调用 aclose 关闭）"""
+        client = getattr(self, "client", None)
+        if client is not None:
+            client.close()
+
+    async def aclose(self):
+        """关闭当前事件循环上的 AsyncOpenAI 客户端"""
+        async_clients = getattr(self, "_async_clients", None)
+        if async_clients is None:
+            return
+        client = async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    def _get_async_client(self):
+        """获取当前事件循环对应的 AsyncOpenAI 客户端（惰性创建）"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_client_class(**self._client_kwargs)
+            self._async_clients[loop] = client
+        return client
+
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        """构造 Chat Completions 消息列表"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _complete(
+        self, prompt: str, system_prompt: Optional[str], temperature: float, max_tokens: int
+    ) -> str:
+        """单次 API 调用，失败时抛出 LLMError"""
         try:
-            import openai
+            with self._limiter().slot(
+                self._token_cost(prompt, system_prompt, max_tokens)
+            ) as slot:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(prompt, system_prompt),
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+                slot.record_usage(getattr(response.usage, "total_tokens", None))
+        except Exception as e:
+            raise classify_error(e, self.backend_name) from e
+        return response.choices[0].message.content
 
-            self.client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
-            self.model = model
-        except ImportError:
-            raise ImportError(
-                "需要安装 openai 库：pip install openai"
-            )
+    async def _acomplete(
+        self, prompt: str, system_prompt: Optional[str], temperature: float, max_tokens: int
+    ) -> str:
+        """单次异步 API 调用，失败时抛出 LLMError"""
+        try:
+            async with self._limiter().aslot(
+                self._token_cost(prompt, system_prompt, max_tokens)
+            ) as slot:
+                response = await self._get_async_client().chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(prompt, system_prompt),
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+                slot.record_usage(getattr(response.usage, "total_tokens", None))
         except Exception as e:
-            raise ValueError(f"OpenAI 初始化失败：{e}")
+            raise classify_error(e, self.backend_name) from e
+        return response.choices[0].message.content
 
     def generate(
         self,
@@ -152,22 +494,60 @@ class OpenAILLM(LLMInterface):
         temperature: float = 0.7,
         max_tokens: int = 1000,
     ) -> str:
-        """调用 OpenAI API 生成文本"""
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        """
+        调用 API 生成文本
+
+        可重试错误按 retry_policy 重试（配置 hedge_policy 时同时发送对冲请求），
+        最终仍失败时抛出 LLMError。
+        """
+        return call_with_retry(
+            lambda: self._complete(prompt, system_prompt, temperature, max_tokens),
+            self.retry_policy,
+            self.hedge_policy,
+        )
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """异步调用 API 生成文本（重试与对冲规则同 generate）"""
+        return await acall_with_retry(
+            lambda: self._acomplete(prompt, system_prompt, temperature, max_tokens),
+            self.retry_policy,
+            self.hedge_policy,
+        )
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """
+        调用 OpenAI 兼容 API 流式生成文本（stream=True）
 
+        已产出的片段无法撤回，因此流式调用不重试，失败时直接抛出 LLMError。
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            return response.choices[0].message.content
+            with self._limiter().slot(
+                self._token_cost(prompt, system_prompt, max_tokens)
+            ):
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._build_messages(prompt, system_prompt),
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                )
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
         except Exception as e:
-            return f"[LLM 错误: {str(e)}]"
+            raise classify_error(e, self.backend_name) from e
 
     def generate_with_reasoning(
         self,
@@ -177,66 +557,97 @@ class OpenAILLM(LLMInterface):
     ) -> Dict[str, Any]:
         """生成带推理过程的回答"""
         # 要求模型输出推理步骤
-        reasoning_prompt = f"""请逐步思考以下问题，并展示你的推理过程：
-
-问题：{prompt}
-
-请按以下格式回答：
-1. 首先分析问题的核心
-2. 从多个角度思考（至少3个视角）
-3. 综合判断并给出结论
-
-你的回答："""
-
         response = self.generate(
-            reasoning_prompt, system_prompt, temperature, max_tokens=1500
+            _REASONING_PROMPT_TEMPLATE.format(prompt=prompt),
+            system_prompt,
+            temperature,
+            max_tokens=1500,
         )
+        return self._reasoning_result(response)
 
-        # 简单解析推理步骤（实际可以更复杂）
-        reasoning_steps = []
-        lines = response.split("\n")
-        current_step = None
-        for line in lines:
-            if line.strip().startswith(("1.", "2.", "3.", "首先", "其次", "最后")):
-                if current_step:
-                    reasoning_steps.append(current_step)
-                current_step = {"step": len(reasoning_steps) + 1, "content": line.strip()}
-            elif current_step:
-                current_step["content"] += "\n" + line.strip()
-
-        if current_step:
-            reasoning_steps.append(current_step)
+    async def agenerate_with_reasoning(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """异步生成带推理过程的回答"""
+        response = await self.agenerate(
+            _REASONING_PROMPT_TEMPLATE.format(prompt=prompt),
+            system_prompt,
+            temperature,
+            max_tokens=1500,
+        )
+        return self._reasoning_result(response)
 
+    def _reasoning_result(self, response: str) -> Dict[str, Any]:
+        """把原始回答组装为推理结果字典"""
         return {
             "response": response,
-            "reasoning_steps": reasoning_steps if reasoning_steps else [
-                {"step": 1, "content": response}
-            ],
-            "confidence": 0.8,  # OpenAI 模型通常置信度较高
+            "reasoning_steps": _parse_reasoning_steps(response),
+            "confidence": self.reasoning_confidence,
         }
 
 
-class LocalLLM(LLMInterface):
-    """本地模型接口（通过 transformers）"""
+class OpenAILLM(_ChatCompletionLLM):
+    """OpenAI API 接口"""
+
+    backend_name = "openai"
+    reasoning_confidence = 0.8  # OpenAI 模型通常置信度较高
 
-    def __init__(self, model_name: str = "gpt2"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-3.5-turbo",
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+    ):
         """
-        初始化本地模型
+        初始化 OpenAI LLM
         
         Args:
-            model_name: HuggingFace 模型名称
+            api_key: OpenAI API 密钥（如果为 None，从环境变量读取）
+            model: 使用的模型名称
+            rate_limiter: 客户端限流器（可用 get_rate_limiter("openai", ...) 在实例间共享）
+            retry: 重试策略（None 使用默认的 3 次指数退避重试）
+            hedge: 对冲请求策略（None 表示不对冲）
         """
+        self._configure_resilience(rate_limiter, retry, hedge)
         try:
-            from transformers import pipeline
-
-            self.generator = pipeline(
-                "text-generation", model=model_name, device=-1
-            )  # device=-1 使用 CPU
-            self.model_name = model_name
+            self._init_openai_client(api_key or os.getenv("OPENAI_API_KEY"))
+            self.model = model
         except ImportError:
             raise ImportError(
-                "需要安装 transformers 库：pip install transformers torch"
+                "需要安装 openai 库：pip install openai"
             )
+        except Exception as e:
+            raise ValueError(f"OpenAI 初始化失败：{e}")
+
+
+class LocalLLM(LLMInterface):
+    """本地模型接口（通过 transformers）"""
+
+    def __init__(self, model_name: str = "gpt2", registry: Optional[ModelRegistry] = None):
+        """
+        初始化本地模型
+
+        模型由进程级注册表加载并共享：同名模型只加载一次，
+        实例被回收或调用 close() 时释放引用。
+
+        Args:
+            model_name: HuggingFace 模型名称
+            registry: 模型注册表（None 表示使用进程级默认注册表）
+        """
+        self.model_name = model_name
+        self.device = -1  # 使用 CPU
+        self.registry = registry or get_model_registry()
+        self.generator = self.registry.acquire(model_name, self.device)
+        self._release = weakref.finalize(self, self.registry.release, model_name, self.device)
+
+    def close(self):
+        """释放对共享模型的引用（可重复调用）"""
+        self._release()
 
     def generate(
         self,
@@ -259,7 +670,75 @@ class LocalLLM(LLMInterface):
             )
             return result[0]["generated_text"][len(full_prompt) :].strip()
         except Exception as e:
-            return f"[本地模型错误: {str(e)}]"
+            raise LLMError(f"本地模型错误: {e}", backend="local") from e
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        批量生成：把提示按 max_concurrency 分批，每批一次前向计算
+
+        模型由注册表在实例间共享，因此不修改共享 tokenizer 的填充设置：
+        每批提示在此左侧填充（解码器模型批量生成必须左侧填充），
+        没有填充 token 的模型以 eos token 填充，pad_token_id 作为生成参数传入。
+        """
+        if not prompts:
+            return []
+
+        full_prompts = [
+            f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+            for prompt in prompts
+        ]
+
+        try:
+            import torch
+        except ImportError:
+            raise ImportError("需要安装 torch 库：pip install transformers torch")
+
+        tokenizer = self.generator.tokenizer
+        model = self.generator.model
+        pad_token_id = tokenizer.pad_token_id
+        if pad_token_id is None:
+            pad_token_id = model.config.eos_token_id
+        batch_size = max(1, max_concurrency)
+
+        results = []
+        for offset in range(0, len(full_prompts), batch_size):
+            batch = full_prompts[offset : offset + batch_size]
+            try:
+                encoded = [tokenizer(prompt)["input_ids"] for prompt in batch]
+                width = max(len(ids) for ids in encoded)
+                input_ids = torch.tensor(
+                    [[pad_token_id] * (width - len(ids)) + ids for ids in encoded],
+                    device=self.generator.device,
+                )
+                attention_mask = torch.tensor(
+                    [[0] * (width - len(ids)) + [1] * len(ids) for ids in encoded],
+                    device=self.generator.device,
+                )
+                outputs = model.generate(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    pad_token_id=pad_token_id,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                )
+                texts = tokenizer.batch_decode(outputs[:, width:], skip_special_tokens=True)
+            except Exception as e:
+                error = str(LLMError(f"本地模型错误: {e}", backend="local"))
+                results.extend(
+                    _batch_item(offset + i, error=error) for i in range(len(batch))
+                )
+                continue
+            results.extend(
+                _batch_item(offset + i, response=text.strip()) for i, text in enumerate(texts)
+            )
+        return results
 
     def generate_with_reasoning(
         self,
@@ -276,14 +755,19 @@ class LocalLLM(LLMInterface):
         }
 
 
-class QwenLLM(LLMInterface):
+class QwenLLM(_ChatCompletionLLM):
     """通义千问（Qwen）API 接口"""
 
+    backend_name = "qwen"
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: str = "qwen-turbo",
         base_url: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
     ):
         """
         初始化千问 LLM
@@ -292,16 +776,18 @@ class QwenLLM(LLMInterface):
             api_key: DashScope API 密钥
             model: 模型名称（qwen-turbo, qwen-plus, qwen-max 等）
             base_url: API 基础 URL（默认使用 OpenAI 兼容模式）
+            rate_limiter: 客户端限流器（可用 get_rate_limiter("qwen", ...) 在实例间共享）
+            retry: 重试策略（None 使用默认的 3 次指数退避重试）
+            hedge: 对冲请求策略（None 表示不对冲）
         """
+        self._configure_resilience(rate_limiter, retry, hedge)
         self.api_key = api_key or os.getenv("DASHSCOPE_API_KEY") or os.getenv("QWEN_API_KEY")
         
         # 优先使用 OpenAI 兼容模式（更简单）
         try:
-            import openai
-
-            self.client = openai.OpenAI(
-                api_key=self.api_key,
-                base_url=base_url or "https://dashscope.aliyuncs.com/compatible-mode/v1",
+            self._init_openai_client(
+                self.api_key,
+                base_url or "https://dashscope.aliyuncs.com/compatible-mode/v1",
             )
             self.model = model
             self.use_openai_compat = True
@@ -333,102 +819,95 @@ class QwenLLM(LLMInterface):
         max_tokens: int = 1000,
     ) -> str:
         """调用千问 API 生成文本"""
-        try:
-            if hasattr(self, "use_openai_compat") and self.use_openai_compat:
-                # 使用 OpenAI 兼容接口（推荐）
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
-
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
-                return response.choices[0].message.content
-            else:
-                # 使用 DashScope SDK
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt})
+        if hasattr(self, "use_openai_compat") and self.use_openai_compat:
+            # 使用 OpenAI 兼容接口（推荐）
+            return super().generate(prompt, system_prompt, temperature, max_tokens)
+
+        return call_with_retry(
+            lambda: self._dashscope_complete(prompt, system_prompt, temperature, max_tokens),
+            self.retry_policy,
+            self.hedge_policy,
+        )
 
+    def _dashscope_complete(
+        self, prompt: str, system_prompt: Optional[str], temperature: float, max_tokens: int
+    ) -> str:
+        """通过 DashScope SDK 单次调用，失败时抛出 LLMError"""
+        try:
+            with self._limiter().slot(
+                self._token_cost(prompt, system_prompt, max_tokens)
+            ) as slot:
                 response = self.generation.call(
                     model=self.model,
-                    messages=messages,
+                    messages=self._build_messages(prompt, system_prompt),
                     temperature=temperature,
                     max_tokens=max_tokens,
                 )
-                if response.status_code == 200:
-                    return response.output.choices[0].message.content
-                else:
-                    return f"[千问 API 错误: {response.message}]"
+                slot.record_status(response.status_code)
         except Exception as e:
-            return f"[LLM 错误: {str(e)}]"
+            raise classify_error(e, self.backend_name) from e
+        if response.status_code != 200:
+            raise error_from_status(
+                response.status_code, f"千问 API 错误: {response.message}", self.backend_name
+            )
+        return response.output.choices[0].message.content
 
-    def generate_with_reasoning(
+    def generate_stream(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
-    ) -> Dict[str, Any]:
-        """生成带推理过程的回答"""
-        reasoning_prompt = f"""请逐步思考以下问题，并展示你的推理过程：
-
-问题：{prompt}
-
-请按以下格式回答：
-1. 首先分析问题的核心
-2. 从多个角度思考（至少3个视角）
-3. 综合判断并给出结论
-
-你的回答："""
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """流式调用千问 API（DashScope SDK 模式下一次性产出完整回答）"""
+        if self.use_openai_compat:
+            yield from super().generate_stream(prompt, system_prompt, temperature, max_tokens)
+        else:
+            yield self.generate(prompt, system_prompt, temperature, max_tokens)
 
-        response = self.generate(
-            reasoning_prompt, system_prompt, temperature, max_tokens=1500
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """异步调用千问 API（DashScope SDK 无异步客户端，退回线程池执行）"""
+        if self.use_openai_compat:
+            return await super().agenerate(prompt, system_prompt, temperature, max_tokens)
+        return await LLMInterface.agenerate(
+            self, prompt, system_prompt, temperature, max_tokens
         )
 
-        reasoning_steps = []
-        lines = response.split("\n")
-        current_step = None
-        for line in lines:
-            if line.strip().startswith(("1.", "2.", "3.", "首先", "其次", "最后")):
-                if current_step:
-                    reasoning_steps.append(current_step)
-                current_step = {"step": len(reasoning_steps) + 1, "content": line.strip()}
-            elif current_step:
-                current_step["content"] += "\n" + line.strip()
-
-        if current_step:
-            reasoning_steps.append(current_step)
-
-        return {
-            "response": response,
-            "reasoning_steps": reasoning_steps if reasoning_steps else [
-                {"step": 1, "content": response}
-            ],
-            "confidence": 0.8,
-        }
-
 
-class DeepSeekLLM(LLMInterface):
+class DeepSeekLLM(_ChatCompletionLLM):
     """DeepSeek API 接口（兼容 OpenAI 格式）"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "deepseek-chat"):
+    backend_name = "deepseek"
+    reasoning_confidence = 0.85
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "deepseek-chat",
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+    ):
         """
         初始化 DeepSeek LLM
         
         Args:
             api_key: DeepSeek API 密钥
             model: 模型名称（deepseek-chat, deepseek-coder 等）
+            rate_limiter: 客户端限流器（可用 get_rate_limiter("deepseek", ...) 在实例间共享）
+            retry: 重试策略（None 使用默认的 3 次指数退避重试）
+            hedge: 对冲请求策略（None 表示不对冲）
         """
+        self._configure_resilience(rate_limiter, retry, hedge)
         try:
-            import openai
-
-            self.client = openai.OpenAI(
-                api_key=api_key or os.getenv("DEEPSEEK_API_KEY"),
+            self._init_openai_client(
+                api_key or os.getenv("DEEPSEEK_API_KEY"),
                 base_url="https://api.deepseek.com/v1",
             )
             self.model = model
@@ -437,83 +916,28 @@ class DeepSeekLLM(LLMInterface):
         except Exception as e:
             raise ValueError(f"DeepSeek 初始化失败：{e}")
 
-    def generate(
-        self,
-        prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 1000,
-    ) -> str:
-        """调用 DeepSeek API 生成文本"""
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"[LLM 错误: {str(e)}]"
-
-    def generate_with_reasoning(
-        self,
-        prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-    ) -> Dict[str, Any]:
-        """生成带推理过程的回答"""
-        reasoning_prompt = f"""请逐步思考以下问题，并展示你的推理过程：
-
-问题：{prompt}
-
-请按以下格式回答：
-1. 首先分析问题的核心
-2. 从多个角度思考（至少3个视角）
-3. 综合判断并给出结论
-
-你的回答："""
-
-        response = self.generate(
-            reasoning_prompt, system_prompt, temperature, max_tokens=1500
-        )
-
-        reasoning_steps = []
-        lines = response.split("\n")
-        current_step = None
-        for line in lines:
-            if line.strip().startswith(("1.", "2.", "3.", "首先", "其次", "最后")):
-                if current_step:
-                    reasoning_steps.append(current_step)
-                current_step = {"step": len(reasoning_steps) + 1, "content": line.strip()}
-            elif current_step:
-                current_step["content"] += "\n" + line.strip()
 
-        if current_step:
-            reasoning_steps.append(current_step)
-
-        return {
-            "response": response,
-            "reasoning_steps": reasoning_steps if reasoning_steps else [
-                {"step": 1, "content": response}
-            ],
-            "confidence": 0.85,
-        }
+class VolcanoEngineLLM(_ChatCompletionLLM):
+    """火山引擎（ByteDance）API 接口"""
 
+    backend_name = "volcano"
 
-class VolcanoEngineLLM(LLMInterface):
-    """火山引擎（ByteDance）API 接口"""
+    # 火山引擎 API 调用示例（需要根据实际 API 文档调整）
+    DEFAULT_API_URL = "https://ark.cn-beijing.volces.com/api/v3/chat/completions"
 
     def __init__(
         self,
         access_key: Optional[str] = None,
         secret_key: Optional[str] = None,
         model: str = "ep-xxx",  # 需要替换为实际的 endpoint ID
+        api_url: Optional[str] = None,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
     ):
         """
         初始化火山引擎 LLM
@@ -522,10 +946,20 @@ class VolcanoEngineLLM(LLMInterface):
             access_key: 火山引擎 Access Key
             secret_key: 火山引擎 Secret Key
             model: 模型 endpoint ID
+            api_url: Chat Completions 接口地址（默认北京区域方舟接口）
+            pool_connections: 连接池缓存的主机数
+            pool_maxsize: 每个主机保持的最大长连接数（即最大并发请求数）
+            connect_timeout: 建立连接超时（秒）
+            read_timeout: 读取响应超时（秒）
+            rate_limiter: 客户端限流器（可用 get_rate_limiter("volcano", ...) 在实例间共享）
+            retry: 重试策略（None 使用默认的 3 次指数退避重试）
+            hedge: 对冲请求策略（None 表示不对冲）
         """
+        self._configure_resilience(rate_limiter, retry, hedge)
         self.access_key = access_key or os.getenv("VOLCENGINE_ACCESS_KEY")
         self.secret_key = secret_key or os.getenv("VOLCENGINE_SECRET_KEY")
         self.model = model
+        self.api_url = api_url or self.DEFAULT_API_URL
 
         if not self.access_key or not self.secret_key:
             raise ValueError(
@@ -535,98 +969,191 @@ class VolcanoEngineLLM(LLMInterface):
         # 火山引擎使用自定义 SDK，这里提供一个基础实现
         # 实际使用时需要根据火山引擎的 SDK 文档调整
 
-    def generate(
+        # 长连接会话：首次调用时创建，之后所有线程共享同一个连接池
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+        # aiohttp 会话绑定事件循环，因此按事件循环分别创建
+        self._aiohttp_sessions = weakref.WeakKeyDictionary()
+
+    def _get_session(self):
+        """
+        获取带连接池的 requests 会话（惰性创建，线程间共享）
+
+        urllib3 连接池本身是线程安全的；会话上唯一的共享可变状态是 cookie，
+        这里禁用 cookie 存储，使会话可以被多个线程同时使用。
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from http.cookiejar import DefaultCookiePolicy
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                    # pool_block=True：并发超过 pool_maxsize 时等待空闲连接，
+                    # 而不是临时新建一个用完即丢的连接
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        pool_block=True,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def close(self):
+        """关闭同步连接池（aiohttp 会话需在各自的事件循环中调用 aclose 关闭）"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _build_request(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 1000,
-    ) -> str:
-        """调用火山引擎 API 生成文本"""
-        try:
-            import requests
-            import json
-            import time
-            import hashlib
-            import hmac
-
-            # 火山引擎 API 调用示例（需要根据实际 API 文档调整）
-            # 这里提供一个基础框架
-            url = f"https://ark.cn-beijing.volces.com/api/v3/chat/completions"
-
-            headers = {
-                "Authorization": f"Bearer {self.access_key}",
-                "Content-Type": "application/json",
-            }
-
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+    ) -> tuple:
+        """构造请求头和请求体"""
+        headers = {
+            "Authorization": f"Bearer {self.access_key}",
+            "Content-Type": "application/json",
+        }
+        data = {
+            "model": self.model,
+            "messages": self._build_messages(prompt, system_prompt),
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        return headers, data
 
-            data = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-            }
+    @staticmethod
+    def _extract_content(result: Dict[str, Any]) -> str:
+        """从响应 JSON 中提取回答文本"""
+        return result.get("choices", [{}])[0].get("message", {}).get("content", "")
 
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("choices", [{}])[0].get("message", {}).get(
-                    "content", ""
+    def _complete(
+        self, prompt: str, system_prompt: Optional[str], temperature: float, max_tokens: int
+    ) -> str:
+        """单次调用火山引擎 API，失败时抛出 LLMError"""
+        session = self._get_session()
+        headers, data = self._build_request(prompt, system_prompt, temperature, max_tokens)
+        try:
+            with self._limiter().slot(
+                self._token_cost(prompt, system_prompt, max_tokens)
+            ) as slot:
+                response = session.post(
+                    self.api_url, headers=headers, json=data, timeout=self.timeout
                 )
-            else:
-                return f"[火山引擎 API 错误: {response.text}]"
-        except ImportError:
-            return "[需要安装 requests 库：pip install requests]"
+                slot.record_status(response.status_code)
         except Exception as e:
-            return f"[LLM 错误: {str(e)}]"
+            raise classify_error(e, self.backend_name) from e
+        if response.status_code != 200:
+            raise error_from_status(
+                response.status_code,
+                f"火山引擎 API 错误: {response.text}",
+                self.backend_name,
+                retry_after_from_headers(response.headers),
+            )
+        return self._extract_content(response.json())
 
-    def generate_with_reasoning(
+    def generate_stream(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
-    ) -> Dict[str, Any]:
-        """生成带推理过程的回答"""
-        reasoning_prompt = f"""请逐步思考以下问题，并展示你的推理过程：
-
-问题：{prompt}
-
-请按以下格式回答：
-1. 首先分析问题的核心
-2. 从多个角度思考（至少3个视角）
-3. 综合判断并给出结论
-
-你的回答："""
-
-        response = self.generate(
-            reasoning_prompt, system_prompt, temperature, max_tokens=1500
-        )
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """调用火山引擎 API 流式生成文本（解析 SSE 数据行，失败时抛出 LLMError）"""
+        session = self._get_session()
+        headers, data = self._build_request(prompt, system_prompt, temperature, max_tokens)
+        data["stream"] = True
+        try:
+            with self._limiter().slot(
+                self._token_cost(prompt, system_prompt, max_tokens)
+            ) as slot, session.post(
+                self.api_url, headers=headers, json=data, timeout=self.timeout, stream=True
+            ) as response:
+                slot.record_status(response.status_code)
+                if response.status_code != 200:
+                    raise error_from_status(
+                        response.status_code,
+                        f"火山引擎 API 错误: {response.text}",
+                        self.backend_name,
+                        retry_after_from_headers(response.headers),
+                    )
+                response.encoding = "utf-8"  # text/event-stream 未声明编码时 requests 默认 ISO-8859-1
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    delta = json.loads(payload).get("choices", [{}])[0].get("delta", {})
+                    if delta.get("content"):
+                        yield delta["content"]
+        except Exception as e:
+            raise classify_error(e, self.backend_name) from e
+
+    def _get_aiohttp_session(self, aiohttp):
+        """获取当前事件循环对应的 aiohttp 会话（惰性创建，复用连接）"""
+        loop = asyncio.get_running_loop()
+        session = self._aiohttp_sessions.get(loop)
+        if session is None or session.closed:
+            connect_timeout, read_timeout = self.timeout
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=connect_timeout, sock_read=read_timeout
+                ),
+            )
+            self._aiohttp_sessions[loop] = session
+        return session
 
-        reasoning_steps = []
-        lines = response.split("\n")
-        current_step = None
-        for line in lines:
-            if line.strip().startswith(("1.", "2.", "3.", "首先", "其次", "最后")):
-                if current_step:
-                    reasoning_steps.append(current_step)
-                current_step = {"step": len(reasoning_steps) + 1, "content": line.strip()}
-            elif current_step:
-                current_step["content"] += "\n" + line.strip()
+    async def _acomplete(
+        self, prompt: str, system_prompt: Optional[str], temperature: float, max_tokens: int
+    ) -> str:
+        """通过 aiohttp 单次异步调用火山引擎 API（未安装 aiohttp 时在线程池中同步调用）"""
+        try:
+            import aiohttp
+        except ImportError:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                functools.partial(self._complete, prompt, system_prompt, temperature, max_tokens),
+            )
 
-        if current_step:
-            reasoning_steps.append(current_step)
+        headers, data = self._build_request(prompt, system_prompt, temperature, max_tokens)
+        try:
+            session = self._get_aiohttp_session(aiohttp)
+            async with self._limiter().aslot(
+                self._token_cost(prompt, system_prompt, max_tokens)
+            ) as slot, session.post(self.api_url, headers=headers, json=data) as response:
+                slot.record_status(response.status)
+                if response.status != 200:
+                    raise error_from_status(
+                        response.status,
+                        f"火山引擎 API 错误: {await response.text()}",
+                        self.backend_name,
+                        retry_after_from_headers(response.headers),
+                    )
+                return self._extract_content(await response.json())
+        except Exception as e:
+            raise classify_error(e, self.backend_name) from e
 
-        return {
-            "response": response,
-            "reasoning_steps": reasoning_steps if reasoning_steps else [
-                {"step": 1, "content": response}
-            ],
-            "confidence": 0.8,
-        }
+    async def aclose(self):
+        """关闭当前事件循环上的 aiohttp 会话"""
+        loop = asyncio.get_running_loop()
+        session = self._aiohttp_sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
 
 
 def create_llm(
@@ -637,8 +1164,10 @@ def create_llm(
     创建 LLM 实例的工厂函数
     
     Args:
-        backend: 后端类型 ("mock", "openai", "local", "qwen", "deepseek", "volcano")
-        **kwargs: 传递给具体实现的参数
+        backend: 后端类型 ("mock", "openai", "local", "qwen", "deepseek", "volcano", "router")
+        **kwargs: 传递给具体实现的参数；
+            router 后端接受 backends={后端类型: 参数字典或 LLM 实例}，
+            其余参数（如 weights）传给 RouterLLM
         
     Returns:
         LLMInterface 实例
@@ -655,10 +1184,18 @@ def create_llm(
         return DeepSeekLLM(**kwargs)
     elif backend == "volcano":
         return VolcanoEngineLLM(**kwargs)
+    elif backend == "router":
+        from .llm_router import RouterLLM
+
+        backends = {
+            name: config if isinstance(config, LLMInterface) else create_llm(name, **(config or {}))
+            for name, config in kwargs.pop("backends", {}).items()
+        }
+        return RouterLLM(backends, **kwargs)
     else:
         raise ValueError(
             f"不支持的 LLM 后端：{backend}。"
-            f"支持的后端：mock, openai, local, qwen, deepseek, volcano"
+            f"支持的后端：mock, openai, local, qwen, deepseek, volcano, router"
         )
 
 
@@ -667,18 +1204,34 @@ _default_llm: Optional[LLMInterface] = None
 
 
 def get_default_llm() -> LLMInterface:
-    """获取默认 LLM 实例"""
+    """
+    获取默认 LLM 实例
+
+    后端由环境变量 PHILOSOFIA_LLM_BACKEND 指定（默认 mock）；
+    以逗号分隔多个后端（如 "openai,qwen,deepseek"）时，用其中能成功创建的后端组成 RouterLLM。
+    后端创建失败时发出 RuntimeWarning，全部失败时使用 MockLLM。
+    """
     global _default_llm
     if _default_llm is None:
-        # 优先尝试 OpenAI，如果失败则使用 Mock
-        backend = os.getenv("PHILOSOFIA_LLM_BACKEND", "mock")
-        if backend == "openai":
+        names = [
+            name.strip()
+            for name in (os.getenv("PHILOSOFIA_LLM_BACKEND") or "mock").split(",")
+            if name.strip()
+        ]
+        backends = {}
+        for name in names:
             try:
-                _default_llm = OpenAILLM()
-            except:
-                _default_llm = MockLLM()
-        else:
+                backends[name] = create_llm(name)
+            except (ImportError, ValueError) as e:
+                warnings.warn(f"无法创建 LLM 后端 {name}：{e}", RuntimeWarning, stacklevel=2)
+
+        if not backends:
+            warnings.warn("没有可用的 LLM 后端，改用 MockLLM", RuntimeWarning, stacklevel=2)
             _default_llm = MockLLM()
+        elif len(backends) == 1:
+            _default_llm = next(iter(backends.values()))
+        else:
+            _default_llm = create_llm("router", backends=backends)
     return _default_llm
 
 
@@ -0,0 +1,267 @@
+"""
+多后端路由：按近期延迟与错误率选择后端，失败时自动切换到下一个后端
+延迟与错误率使用指数加权移动平均（EWMA），连续失败的后端暂时熔断
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .errors import LLMError
+from .llm_interface import LLMInterface
+
+
+class _BackendStats:
+    """单个后端的运行统计"""
+
+    __slots__ = (
+        "latency",
+        "error_rate",
+        "consecutive_failures",
+        "open_until",
+        "requests",
+        "failures",
+    )
+
+    def __init__(self):
+        self.latency: Optional[float] = None  # EWMA 延迟（秒），None 表示尚无样本
+        self.error_rate = 0.0  # EWMA 错误率
+        self.consecutive_failures = 0
+        self.open_until = 0.0  # 熔断截止时间（time.monotonic）
+        self.requests = 0
+        self.failures = 0
+
+
+class RouterLLM(LLMInterface):
+    """
+    延迟感知的多后端路由
+
+    默认模式按 EWMA 延迟 × (1 + error_penalty × 错误率) 从低到高依次尝试后端；
+    提供 weights 时改为按权重随机分流，首选后端失败后仍按得分顺序切换。
+    建议为各后端配置较少的重试次数（如 RetryPolicy(max_attempts=1)），由路由负责切换。
+    """
+
+    def __init__(
+        self,
+        backends: Dict[str, LLMInterface],
+        weights: Optional[Dict[str, float]] = None,
+        alpha: float = 0.2,
+        error_penalty: float = 4.0,
+        explore: float = 0.05,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+    ):
+        """
+        初始化路由
+
+        Args:
+            backends: 后端名称 → LLM 实例
+            weights: 后端名称 → 分流权重（None 表示按延迟选择）
+            alpha: EWMA 平滑系数，越大越重视最近的样本
+            error_penalty: 错误率对得分的惩罚系数
+            explore: 按延迟选择时随机尝试其他后端的概率（用于刷新其延迟估计）
+            failure_threshold: 连续失败多少次后熔断该后端
+            cooldown: 熔断时长（秒），到期后重新参与路由
+        """
+        if not backends:
+            raise ValueError("RouterLLM 至少需要一个后端")
+        if weights is not None:
+            unknown = set(weights) - set(backends)
+            if unknown:
+                raise ValueError(f"权重中包含未配置的后端：{', '.join(sorted(unknown))}")
+
+        self.backends = dict(backends)
+        self.weights = weights
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self.explore = explore
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._stats = {name: _BackendStats() for name in self.backends}
+        self._lock = threading.Lock()
+
+    def _score(self, stats: _BackendStats) -> float:
+        """得分越低越优先；从未调用过的后端得分为 0，优先试探"""
+        if stats.latency is None:
+            # 只失败过的后端排在最后
+            return 0.0 if stats.requests == 0 else float("inf")
+        return stats.latency * (1 + self.error_penalty * stats.error_rate)
+
+    def _candidates(self) -> List[str]:
+        """本次调用的后端尝试顺序"""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [n for n, s in self._stats.items() if s.open_until <= now]
+            # 全部熔断时仍按得分尝试所有后端，而不是直接失败
+            pool = healthy or list(self._stats)
+            order = sorted(pool, key=lambda n: self._score(self._stats[n]))
+
+        if self.weights is not None:
+            weighted = [n for n in order if self.weights.get(n, 0) > 0]
+            if weighted:
+                first = random.choices(weighted, [self.weights[n] for n in weighted])[0]
+                order.remove(first)
+                order.insert(0, first)
+        elif len(order) > 1 and random.random() < self.explore:
+            first = random.choice(order[1:])
+            order.remove(first)
+            order.insert(0, first)
+        return order
+
+    def _record(self, name: str, latency: Optional[float] = None):
+        """记录一次调用结果（latency 为 None 表示失败）"""
+        with self._lock:
+            stats = self._stats[name]
+            stats.requests += 1
+            failed = latency is None
+            stats.error_rate += self.alpha * ((1.0 if failed else 0.0) - stats.error_rate)
+            if failed:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                if stats.consecutive_failures >= self.failure_threshold:
+                    stats.open_until = time.monotonic() + self.cooldown
+                    stats.consecutive_failures = 0
+            else:
+                stats.consecutive_failures = 0
+                if stats.latency is None:
+                    stats.latency = latency
+                else:
+                    stats.latency += self.alpha * (latency - stats.latency)
+
+    def _route(self, call: Callable[[LLMInterface], Any]) -> Any:
+        """按候选顺序调用后端，遇到 LLMError 切换到下一个"""
+        last_error = None
+        for name in self._candidates():
+            start = time.monotonic()
+            try:
+                result = call(self.backends[name])
+            except LLMError as e:
+                self._record(name)
+                last_error = e
+                continue
+            self._record(name, time.monotonic() - start)
+            return result
+        raise last_error
+
+    async def _aroute(self, call: Callable[[LLMInterface], Any]) -> Any:
+        """_route 的异步版本"""
+        last_error = None
+        for name in self._candidates():
+            start = time.monotonic()
+            try:
+                result = await call(self.backends[name])
+            except LLMError as e:
+                self._record(name)
+                last_error = e
+                continue
+            self._record(name, time.monotonic() - start)
+            return result
+        raise last_error
+
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """路由到当前最优后端生成文本，失败时切换后端；全部失败时抛出最后一个 LLMError"""
+        return self._route(
+            lambda llm: llm.generate(prompt, system_prompt, temperature, max_tokens)
+        )
+
+    def generate_with_reasoning(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """路由到当前最优后端生成带推理过程的回答"""
+        return self._route(
+            lambda llm: llm.generate_with_reasoning(prompt, system_prompt, temperature)
+        )
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> Iterator[str]:
+        """
+        路由流式生成
+
+        只在产出第一个片段之前切换后端；已开始输出后出错时直接抛出。
+        记录的延迟为首个片段的到达时间。
+        """
+        last_error = None
+        for name in self._candidates():
+            start = time.monotonic()
+            stream = self.backends[name].generate_stream(
+                prompt, system_prompt, temperature, max_tokens
+            )
+            try:
+                first = next(stream, None)
+            except LLMError as e:
+                self._record(name)
+                last_error = e
+                continue
+            self._record(name, time.monotonic() - start)
+            if first is not None:
+                yield first
+                yield from stream
+            return
+        raise last_error
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> str:
+        """异步路由生成文本"""
+        return await self._aroute(
+            lambda llm: llm.agenerate(prompt, system_prompt, temperature, max_tokens)
+        )
+
+    async def agenerate_with_reasoning(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """异步路由生成带推理过程的回答"""
+        return await self._aroute(
+            lambda llm: llm.agenerate_with_reasoning(prompt, system_prompt, temperature)
+        )
+
+    def close(self):
+        """关闭所有后端"""
+        for llm in self.backends.values():
+            llm.close()
+
+    async def aclose(self):
+        """关闭所有后端在当前事件循环上的异步客户端"""
+        for llm in self.backends.values():
+            await llm.aclose()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各后端的路由统计
+
+        Returns:
+            {后端名称: {"latency_ms", "error_rate", "requests", "failures", "open"}}
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "latency_ms": round(s.latency * 1000, 1) if s.latency is not None else None,
+                    "error_rate": round(s.error_rate, 3),
+                    "requests": s.requests,
+                    "failures": s.failures,
+                    "open": s.open_until > now,
+                }
+                for name, s in self._stats.items()
+            }
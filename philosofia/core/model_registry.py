@@ -0,0 +1,149 @@
+"""
+本地模型注册表：进程内共享 transformers pipeline
+同一模型只加载一次，多个 LocalLLM 实例按引用计数共享；
+已加载模型数超过上限时，按 LRU 顺序卸载当前无人引用的模型
+"""
+import importlib.util
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _load_pipeline(model_name: str, device: int) -> Any:
+    """构建 text-generation pipeline"""
+    try:
+        from transformers import pipeline
+    except ImportError:
+        raise ImportError("需要安装 transformers 库：pip install transformers torch")
+
+    # 有 safetensors 权重时 transformers 优先使用（内存映射读取）；
+    # low_cpu_mem_usage 直接用权重构建模型，避免先随机初始化再拷贝，需要 accelerate
+    model_kwargs = {}
+    if importlib.util.find_spec("accelerate") is not None:
+        model_kwargs["low_cpu_mem_usage"] = True
+    return pipeline(
+        "text-generation", model=model_name, device=device, model_kwargs=model_kwargs
+    )
+
+
+class _Entry:
+    """注册表中的一个模型"""
+
+    __slots__ = ("pipeline", "refs", "lock")
+
+    def __init__(self):
+        self.pipeline = None
+        self.refs = 0
+        self.lock = threading.Lock()  # 保证同一模型只加载一次
+
+
+class ModelRegistry:
+    """
+    线程安全的模型注册表
+
+    用法：
+        generator = registry.acquire("gpt2")
+        ...
+        registry.release("gpt2")
+    """
+
+    def __init__(
+        self,
+        max_models: int = 2,
+        loader: Optional[Callable[[str, int], Any]] = None,
+    ):
+        """
+        Args:
+            max_models: 同时保留的模型数上限（仍被引用的模型不会被卸载，可能暂时超出）
+            loader: 加载函数 loader(model_name, device)，默认构建 transformers pipeline
+        """
+        self.max_models = max_models
+        self.loader = loader or _load_pipeline
+        self.loads = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, int], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, model_name: str, device: int = -1) -> Any:
+        """获取模型（首次获取时加载），引用计数加一"""
+        key = (model_name, device)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry()
+                self._entries[key] = entry
+            entry.refs += 1
+            self._entries.move_to_end(key)
+
+        try:
+            with entry.lock:
+                if entry.pipeline is None:
+                    entry.pipeline = self.loader(model_name, device)
+                    with self._lock:
+                        self.loads += 1
+        except BaseException:
+            with self._lock:
+                entry.refs -= 1
+                if entry.refs == 0 and entry.pipeline is None:
+                    self._entries.pop(key, None)
+            raise
+
+        self._evict()
+        return entry.pipeline
+
+    def release(self, model_name: str, device: int = -1):
+        """释放一次引用；超出上限时卸载无人引用的模型"""
+        with self._lock:
+            entry = self._entries.get((model_name, device))
+            if entry is None or entry.refs == 0:
+                return
+            entry.refs -= 1
+        self._evict()
+
+    def _evict(self):
+        """按 LRU 顺序卸载无人引用的模型，直到不超过上限"""
+        with self._lock:
+            loaded = [key for key, entry in self._entries.items() if entry.pipeline is not None]
+            excess = len(loaded) - self.max_models
+            for key in loaded:
+                if excess <= 0:
+                    break
+                if self._entries[key].refs == 0:
+                    del self._entries[key]
+                    self.evictions += 1
+                    excess -= 1
+
+    def clear(self):
+        """卸载所有无人引用的模型"""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.refs == 0]:
+                del self._entries[key]
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """已加载的模型及其引用计数、累计加载与卸载次数"""
+        with self._lock:
+            return {
+                "models": {
+                    name if device == -1 else f"{name}@{device}": entry.refs
+                    for (name, device), entry in self._entries.items()
+                    if entry.pipeline is not None
+                },
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+
+# 进程级默认注册表
+_default_registry: Optional[ModelRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """获取（首次调用时创建）进程级默认模型注册表"""
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = ModelRegistry()
+    return _default_registry
@@ -1,6 +1,15 @@
 from typing import Dict, Optional
 
+from .errors import LLMError
 from .llm_interface import LLMInterface, get_default_llm
+from .section_parser import Section, SectionParser
+
+# 道德检验回答的分段（段名即检验结果的字段名）
+VALIDATION_SECTIONS = SectionParser({
+    "universalizable": ("可普遍化", "universaliz"),
+    "humanity_respected": ("人性目的", "humanity"),
+    "autonomous": ("自主性", "autonom"),
+})
 
 
 class MoralValidator:
@@ -23,12 +32,47 @@ class MoralValidator:
         3. 自主性原则（Autonomy）
         """
         if self.use_llm:
-            return self._validate_with_llm(action, context)
+            try:
+                return self._validate_with_llm(action, context)
+            except LLMError as e:
+                # LLM 调用失败时退回规则匹配
+                result = self._validate_with_rules(action, context)
+                result["llm_error"] = str(e)
+                return result
         else:
             return self._validate_with_rules(action, context)
 
+    async def avalidate(self, action: str, context: str = "") -> dict:
+        """validate 的异步版本（通过 LLM 的异步接口调用）"""
+        if not self.use_llm:
+            return self._validate_with_rules(action, context)
+
+        system_prompt, prompt = self._build_validation_prompts(action, context)
+        try:
+            response = await self.llm.agenerate_with_reasoning(
+                prompt, system_prompt=system_prompt, temperature=0.3
+            )
+        except LLMError as e:
+            result = self._validate_with_rules(action, context)
+            result["llm_error"] = str(e)
+            return result
+        return self._validation_result(response)
+
     def _validate_with_llm(self, action: str, context: str) -> dict:
         """使用 LLM 进行道德推理"""
+        system_prompt, prompt = self._build_validation_prompts(action, context)
+        response = self.llm.generate_with_reasoning(
+            prompt, system_prompt=system_prompt, temperature=0.3  # 低温度，更确定
+        )
+        return self._validation_result(response)
+
+    def _build_validation_prompts(self, action: str, context: str) -> tuple:
+        """
+        构造道德三重检验的提示
+
+        Returns:
+            (system_prompt, prompt)
+        """
         system_prompt = """你是一个康德式道德哲学家，擅长执行道德三重检验：
 1. 可普遍化原则：如果所有人都这样做，是否会导致矛盾？
 2. 人性目的原则：是否把人当作纯粹手段，而非目的本身？
@@ -58,10 +102,10 @@ class MoralValidator:
 人性目的: [通过/失败] - [推理]
 自主性: [通过/失败] - [推理]"""
 
-        response = self.llm.generate_with_reasoning(
-            prompt, system_prompt=system_prompt, temperature=0.3  # 低温度，更确定
-        )
+        return system_prompt, prompt
 
+    def _validation_result(self, response: Dict) -> dict:
+        """把 LLM 的推理结果转换为检验结果"""
         # 解析响应
         llm_response = response["response"]
         result = self._parse_validation_response(llm_response)
@@ -72,36 +116,14 @@ class MoralValidator:
         return result
 
     def _parse_validation_response(self, text: str) -> dict:
-        """解析 LLM 的道德检验响应"""
-        text_lower = text.lower()
-
-        # 解析三个检验结果
-        universal_ok = self._check_result(text_lower, "可普遍化", "universaliz")
-        humanity_ok = self._check_result(text_lower, "人性目的", "humanity")
-        autonomous_ok = self._check_result(text_lower, "自主性", "autonom")
-
-        return {
-            "universalizable": universal_ok,
-            "humanity_respected": humanity_ok,
-            "autonomous": autonomous_ok,
-        }
+        """解析 LLM 的道德检验响应（一次扫描得到三项检验的段落）"""
+        sections = VALIDATION_SECTIONS.parse(text)
+        return {key: self._check_result(sections.get(key)) for key in VALIDATION_SECTIONS.keys}
 
-    def _check_result(self, text: str, chinese_key: str, english_key: str) -> bool:
+    def _check_result(self, section: Optional[Section]) -> bool:
         """检查检验结果是否通过"""
-        # 查找关键词所在的行
-        lines = text.split("\n")
-        for line in lines:
-            line_lower = line.lower()
-            if chinese_key in line_lower or english_key in line_lower:
-                # 检查是否包含"通过"或"pass"
-                if "通过" in line_lower or "pass" in line_lower:
-                    if "失败" not in line_lower and "fail" not in line_lower:
-                        return True
-                # 检查是否包含"失败"或"fail"
-                if "失败" in line_lower or "fail" in line_lower:
-                    return False
         # 默认：如果找不到明确结果，返回 False（保守）
-        return False
+        return section is not None and section.verdict() is True
 
     def _validate_with_rules(self, action: str, context: str) -> dict:
         """使用规则进行道德检验（后备方案）"""
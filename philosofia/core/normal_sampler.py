@@ -1,36 +1,77 @@
-from typing import Dict, Optional
-
-from .llm_interface import LLMInterface, get_default_llm
+from typing import Dict, Generator, List, Optional
+
+from .domain_classifier import DomainClassifier, get_domain_classifier
+from .errors import LLMError
+from .idea_index import IdeaIndex
+from .idea_store import IdeaStore, get_idea_store
+from .llm_interface import LLMInterface, _parse_reasoning_steps, get_default_llm
+from .section_parser import SectionParser
+
+# 采样模式：
+#     single   一次调用生成三视角与合题
+#     parallel 三个视角各用一次短调用并发生成，再用一次调用生成合题；
+#              单次输出更短，端到端延迟取决于最慢的视角而不是四段输出之和，
+#              代价是重复发送问题提示、总 token 略多
+SAMPLING_MODES = ("single", "parallel")
+
+# parallel 模式各调用的输出上限（token）
+PERSPECTIVE_MAX_TOKENS = 200
+SYNTHESIS_MAX_TOKENS = 300
+
+# 视角名称 → 该视角在思想光谱中的说明
+PERSPECTIVE_SPECS = {
+    "稳健共识 (μ)": "主流、平衡的观点（约68%的人会认同）",
+    "前沿探索 (+2σ)": "激进、创新的观点（约2.5%的人会认同）",
+    "传统警示 (-2σ)": "保守、谨慎的观点（约2.5%的人会认同）",
+}
+
+# 采样回答的分段（段名与融合推理 JSON 的字段名一致；短标签要求其后紧跟冒号）
+SAMPLING_SECTIONS = SectionParser({
+    "mu": ("稳健共识", "μ:"),
+    "positive_tail": ("前沿探索", "+2σ"),
+    "negative_tail": ("传统警示", "-2σ"),
+    "synthesis": ("辩证合题", "合题:", "synthesis:"),
+})
+
+# 分段名 → 视角名称
+PERSPECTIVE_KEYS = dict(zip(("mu", "positive_tail", "negative_tail"), PERSPECTIVE_SPECS))
+
+
+def check_sampling_mode(mode: str) -> str:
+    """校验采样模式"""
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"不支持的采样模式：{mode}（可选 single / parallel）")
+    return mode
 
 
 class NormalDistributionSamplingGenerator:
-    def __init__(self, llm: Optional[LLMInterface] = None, use_llm: bool = True):
+    def __init__(
+        self,
+        llm: Optional[LLMInterface] = None,
+        use_llm: bool = True,
+        sampling_mode: str = "single",
+        domain_classifier: Optional[DomainClassifier] = None,
+        idea_store: Optional[IdeaStore] = None,
+        idea_index: Optional[IdeaIndex] = None,
+    ):
         """
         初始化正态分布采样生成器
         
         Args:
             llm: LLM 接口实例（如果为 None，使用默认 LLM）
             use_llm: 是否使用 LLM 生成答案（False 则使用预设答案）
+            sampling_mode: 默认采样模式（single / parallel），可在每次 generate 时覆盖
+            domain_classifier: 问题域分类器（如果为 None，首次分类时使用进程共享的默认分类器）
+            idea_store: 思想分布目录（如果为 None，使用进程共享的默认目录）
+            idea_index: 思想分布检索索引；触发词未命中时检索最相近的问题域（如果为 None，直接使用 default）
         """
         self.llm = llm or get_default_llm()
         self.use_llm = use_llm
-        self.idea_distributions = {
-            "ai_rights": {
-                "mu": "AI是工具，无权利但需安全监管",
-                "positive_tail": "AI是新兴生命形式，应享法律人格",
-                "negative_tail": "AI威胁人类，应全球禁止",
-            },
-            "privacy_vs_security": {
-                "mu": "在法治框架下平衡隐私与安全",
-                "positive_tail": "为反恐可无差别监控所有人",
-                "negative_tail": "任何监控都是对自由的侵犯",
-            },
-            "default": {
-                "mu": "在民主与法治框架下，以透明与可问责的方式寻求平衡",
-                "positive_tail": "激进变革是必要的",
-                "negative_tail": "保守传统是最安全的",
-            },
-        }
+        self.sampling_mode = check_sampling_mode(sampling_mode)
+        self.domain_classifier = domain_classifier
+        # 各问题域的思想分布（只读目录，默认为进程内共享的包内目录）
+        self.idea_distributions = idea_store if idea_store is not None else get_idea_store()
+        self.idea_index = idea_index
 
         # 宇宙正态分布映射：思想分布 → 宇宙演化阶段
         self.cosmic_mapping = {
@@ -57,38 +98,148 @@ class NormalDistributionSamplingGenerator:
         }
 
     def _auto_classify_domain(self, query: str) -> str:
-        """自动分类问题域（简化版）"""
-        query_lower = query.lower()
-        if "监控" in query or "隐私" in query or "安全" in query:
-            return "privacy_vs_security"
-        elif "ai" in query_lower or "人工智能" in query or "机器人" in query:
-            return "ai_rights"
+        """
+        自动分类问题域
+
+        先按触发词表匹配（见 domain_classifier）；没有命中且配置了 idea_index 时，
+        采用相似度不低于 idea_index.min_score 的最相近问题域
+        """
+        if self.domain_classifier is None:
+            self.domain_classifier = get_domain_classifier()
+        domain = self.domain_classifier.classify(query)
+        if domain == self.domain_classifier.default and self.idea_index is not None:
+            hits = self.idea_index.search(query, k=1)
+            if hits and hits[0][1] >= self.idea_index.min_score:
+                return hits[0][0]
+        return domain
+
+    def generate(
+        self, query: str, domain: str = None, sampling_mode: Optional[str] = None
+    ) -> dict:
+        """
+        生成正态分布采样结果（带宇宙尺度映射）
+
+        Args:
+            sampling_mode: 本次采样模式（None 表示使用实例的默认模式）
+        """
+        domain = self._resolve_domain(query, domain)
+        sampling_mode = check_sampling_mode(sampling_mode or self.sampling_mode)
+
+        # 使用 LLM 生成或使用预设答案（LLM 调用失败时退回预设答案）
+        if self.use_llm:
+            try:
+                if sampling_mode == "parallel":
+                    perspectives, synthesis, reasoning = self._generate_parallel_with_llm(
+                        query, domain
+                    )
+                else:
+                    perspectives, synthesis, reasoning = self._generate_with_llm(query, domain)
+            except LLMError as e:
+                return self._fallback_result(domain, e)
         else:
-            return "default"
+            perspectives, synthesis = self._preset_answer(domain)
+            reasoning = None
 
-    def generate(self, query: str, domain: str = None) -> dict:
-        """生成正态分布采样结果（带宇宙尺度映射）"""
+        return self._assemble_result(perspectives, synthesis, domain, reasoning)
+
+    async def agenerate(
+        self, query: str, domain: str = None, sampling_mode: Optional[str] = None
+    ) -> dict:
+        """generate 的异步版本（通过 LLM 的异步接口调用）"""
+        domain = self._resolve_domain(query, domain)
+        sampling_mode = check_sampling_mode(sampling_mode or self.sampling_mode)
+
+        if not self.use_llm:
+            perspectives, synthesis = self._preset_answer(domain)
+            return self._assemble_result(perspectives, synthesis, domain, None)
+
+        try:
+            if sampling_mode == "parallel":
+                perspectives, synthesis, response = await self._agenerate_parallel_with_llm(
+                    query, domain
+                )
+                return self._assemble_result(perspectives, synthesis, domain, response)
+            system_prompt, prompt = self._build_llm_prompts(query)
+            response = await self.llm.agenerate_with_reasoning(
+                prompt, system_prompt=system_prompt, temperature=0.8
+            )
+        except LLMError as e:
+            return self._fallback_result(domain, e)
+
+        perspectives, synthesis = self._parse_llm_response(response["response"], domain)
+        return self._assemble_result(perspectives, synthesis, domain, response)
+
+    def generate_stream(
+        self, query: str, domain: str = None
+    ) -> Generator[str, None, dict]:
+        """
+        流式生成正态分布采样结果
+
+        逐段产出 LLM 的增量文本；生成器结束时的返回值（StopIteration.value）
+        是与 generate 格式相同的完整结果。不使用 LLM 时不产出增量文本；
+        LLM 调用中途失败时返回预设答案（已产出的增量文本无法撤回）。
+        """
+        domain = self._resolve_domain(query, domain)
+
+        if not self.use_llm:
+            perspectives, synthesis = self._preset_answer(domain)
+            return self._assemble_result(perspectives, synthesis, domain, None)
+
+        system_prompt, prompt = self._build_llm_prompts(query)
+        pieces = []
+        try:
+            for piece in self.llm.generate_stream(
+                prompt, system_prompt=system_prompt, temperature=0.8, max_tokens=1500
+            ):
+                pieces.append(piece)
+                yield piece
+        except LLMError as e:
+            return self._fallback_result(domain, e)
+
+        llm_response = "".join(pieces)
+        response = {
+            "response": llm_response,
+            "reasoning_steps": _parse_reasoning_steps(llm_response),
+        }
+        perspectives, synthesis = self._parse_llm_response(llm_response, domain)
+        return self._assemble_result(perspectives, synthesis, domain, response)
+
+    def _resolve_domain(self, query: str, domain: Optional[str]) -> str:
+        """确定问题域：未指定时自动分类，不在分布中时使用 default"""
         if domain is None:
             domain = self._auto_classify_domain(query)
 
         # 如果domain不在分布中，使用default
         if domain not in self.idea_distributions:
             domain = "default"
+        return domain
+
+    def _preset_answer(self, domain: str) -> tuple:
+        """预设的三视角与合题"""
+        dist = self.idea_distributions.get(domain, self.idea_distributions["default"])
+        perspectives = {
+            "稳健共识 (μ)": dist["mu"],
+            "前沿探索 (+2σ)": dist["positive_tail"],
+            "传统警示 (-2σ)": dist["negative_tail"],
+        }
+        synthesis = f"综合考量，{dist['mu']} 是最可持续的路径。"
+        return perspectives, synthesis
+
+    def _fallback_result(self, domain: str, error: LLMError) -> dict:
+        """LLM 调用失败时的后备结果：预设答案，并在 llm_error 中记录失败原因"""
+        perspectives, synthesis = self._preset_answer(domain)
+        result = self._assemble_result(perspectives, synthesis, domain, None)
+        result["llm_error"] = str(error)
+        return result
 
-        # 使用 LLM 生成或使用预设答案
-        if self.use_llm:
-            perspectives, synthesis, reasoning = self._generate_with_llm(query, domain)
-        else:
-            dist = self.idea_distributions[domain]
-            perspectives = {
-                "稳健共识 (μ)": dist["mu"],
-                "前沿探索 (+2σ)": dist["positive_tail"],
-                "传统警示 (-2σ)": dist["negative_tail"],
-            }
-            synthesis = f"综合考量，{dist['mu']} 是最可持续的路径。"
-            reasoning = None
-
-        # 添加宇宙尺度映射
+    def _assemble_result(
+        self,
+        perspectives: Dict[str, str],
+        synthesis: str,
+        domain: str,
+        reasoning: Optional[Dict],
+    ) -> dict:
+        """组装采样结果并添加宇宙尺度映射"""
         cosmic_context = self._map_to_cosmic_phase("current_civilization")
 
         result = {
@@ -103,12 +254,12 @@ class NormalDistributionSamplingGenerator:
 
         return result
 
-    def _generate_with_llm(self, query: str, domain: str) -> tuple:
+    def _build_llm_prompts(self, query: str) -> tuple:
         """
-        使用 LLM 生成三视角和合题
-        
+        构造三视角采样的提示
+
         Returns:
-            (perspectives_dict, synthesis_str, reasoning_dict)
+            (system_prompt, prompt)
         """
         system_prompt = """你是一个哲学推理系统，擅长从多个角度分析问题。
 你需要基于正态分布的思想光谱，生成三个不同强度的视角：
@@ -134,82 +285,177 @@ class NormalDistributionSamplingGenerator:
 传统警示 (-2σ): [你的回答]
 辩证合题: [你的回答]"""
 
+        return system_prompt, prompt
+
+    def _generate_with_llm(self, query: str, domain: str) -> tuple:
+        """
+        使用 LLM 生成三视角和合题
+        
+        Returns:
+            (perspectives_dict, synthesis_str, reasoning_dict)
+        """
+        system_prompt, prompt = self._build_llm_prompts(query)
+
         # 使用 LLM 生成
         response = self.llm.generate_with_reasoning(
             prompt, system_prompt=system_prompt, temperature=0.8
         )
 
-        # 解析响应
-        llm_response = response["response"]
-        perspectives = self._parse_perspectives(llm_response)
-        synthesis = self._parse_synthesis(llm_response)
+        perspectives, synthesis = self._parse_llm_response(response["response"], domain)
+        return perspectives, synthesis, response
+
+    def _build_perspective_prompts(self, query: str) -> tuple:
+        """
+        构造 parallel 模式下三个视角各自的提示
+
+        Returns:
+            (system_prompt, [各视角的 prompt])，顺序同 PERSPECTIVE_SPECS
+        """
+        system_prompt = """你是一个哲学推理系统，擅长从正态分布的思想光谱中给出指定强度的视角。
+只输出该视角本身，用两三句话说明，不要输出其他视角或合题。"""
+
+        prompts = [
+            f"""问题：{query}
+
+请给出 **{name}** 视角：{spec}"""
+            for name, spec in PERSPECTIVE_SPECS.items()
+        ]
+        return system_prompt, prompts
+
+    def _build_synthesis_prompts(self, query: str, perspectives: Dict[str, str]) -> tuple:
+        """
+        构造 parallel 模式下综合三个视角的合题提示
+
+        Returns:
+            (system_prompt, prompt)
+        """
+        system_prompt = "你是一个哲学推理系统，擅长综合不同视角形成辩证的合题。"
+        views = "\n".join(f"{name}: {view}" for name, view in perspectives.items())
+        prompt = f"""问题：{query}
+
+三个视角：
+{views}
+
+请综合这三个视角，生成一个简洁的**辩证合题**。
+
+请按以下格式回答：
+辩证合题: [你的回答]"""
+        return system_prompt, prompt
+
+    def _parse_perspective_batch(self, items: List[Dict]) -> Dict[str, str]:
+        """
+        解析三个视角的批量生成结果
+
+        任一视角调用失败时抛出 LLMError（由调用方退回预设答案）；
+        回答为空时返回空字典，由 _parallel_result 按解析失败处理。
+        """
+        perspectives = {}
+        for name, item in zip(PERSPECTIVE_SPECS, items):
+            if item["error"] is not None:
+                raise LLMError(f"{name}视角生成失败：{item['error']}")
+            view = (item["response"] or "").strip()
+            # 模型复述了视角名称时去掉名称前缀
+            head, sep, rest = view.partition(":")
+            if sep and (name.split(" ")[0] in head):
+                view = rest.strip()
+            if not view:
+                return {}
+            perspectives[name] = view
+        return perspectives
+
+    def _parallel_result(
+        self, perspectives: Dict[str, str], synthesis_response: str, domain: str
+    ) -> tuple:
+        """
+        组合 parallel 模式的视角与合题
+
+        Returns:
+            (perspectives_dict, synthesis_str, reasoning_dict)；
+            reasoning 的 response 按 single 模式的格式拼接四段内容
+        """
+        _, synthesis = self._parse_sections(synthesis_response)
+        text = "\n".join(f"{name}: {view}" for name, view in perspectives.items())
+        text += f"\n辩证合题: {synthesis}"
+        reasoning = {
+            "response": text,
+            "reasoning_steps": _parse_reasoning_steps(synthesis_response),
+        }
+        if len(perspectives) < len(PERSPECTIVE_SPECS) or not synthesis:
+            perspectives, synthesis = self._preset_answer(domain)
+        return perspectives, synthesis, reasoning
+
+    def _generate_parallel_with_llm(self, query: str, domain: str) -> tuple:
+        """
+        parallel 模式：三个视角并发短调用，再生成合题
+
+        Returns:
+            (perspectives_dict, synthesis_str, reasoning_dict)
+        """
+        system_prompt, prompts = self._build_perspective_prompts(query)
+        items = self.llm.generate_batch(
+            prompts,
+            system_prompt=system_prompt,
+            temperature=0.8,
+            max_tokens=PERSPECTIVE_MAX_TOKENS,
+            max_concurrency=len(prompts),
+        )
+        perspectives = self._parse_perspective_batch(items)
+        if not perspectives:
+            return self._parallel_result({}, "", domain)
+
+        system_prompt, prompt = self._build_synthesis_prompts(query, perspectives)
+        response = self.llm.generate(
+            prompt, system_prompt=system_prompt, temperature=0.7, max_tokens=SYNTHESIS_MAX_TOKENS
+        )
+        return self._parallel_result(perspectives, response, domain)
+
+    async def _agenerate_parallel_with_llm(self, query: str, domain: str) -> tuple:
+        """_generate_parallel_with_llm 的异步版本"""
+        system_prompt, prompts = self._build_perspective_prompts(query)
+        items = await self.llm.agenerate_batch(
+            prompts,
+            system_prompt=system_prompt,
+            temperature=0.8,
+            max_tokens=PERSPECTIVE_MAX_TOKENS,
+            max_concurrency=len(prompts),
+        )
+        perspectives = self._parse_perspective_batch(items)
+        if not perspectives:
+            return self._parallel_result({}, "", domain)
+
+        system_prompt, prompt = self._build_synthesis_prompts(query, perspectives)
+        response = await self.llm.agenerate(
+            prompt, system_prompt=system_prompt, temperature=0.7, max_tokens=SYNTHESIS_MAX_TOKENS
+        )
+        return self._parallel_result(perspectives, response, domain)
+
+    def _parse_llm_response(self, llm_response: str, domain: str) -> tuple:
+        """解析三视角与合题，解析失败时使用预设答案作为后备方案"""
+        perspectives, synthesis = self._parse_sections(llm_response)
 
         # 如果解析失败，使用后备方案
         if not perspectives or not synthesis:
-            dist = self.idea_distributions.get(domain, self.idea_distributions["default"])
-            perspectives = {
-                "稳健共识 (μ)": dist["mu"],
-                "前沿探索 (+2σ)": dist["positive_tail"],
-                "传统警示 (-2σ)": dist["negative_tail"],
-            }
-            synthesis = f"综合考量，{dist['mu']} 是最可持续的路径。"
+            perspectives, synthesis = self._preset_answer(domain)
 
-        return perspectives, synthesis, response
+        return perspectives, synthesis
 
-    def _parse_perspectives(self, text: str) -> Dict[str, str]:
-        """从 LLM 响应中解析三个视角"""
-        perspectives = {}
-        lines = text.split("\n")
-
-        current_key = None
-        current_content = []
-
-        for line in lines:
-            line = line.strip()
-            if "稳健共识" in line or "(μ)" in line or "mu" in line.lower():
-                if current_key:
-                    perspectives[current_key] = " ".join(current_content).strip()
-                current_key = "稳健共识 (μ)"
-                current_content = [line.split(":", 1)[-1].strip() if ":" in line else ""]
-            elif "前沿探索" in line or "(+2σ)" in line or "+2σ" in line:
-                if current_key:
-                    perspectives[current_key] = " ".join(current_content).strip()
-                current_key = "前沿探索 (+2σ)"
-                current_content = [line.split(":", 1)[-1].strip() if ":" in line else ""]
-            elif "传统警示" in line or "(-2σ)" in line or "-2σ" in line:
-                if current_key:
-                    perspectives[current_key] = " ".join(current_content).strip()
-                current_key = "传统警示 (-2σ)"
-                current_content = [line.split(":", 1)[-1].strip() if ":" in line else ""]
-            elif current_key and line:
-                current_content.append(line)
-
-        if current_key:
-            perspectives[current_key] = " ".join(current_content).strip()
+    def _parse_sections(self, text: str) -> tuple:
+        """
+        一次扫描解析 LLM 响应中的三个视角与合题
 
-        return perspectives
+        Returns:
+            (perspectives_dict, synthesis_str)；没有合题段时以最后一段作为合题
+        """
+        sections = SAMPLING_SECTIONS.parse(text)
+        perspectives = {
+            name: sections[key].text for key, name in PERSPECTIVE_KEYS.items() if key in sections
+        }
+        if "synthesis" in sections:
+            return perspectives, sections["synthesis"].text
 
-    def _parse_synthesis(self, text: str) -> str:
-        """从 LLM 响应中解析合题"""
-        lines = text.split("\n")
-        synthesis_lines = []
-
-        in_synthesis = False
-        for line in lines:
-            line = line.strip()
-            if "合题" in line or "synthesis" in line.lower():
-                in_synthesis = True
-                if ":" in line:
-                    synthesis_lines.append(line.split(":", 1)[-1].strip())
-            elif in_synthesis and line:
-                synthesis_lines.append(line)
-
-        if synthesis_lines:
-            return " ".join(synthesis_lines).strip()
-        else:
-            # 如果没有找到合题，使用最后一段作为合题
-            paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-            return paragraphs[-1] if paragraphs else "综合考量各视角，形成平衡的判断。"
+        # 如果没有找到合题，使用最后一段作为合题
+        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+        return perspectives, paragraphs[-1] if paragraphs else "综合考量各视角，形成平衡的判断。"
 
     def _map_to_cosmic_phase(self, phase: str = "current_civilization") -> Dict:
         """
@@ -240,39 +486,97 @@ class NormalDistributionSamplingGenerator:
         self, query: str, domain: str, bias_toward_mu: bool = False
     ) -> Dict:
         """当道德检验失败时，降低尾部采样权重"""
+        llm_error = None
         if bias_toward_mu and self.use_llm:
-            # 使用 LLM 生成偏向 μ 的回答
-            return self._generate_biased_with_llm(query, domain)
+            # 使用 LLM 生成偏向 μ 的回答（失败时对预设答案应用规则调整）
+            try:
+                return self._generate_biased_with_llm(query, domain)
+            except LLMError as e:
+                llm_error = e
+
+        # 使用原有逻辑（规则调整）
+        if llm_error is not None:
+            base_result = self._fallback_result(domain, llm_error)
         else:
-            # 使用原有逻辑
             base_result = self.generate(query, domain)
 
-            if bias_toward_mu:
-                # 弱化尾部观点强度
-                adjusted_perspectives = {}
-                for key, view in base_result["perspectives"].items():
-                    if "+2σ" in key or "-2σ" in key:
-                        adjusted_perspectives[key] = (
-                            "[经伦理审查调整] " + view
-                        )
-                    else:
-                        adjusted_perspectives[key] = view
-
-                base_result["perspectives"] = adjusted_perspectives
-
-                # 合成更靠近μ的合题
-                if domain in self.idea_distributions:
-                    mu_view = self.idea_distributions[domain]["mu"]
-                else:
-                    mu_view = self.idea_distributions["default"]["mu"]
-                base_result["synthesis"] = (
-                    f"综合考量后，{mu_view} 是最符合人类尊严与社会可持续性的路径。"
+        if bias_toward_mu:
+            self._apply_mu_bias(base_result, domain)
+        return base_result
+
+    async def agenerate_with_bias(
+        self, query: str, domain: str, bias_toward_mu: bool = False
+    ) -> Dict:
+        """generate_with_bias 的异步版本"""
+        llm_error = None
+        if bias_toward_mu and self.use_llm:
+            system_prompt, prompt = self._build_biased_prompts(query)
+            try:
+                response = await self.llm.agenerate_with_reasoning(
+                    prompt, system_prompt=system_prompt, temperature=0.6
                 )
+                return self._parse_biased_response(response, domain)
+            except LLMError as e:
+                llm_error = e
 
-            return base_result
+        if llm_error is not None:
+            base_result = self._fallback_result(domain, llm_error)
+        else:
+            base_result = await self.agenerate(query, domain)
+
+        if bias_toward_mu:
+            self._apply_mu_bias(base_result, domain)
+        return base_result
+
+    def _generate_with_rules(
+        self, query: str, domain: Optional[str] = None, bias_toward_mu: bool = False
+    ) -> Dict:
+        """不调用 LLM，直接使用预设答案（可选偏向 μ 的规则调整）"""
+        domain = self._resolve_domain(query, domain)
+        perspectives, synthesis = self._preset_answer(domain)
+        result = self._assemble_result(perspectives, synthesis, domain, None)
+        if bias_toward_mu:
+            self._apply_mu_bias(result, domain)
+        return result
+
+    def _apply_mu_bias(self, base_result: Dict, domain: str):
+        """规则调整：弱化尾部观点，并把合题拉向 μ"""
+        # 弱化尾部观点强度
+        adjusted_perspectives = {}
+        for key, view in base_result["perspectives"].items():
+            if "+2σ" in key or "-2σ" in key:
+                adjusted_perspectives[key] = (
+                    "[经伦理审查调整] " + view
+                )
+            else:
+                adjusted_perspectives[key] = view
+
+        base_result["perspectives"] = adjusted_perspectives
+
+        # 合成更靠近μ的合题
+        if domain in self.idea_distributions:
+            mu_view = self.idea_distributions[domain]["mu"]
+        else:
+            mu_view = self.idea_distributions["default"]["mu"]
+        base_result["synthesis"] = (
+            f"综合考量后，{mu_view} 是最符合人类尊严与社会可持续性的路径。"
+        )
 
     def _generate_biased_with_llm(self, query: str, domain: str) -> Dict:
         """使用 LLM 生成偏向 μ 的回答（道德检验失败后）"""
+        system_prompt, prompt = self._build_biased_prompts(query)
+        response = self.llm.generate_with_reasoning(
+            prompt, system_prompt=system_prompt, temperature=0.6  # 降低温度，更保守
+        )
+        return self._parse_biased_response(response, domain)
+
+    def _build_biased_prompts(self, query: str) -> tuple:
+        """
+        构造偏向 μ 的重新采样提示
+
+        Returns:
+            (system_prompt, prompt)
+        """
         system_prompt = """你是一个哲学推理系统。由于之前的回答未能通过道德检验，
 现在需要生成一个更偏向稳健共识（μ）的回答，降低激进观点的权重。"""
 
@@ -292,13 +596,12 @@ class NormalDistributionSamplingGenerator:
 传统警示 (-2σ): [经伦理审查调整] [你的回答]
 辩证合题: [你的回答]"""
 
-        response = self.llm.generate_with_reasoning(
-            prompt, system_prompt=system_prompt, temperature=0.6  # 降低温度，更保守
-        )
+        return system_prompt, prompt
 
+    def _parse_biased_response(self, response: Dict, domain: str) -> Dict:
+        """解析偏向 μ 的重新采样结果"""
         llm_response = response["response"]
-        perspectives = self._parse_perspectives(llm_response)
-        synthesis = self._parse_synthesis(llm_response)
+        perspectives, synthesis = self._parse_sections(llm_response)
 
         # 确保标注存在
         for key in perspectives:
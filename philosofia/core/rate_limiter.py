@@ -0,0 +1,339 @@
+"""
+客户端限流：令牌桶（请求数/秒、token 数/分钟） + AIMD 自适应并发
+遇到 429 / 5xx 时并发上限按比例收缩，请求成功时缓慢回升，使吞吐量逼近服务商上限而不引发错误风暴
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Deque, Dict, Optional, Tuple
+
+from .errors import status_code_of
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估计 token 数：中日韩字符约 1 字 1 token，其他字符约 4 个 1 token"""
+    cjk = sum(1 for ch in text if "一" <= ch <= "鿿")
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """判断异常是否表示服务端过载（HTTP 429 或 5xx）"""
+    status = status_code_of(error)
+    return status is not None and (status == 429 or status >= 500)
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶
+
+    采用预约方式：取令牌时先扣减（余额可为负），再按欠额计算需要等待的时间，
+    因此同步与异步调用方可以共享同一个桶，并按到达顺序获得配额。
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量（允许的突发量），默认等于 rate
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """扣减令牌并返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self, amount: float = 1.0):
+        """获取令牌（不足时阻塞等待）"""
+        wait = self._reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, amount: float = 1.0):
+        """获取令牌的异步版本"""
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def refund(self, amount: float):
+        """归还多预约的令牌"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD 自适应并发限制
+
+    每个成功请求使上限增加 increase / limit（约每轮增加 increase），
+    每个过载请求使上限乘以 decrease_factor。
+    释放槽位时优先把空出的槽位直接移交给等待中的异步调用方，
+    通过 loop.call_soon_threadsafe 唤醒，不必等下一次轮询。
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def acquire(self):
+        """占用一个并发槽位（已满时阻塞等待）"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def aacquire(self):
+        """
+        占用并发槽位的异步版本（不阻塞事件循环）
+
+        已满时登记等待，由 release 移交槽位并唤醒；
+        登记后仍按退避间隔重试一次，作为唤醒丢失时的兜底。
+        """
+        loop = asyncio.get_running_loop()
+        delay = 0.005
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            future = waiter[1]
+            try:
+                await asyncio.wait((future,), timeout=delay)
+            except BaseException:
+                self._abandon(waiter)
+                raise
+            if future.done():
+                return
+            with self._cond:
+                handed_over = waiter not in self._async_waiters
+                if not handed_over:
+                    self._async_waiters.remove(waiter)
+            if handed_over:
+                # 槽位已在移交途中，等待唤醒回调
+                await future
+                return
+            delay = min(delay * 2, 0.1)
+
+    def _abandon(self, waiter):
+        """等待中的协程被取消：撤销登记，已移交的槽位交还"""
+        with self._cond:
+            if waiter in self._async_waiters:
+                self._async_waiters.remove(waiter)
+                return
+        # 唤醒回调尚未执行时取消 future，由回调交还槽位；已执行则在此交还
+        if not waiter[1].cancel():
+            self._return_slot()
+
+    def _wake_async_waiters(self):
+        """把空闲槽位移交给等待中的异步调用方（调用方持有 self._cond）"""
+        while self._async_waiters and self.in_flight < int(self.limit):
+            loop, future = self._async_waiters.popleft()
+            self.in_flight += 1
+            try:
+                loop.call_soon_threadsafe(self._deliver, future)
+            except RuntimeError:  # 事件循环已关闭
+                self.in_flight -= 1
+
+    def _deliver(self, future: asyncio.Future):
+        """在等待方的事件循环中完成移交"""
+        if future.cancelled():
+            self._return_slot()
+        else:
+            future.set_result(None)
+
+    def _return_slot(self):
+        """交还未使用的槽位（不调整并发上限）"""
+        with self._cond:
+            self.in_flight -= 1
+            self._wake_async_waiters()
+            self._cond.notify_all()
+
+    def release(self, overloaded: bool = False):
+        """释放槽位并根据请求结果调整并发上限"""
+        with self._cond:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            else:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self._wake_async_waiters()
+            self._cond.notify_all()
+
+
+class _Slot:
+    """一次受限调用的结果记录"""
+
+    __slots__ = ("overloaded", "used_tokens")
+
+    def __init__(self):
+        self.overloaded = False
+        self.used_tokens: Optional[int] = None
+
+    def record_status(self, status_code: int):
+        """记录 HTTP 状态码（429 / 5xx 视为过载）"""
+        if status_code == 429 or status_code >= 500:
+            self.overloaded = True
+
+    def record_usage(self, total_tokens: Optional[int]):
+        """记录服务端返回的实际 token 用量，用于归还多预约的配额"""
+        self.used_tokens = total_tokens
+
+
+class RateLimiter:
+    """
+    单个后端的组合限流器：请求数/秒 + token 数/分钟 + 自适应并发
+
+    用法：
+        with limiter.slot(estimated_tokens) as slot:
+            response = call_api()
+            slot.record_status(response.status_code)
+    调用中抛出的 429 / 5xx 异常会被自动识别为过载。
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+    ):
+        """
+        Args:
+            requests_per_second: 每秒最大请求数（None 表示不限）
+            tokens_per_minute: 每分钟最大 token 数（None 表示不限）
+            initial_concurrency: 初始并发上限
+            min_concurrency: 并发上限的下界
+            max_concurrency: 并发上限的上界
+        """
+        self.request_bucket = (
+            TokenBucket(requests_per_second) if requests_per_second else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute / 60.0, capacity=tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+        )
+        self.overloads = 0
+        self._overloads_lock = threading.Lock()  # 限流器在线程间共享，计数需要加锁
+
+    def _finish(self, slot: _Slot, tokens: int):
+        self.concurrency.release(slot.overloaded)
+        if slot.overloaded:
+            with self._overloads_lock:
+                self.overloads += 1
+        if self.token_bucket and slot.used_tokens is not None and slot.used_tokens < tokens:
+            self.token_bucket.refund(tokens - slot.used_tokens)
+
+    @contextmanager
+    def slot(self, tokens: int = 0):
+        """获取一次调用的配额（同步）"""
+        self.concurrency.acquire()
+        slot = _Slot()
+        try:
+            if self.request_bucket:
+                self.request_bucket.acquire()
+            if self.token_bucket and tokens:
+                self.token_bucket.acquire(tokens)
+            yield slot
+        except BaseException as e:
+            if is_overload_error(e):
+                slot.overloaded = True
+            raise
+        finally:
+            self._finish(slot, tokens)
+
+    @asynccontextmanager
+    async def aslot(self, tokens: int = 0):
+        """获取一次调用的配额（异步）"""
+        await self.concurrency.aacquire()
+        slot = _Slot()
+        try:
+            if self.request_bucket:
+                await self.request_bucket.aacquire()
+            if self.token_bucket and tokens:
+                await self.token_bucket.aacquire(tokens)
+            yield slot
+        except BaseException as e:
+            if is_overload_error(e):
+                slot.overloaded = True
+            raise
+        finally:
+            self._finish(slot, tokens)
+
+    def stats(self) -> Dict[str, float]:
+        """当前并发上限、在途请求数与累计过载次数"""
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "overloads": self.overloads,
+        }
+
+
+class _NoLimit:
+    """未配置限流器时使用的空实现"""
+
+    @contextmanager
+    def slot(self, tokens: int = 0):
+        yield _Slot()
+
+    @asynccontextmanager
+    async def aslot(self, tokens: int = 0):
+        yield _Slot()
+
+
+NO_LIMIT = _NoLimit()
+
+
+# 进程级的后端限流器注册表：同一后端的所有实例共享配额
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(backend: str, **config) -> RateLimiter:
+    """
+    获取（首次调用时创建）指定后端的共享限流器
+
+    Args:
+        backend: 后端名称（如 "deepseek"、"qwen"），同名后端共享同一个限流器
+        **config: 首次创建时传给 RateLimiter 的参数，之后的调用忽略
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(backend)
+        if limiter is None:
+            limiter = RateLimiter(**config)
+            _rate_limiters[backend] = limiter
+        return limiter
+
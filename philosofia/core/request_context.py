@@ -0,0 +1,51 @@
+"""
+请求上下文：一次回答过程中的全部可变状态
+推理链、降级阶段与截止时间保存在每个请求自己的上下文中，而不是智能体实例上，
+因此同一个智能体（及其已建立连接的 LLM 客户端）可以同时服务多个线程或协程中的请求
+"""
+import threading
+from typing import Any, List, Optional
+
+from .deadline import Deadline
+from .trace import ReasoningStep
+
+
+class RequestContext:
+    """一次 respond / arespond / respond_stream 调用的状态（同一请求内的并发阶段可安全写入）"""
+
+    __slots__ = ("trace", "deadline", "reasoning_chain", "degraded_stages", "_lock")
+
+    def __init__(self, trace: str = "full", deadline: Optional[Deadline] = None):
+        """
+        Args:
+            trace: 推理链追踪级别（off / summary / full）
+            deadline: 本次请求的截止时间（None 表示不限时）
+        """
+        self.trace = trace
+        self.deadline = deadline
+        self.reasoning_chain: List[ReasoningStep] = []
+        # 因超出时间预算改用规则路径的阶段
+        self.degraded_stages: List[str] = []
+        # 道德检验与生灭周期等阶段可能在不同线程中同时记录步骤
+        self._lock = threading.Lock()
+
+    def add_step(self, step_name: str, description: str, details: Optional[Any] = None):
+        """添加推理步骤（details 只在 full 级别保存，且只保存引用）"""
+        if self.trace == "off":
+            return
+        if self.trace != "full":
+            details = None
+        with self._lock:
+            self.reasoning_chain.append(
+                ReasoningStep(len(self.reasoning_chain) + 1, step_name, description, details)
+            )
+
+    def record_degraded(self, stage: str):
+        """记录改用规则路径的阶段"""
+        with self._lock:
+            if stage not in self.degraded_stages:
+                self.degraded_stages.append(stage)
+        self.add_step("超出时间预算", f"{stage}改用规则路径")
+
+    def expired(self) -> bool:
+        return self.deadline is not None and self.deadline.expired()
@@ -0,0 +1,216 @@
+"""
+重试与对冲请求
+- RetryPolicy：可重试错误按指数退避 + 全抖动（full jitter）重试
+- HedgePolicy：请求超过近期延迟的 p95 仍未返回时，再发一个相同请求，取先返回者
+"""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .errors import LLMError, LLMRateLimitError
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    """指数退避重试策略"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        jitter: bool = True,
+    ):
+        """
+        Args:
+            max_attempts: 最多尝试次数（含首次），1 表示不重试
+            base_delay: 首次重试的基础等待时间（秒），之后每次翻倍
+            max_delay: 单次等待时间上限（秒）
+            jitter: 是否在 [0, 退避时间] 内随机取值，避免大量客户端同时重试
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt: int, error: Optional[LLMError] = None) -> float:
+        """第 attempt 次失败（从 0 开始）后的等待时间"""
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        # 服务端给出 Retry-After 时以其为下限
+        if isinstance(error, LLMRateLimitError) and error.retry_after:
+            backoff = max(backoff, min(self.max_delay, error.retry_after))
+        return backoff
+
+
+class HedgePolicy:
+    """
+    对冲请求策略
+
+    对冲延迟默认取近期成功请求延迟的分位数（p95）；样本不足时使用 initial_delay。
+    对冲会增加约 (1 - quantile) 比例的额外请求，换取更低的尾延迟。
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        quantile: float = 0.95,
+        initial_delay: float = 5.0,
+        min_samples: int = 20,
+        window: int = 200,
+    ):
+        """
+        Args:
+            delay: 固定对冲延迟（秒），None 表示按分位数自适应
+            quantile: 自适应对冲延迟使用的延迟分位数
+            initial_delay: 样本不足时的对冲延迟（秒）
+            min_samples: 开始使用分位数所需的最少样本数
+            window: 参与统计的最近样本数
+        """
+        self.fixed_delay = delay
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def observe(self, latency: float):
+        """记录一次成功请求的延迟"""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> float:
+        """当前的对冲延迟"""
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.quantile))]
+
+    def _record_hedge(self, won: bool):
+        with self._lock:
+            self.hedged += 1
+            if won:
+                self.hedge_wins += 1
+
+
+# 对冲请求使用的共享线程池（首次使用时创建）
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_hedge_executor():
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=32, thread_name_prefix="philosofia-hedge"
+                )
+    return _hedge_executor
+
+
+def call_hedged(fn: Callable[[], T], hedge: HedgePolicy) -> T:
+    """执行 fn，超过对冲延迟仍未返回时并发执行第二次，返回先成功的结果"""
+    pool = _get_hedge_executor()
+    start = time.monotonic()
+    primary = pool.submit(fn)
+    done, _ = wait([primary], timeout=hedge.delay())
+    pending = {primary}
+    backup = None
+    if not done:
+        backup = pool.submit(fn)
+        pending.add(backup)
+
+    first_error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                result = future.result()
+            except LLMError as e:
+                first_error = first_error or e
+                continue
+            hedge.observe(time.monotonic() - start)
+            if backup is not None:
+                hedge._record_hedge(won=future is backup)
+            # 落后的请求无法中断，任其在后台完成后丢弃
+            return result
+    raise first_error
+
+
+async def acall_hedged(fn: Callable[[], Awaitable[T]], hedge: HedgePolicy) -> T:
+    """call_hedged 的异步版本，落后的请求会被取消"""
+    start = time.monotonic()
+    primary = asyncio.ensure_future(fn())
+    done, _ = await asyncio.wait({primary}, timeout=hedge.delay())
+    pending = {primary}
+    backup = None
+    if not done:
+        backup = asyncio.ensure_future(fn())
+        pending.add(backup)
+
+    first_error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    result = task.result()
+                except LLMError as e:
+                    first_error = first_error or e
+                    continue
+                hedge.observe(time.monotonic() - start)
+                if backup is not None:
+                    hedge._record_hedge(won=task is backup)
+                return result
+        raise first_error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    retry: Optional[RetryPolicy] = None,
+    hedge: Optional[HedgePolicy] = None,
+) -> T:
+    """按重试策略（及可选的对冲策略）执行 fn；不可重试的错误立即抛出"""
+    attempts = retry.max_attempts if retry else 1
+    for attempt in range(attempts):
+        try:
+            if hedge is not None:
+                return call_hedged(fn, hedge)
+            return fn()
+        except LLMError as e:
+            if not e.retryable or attempt == attempts - 1:
+                raise
+            time.sleep(retry.delay(attempt, e))
+
+
+async def acall_with_retry(
+    fn: Callable[[], Awaitable[T]],
+    retry: Optional[RetryPolicy] = None,
+    hedge: Optional[HedgePolicy] = None,
+) -> T:
+    """call_with_retry 的异步版本"""
+    attempts = retry.max_attempts if retry else 1
+    for attempt in range(attempts):
+        try:
+            if hedge is not None:
+                return await acall_hedged(fn, hedge)
+            return await fn()
+        except LLMError as e:
+            if not e.retryable or attempt == attempts - 1:
+                raise
+            await asyncio.sleep(retry.delay(attempt, e))
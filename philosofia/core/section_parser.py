@@ -0,0 +1,149 @@
+"""
+LLM 回答的分段解析：一次扫描把回答切分为带标签的段落
+采样、道德检验与归零校准的回答都是“标签: 内容”格式，共用同一个解析器：
+各段的标签预先编译为一个正则，每个回答只扫描一遍；
+回答本身是 JSON 对象时（如后端以 JSON 格式输出）直接按字段名读取各段
+"""
+import re
+from typing import Dict, Optional, Sequence
+
+# 标题行开头允许出现的列表符号、编号与 Markdown 标记（如 "1. **稳健共识**"、"- 可普遍化"）
+_LINE_PREFIX = r"[ \t]*(?:(?:[-*#>【\[]+|\d+[.、)）])[ \t]*)*"
+_COLON = re.compile(r"[:：]")
+_FAIL = re.compile(r"失败|未通过|不通过|fail", re.IGNORECASE)
+_PASS = re.compile(r"通过|pass", re.IGNORECASE)
+_VERDICT_PREFIX = re.compile(
+    r"^[\[【]?\s*(?:未通过|不通过|通过|失败|passed|pass|failed|fail)\s*[\]】]?\s*[-—:：,，]*\s*",
+    re.IGNORECASE,
+)
+
+
+def parse_verdict(text: str) -> Optional[bool]:
+    """文本中的检验结论：含“失败 / 未通过 / fail”为 False，含“通过 / pass”为 True，都没有时为 None"""
+    if _FAIL.search(text):
+        return False
+    if _PASS.search(text):
+        return True
+    return None
+
+
+def strip_verdict(text: str) -> str:
+    """去掉开头的检验结论（“通过 - 理由” → “理由”）"""
+    return _VERDICT_PREFIX.sub("", text, count=1)
+
+
+def _alias_pattern(alias: str) -> str:
+    """标签的正则；以冒号结尾的标签要求其后（跳过 Markdown 标记与右括号）紧跟冒号"""
+    if alias.endswith((":", "：")):
+        return re.escape(alias[:-1]) + r"(?=[ \t*_)）\]】]*[:：])"
+    return re.escape(alias)
+
+
+class Section:
+    """
+    回答中的一段：header 为标题行，text 为标题行冒号之后与后续各行拼接的内容
+
+    text 在首次访问时才从原文中切出（多数检验只需要标题行）。
+    """
+
+    __slots__ = ("header", "_source", "_start", "_end", "_text")
+
+    def __init__(
+        self, header: str, text: Optional[str] = None, source: str = "", start: int = 0, end: int = 0
+    ):
+        self.header = header
+        self._text = text
+        self._source = source
+        self._start = start
+        self._end = end
+
+    def __repr__(self) -> str:
+        return f"Section({self.header!r}, {self.text!r})"
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            parts = _COLON.split(self.header, 1)
+            first = parts[1].strip().lstrip("*").strip() if len(parts) == 2 else ""
+            lines = [first] + self._source[self._start : self._end].split("\n")
+            self._text = " ".join(line for line in map(str.strip, lines) if line)
+            self._source = ""
+        return self._text
+
+    def verdict(self) -> Optional[bool]:
+        """该段的检验结论：优先看标题行，其次看整段内容"""
+        verdict = parse_verdict(self.header)
+        return verdict if verdict is not None else parse_verdict(self.text)
+
+
+class SectionParser:
+    """
+    带标签段落的解析器
+
+    labels 为 {段名: 标签}；某行以任一标签开头（允许前置编号与 Markdown 标记）即开始该段，
+    直到下一个标题行为止。英文标签不区分大小写；标签为空的段只能从 JSON 回答中读取。
+    以冒号结尾的标签（如 "合题:"）只在其后紧跟冒号时才算标题（允许中间有 Markdown 标记与右括号），
+    避免“合题思维很重要”这类以短标签开头的正文行被当成标题。
+    同一段出现多次时保留第一次，除非第一次的标题行没有冒号而之后的有（此时以后者为准）。
+    """
+
+    def __init__(self, labels: Dict[str, Sequence[str]]):
+        self.keys = tuple(labels)
+        self._group_keys: Dict[str, str] = {}
+        groups = []
+        for i, (key, aliases) in enumerate(labels.items()):
+            if not aliases:
+                continue
+            group = f"s{i}"
+            self._group_keys[group] = key
+            # 较长的标签优先，避免被其前缀抢先匹配
+            alternatives = "|".join(
+                _alias_pattern(alias)
+                for alias in sorted(aliases, key=lambda alias: len(alias.rstrip(":：")), reverse=True)
+            )
+            groups.append(f"(?P<{group}>{alternatives})")
+        # 以换行符开头的模式可以让正则引擎直接跳到各行行首，比逐位置尝试 MULTILINE 的 ^ 快得多
+        self._header = re.compile(
+            "\n" + _LINE_PREFIX + "(?:" + "|".join(groups) + r")[^\n]*", re.IGNORECASE
+        )
+
+    def parse(self, text: str) -> Dict[str, Section]:
+        """把回答切分为 {段名: Section}（没有出现的段不在结果中）"""
+        if text.lstrip().startswith(("{", "```")):
+            sections = self._parse_json(text)
+            if sections is not None:
+                return sections
+
+        # 在开头补一个换行符，第一行也按行首处理
+        text = "\n" + text
+        sections: Dict[str, Section] = {}
+        matches = list(self._header.finditer(text))
+        for i, match in enumerate(matches):
+            key = self._group_keys[match.lastgroup]
+            if key in sections and not (
+                _COLON.search(match.group(0)) and not _COLON.search(sections[key].header)
+            ):
+                continue
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            sections[key] = Section(match.group(0).strip(), source=text, start=match.end(), end=end)
+        return sections
+
+    def _parse_json(self, text: str) -> Optional[Dict[str, Section]]:
+        """按字段名读取 JSON 回答；不是 JSON 对象或没有任何已知字段时返回 None"""
+        from .json_output import extract_json
+
+        try:
+            data = extract_json(text)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        sections = {}
+        for key in self.keys:
+            if key not in data:
+                continue
+            value = data[key]
+            if isinstance(value, bool):
+                value = "通过" if value else "失败"
+            sections[key] = Section(str(value), str(value))
+        return sections or None
@@ -0,0 +1,139 @@
+"""
+推测式执行：在结果是否需要尚未确定时提前启动耗时调用
+用于道德重试：第一次道德检验的同时开始偏向 μ 的重新采样，检验通过则丢弃采样结果。
+SpeculationStats 记录被丢弃调用的额外 token 与节省的延迟，用于按租户权衡是否开启
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# cost(结果) -> 估算的 token 数；结果为 None 表示调用在完成前被取消或失败
+CostFn = Callable[[Optional[Any]], int]
+
+
+class SpeculationStats:
+    """推测式执行的成本与收益统计（线程安全，可在同一租户的多个智能体之间共享）"""
+
+    def __init__(self):
+        self.speculations = 0  # 启动的推测调用数
+        self.used = 0  # 结果被采用的次数
+        self.discarded = 0  # 被丢弃的次数
+        self.wasted_tokens = 0  # 被丢弃调用估算消耗的 token
+        self.saved_seconds = 0.0  # 与串行执行相比节省的等待时间
+        self._lock = threading.Lock()
+
+    def record_started(self):
+        with self._lock:
+            self.speculations += 1
+
+    def record_used(self, saved_seconds: float):
+        with self._lock:
+            self.used += 1
+            self.saved_seconds += max(0.0, saved_seconds)
+
+    def record_discarded(self, tokens: int):
+        with self._lock:
+            self.discarded += 1
+            self.wasted_tokens += tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            {"speculations", "used", "discarded", "wasted_tokens", "saved_seconds",
+             "tokens_per_saved_second": 每节省 1 秒延迟额外消耗的 token（未节省时为 None）}
+        """
+        with self._lock:
+            return {
+                "speculations": self.speculations,
+                "used": self.used,
+                "discarded": self.discarded,
+                "wasted_tokens": self.wasted_tokens,
+                "saved_seconds": round(self.saved_seconds, 3),
+                "tokens_per_saved_second": (
+                    round(self.wasted_tokens / self.saved_seconds, 1)
+                    if self.saved_seconds > 0
+                    else None
+                ),
+            }
+
+
+class SpeculativeCall:
+    """
+    在线程池中提前启动的调用
+
+    result() 采用结果（线程池繁忙、调用尚未开始时改为在当前线程执行，避免在池内等待池）；
+    discard() 丢弃结果（尚未开始的调用直接取消，不产生成本）。
+    """
+
+    def __init__(self, fn: Callable[[], Any], executor, stats: SpeculationStats, cost: CostFn):
+        self.fn = fn
+        self.stats = stats
+        self.cost = cost
+        self.duration: Optional[float] = None
+        self.discarded = False
+        stats.record_started()
+        self.future = executor.submit(self._timed)
+
+    def _timed(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.fn()
+        finally:
+            self.duration = time.perf_counter() - start
+
+    def result(self) -> Any:
+        if self.future.cancel():
+            self.stats.record_used(0.0)
+            return self.fn()
+        wait_start = time.perf_counter()
+        value = self.future.result()
+        # 串行执行需要等待整个调用；推测执行只需等待剩余部分
+        # （等待期间已被 discard 的调用按丢弃计）
+        if not self.discarded:
+            self.stats.record_used(self.duration - (time.perf_counter() - wait_start))
+        return value
+
+    def discard(self):
+        self.discarded = True
+        if self.future.cancel():
+            self.stats.record_discarded(0)
+            return
+
+        def on_done(future):
+            failed = future.cancelled() or future.exception() is not None
+            self.stats.record_discarded(self.cost(None if failed else future.result()))
+
+        self.future.add_done_callback(on_done)
+
+
+class AsyncSpeculativeCall:
+    """SpeculativeCall 的异步版本：在当前事件循环中作为任务提前启动"""
+
+    def __init__(self, coro_fn: Callable[[], Any], stats: SpeculationStats, cost: CostFn):
+        self.stats = stats
+        self.cost = cost
+        self.duration: Optional[float] = None
+        stats.record_started()
+        self.task = asyncio.ensure_future(self._timed(coro_fn))
+
+    async def _timed(self, coro_fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return await coro_fn()
+        finally:
+            self.duration = time.perf_counter() - start
+
+    async def result(self) -> Any:
+        wait_start = time.perf_counter()
+        value = await self.task
+        self.stats.record_used(self.duration - (time.perf_counter() - wait_start))
+        return value
+
+    def discard(self):
+        # 进行中的请求被取消，只计入已发送的提示部分
+        if self.task.done() and not self.task.cancelled() and self.task.exception() is None:
+            self.stats.record_discarded(self.cost(self.task.result()))
+        else:
+            self.task.cancel()
+            self.stats.record_discarded(self.cost(None))
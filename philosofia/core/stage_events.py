@@ -0,0 +1,42 @@
+"""
+阶段事件：respond_iter / arespond_iter 在每个流水线阶段完成时产出的事件
+界面可以在三视角生成后立即展示，再依次展示道德检验结论与校准后的回答
+"""
+from typing import Any, Dict
+
+# 事件类型及其 data：
+#     domain        问题域（str）
+#     perspectives  初始采样的三视角（Dict[str, str]）
+#     moral         {"passed": 是否通过道德检验, "perspectives": 检验（及重新采样）后的三视角}
+#     lifecycle     生灭周期分析，同输出中的 lifecycle_analyses
+#     cosmic        宇宙状态，同输出中的 cosmic_state
+#     entropy       熵评估，同输出中的 entropy_assessment
+#     calibration   {"dialectical_synthesis": 校准后的合题, "heat_death_check": 归零检验结果}
+#     result        与 respond 返回值格式相同的完整输出（总是最后一个事件）
+# moral 之后的阶段按完成顺序产出，并发执行时 lifecycle / cosmic 可能先于 moral
+STAGE_EVENTS = (
+    "domain",
+    "perspectives",
+    "moral",
+    "lifecycle",
+    "cosmic",
+    "entropy",
+    "calibration",
+    "result",
+)
+
+
+class StageEvent:
+    """一个阶段完成的事件"""
+
+    __slots__ = ("stage", "data")
+
+    def __init__(self, stage: str, data: Any):
+        self.stage = stage
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"StageEvent({self.stage!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"stage": self.stage, "data": self.data}
@@ -0,0 +1,150 @@
+"""
+阶段依赖图：按依赖关系执行回答流水线中的各个阶段
+相互独立的阶段在线程池中并发执行，端到端延迟取决于关键路径而不是各阶段之和
+"""
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Tuple
+
+
+class StageGraph:
+    """
+    由命名阶段组成的有向无环图
+
+    阶段函数以关键字参数接收其依赖阶段的结果：
+        graph = StageGraph()
+        graph.add("moral", run_moral_checks)
+        graph.add("calibration", lambda moral: calibrate(moral), deps=("moral",))
+        results = graph.run(executor)
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable[..., Any], Tuple[str, ...]]] = {}
+        self.durations: Dict[str, float] = {}  # 各阶段耗时（秒）
+
+    def add(self, name: str, fn: Callable[..., Any], deps: Iterable[str] = ()) -> "StageGraph":
+        """添加阶段（依赖的阶段必须先添加，因此图不会成环）"""
+        deps = tuple(deps)
+        if name in self._stages:
+            raise ValueError(f"阶段 {name} 已存在")
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            raise ValueError(f"阶段 {name} 依赖未定义的阶段：{', '.join(missing)}")
+        self._stages[name] = (fn, deps)
+        return self
+
+    def _call(self, name: str, fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(**kwargs)
+        finally:
+            self.durations[name] = time.perf_counter() - start
+
+    async def _acall(self, name: str, fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            value = fn(**kwargs)
+            if inspect.isawaitable(value):
+                value = await value
+            return value
+        finally:
+            self.durations[name] = time.perf_counter() - start
+
+    def run(self, executor=None) -> Dict[str, Any]:
+        """
+        执行所有阶段，返回 {阶段名: 结果}
+
+        Args:
+            executor: concurrent.futures 执行器；None 表示在当前线程按添加顺序依次执行
+
+        任一阶段抛出异常时，尚未开始的阶段被取消，异常原样抛出。
+        """
+        return dict(self.iter_run(executor))
+
+    def iter_run(self, executor=None) -> Iterator[Tuple[str, Any]]:
+        """
+        执行所有阶段，每个阶段完成时立即产出 (阶段名, 结果)
+
+        参数同 run；并发执行时按完成顺序产出。调用方提前停止迭代时，尚未开始的阶段被取消。
+        """
+        results: Dict[str, Any] = {}
+        if executor is None:
+            for name, (fn, deps) in self._stages.items():
+                results[name] = self._call(name, fn, {dep: results[dep] for dep in deps})
+                yield name, results[name]
+            return
+
+        pending = dict(self._stages)
+        running = {}
+        try:
+            while pending or running:
+                ready = [
+                    name for name, (_, deps) in pending.items()
+                    if all(dep in results for dep in deps)
+                ]
+                for name in ready:
+                    fn, deps = pending.pop(name)
+                    kwargs = {dep: results[dep] for dep in deps}
+                    running[executor.submit(self._call, name, fn, kwargs)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    yield name, results[name]
+        finally:
+            for future in running:
+                future.cancel()
+
+    async def arun(self) -> Dict[str, Any]:
+        """
+        在当前事件循环中执行所有阶段，返回 {阶段名: 结果}
+
+        阶段函数可以返回协程（如异步 LLM 调用），相互独立的协程并发等待；
+        普通函数在事件循环线程中直接执行，只适合耗时极短的阶段。
+        任一阶段抛出异常或调用方被取消时，其余阶段的任务会被取消。
+        """
+        return {name: value async for name, value in self.aiter_run()}
+
+    async def aiter_run(self) -> AsyncIterator[Tuple[str, Any]]:
+        """arun 的逐阶段版本：每个阶段完成时立即产出 (阶段名, 结果)"""
+        results: Dict[str, Any] = {}
+        pending = dict(self._stages)
+        running = {}
+        try:
+            while pending or running:
+                ready = [
+                    name for name, (_, deps) in pending.items()
+                    if all(dep in results for dep in deps)
+                ]
+                for name in ready:
+                    fn, deps = pending.pop(name)
+                    kwargs = {dep: results[dep] for dep in deps}
+                    running[asyncio.ensure_future(self._acall(name, fn, kwargs))] = name
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    results[name] = task.result()
+                    yield name, results[name]
+        finally:
+            for task in running:
+                task.cancel()
+
+
+# 阶段执行使用的共享线程池（首次使用时创建）
+_stage_executor = None
+_stage_executor_lock = threading.Lock()
+
+
+def get_stage_executor():
+    """获取进程级共享的阶段线程池"""
+    global _stage_executor
+    if _stage_executor is None:
+        with _stage_executor_lock:
+            if _stage_executor is None:
+                _stage_executor = ThreadPoolExecutor(
+                    max_workers=32, thread_name_prefix="philosofia-stage"
+                )
+    return _stage_executor
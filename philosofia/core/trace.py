@@ -0,0 +1,62 @@
+"""
+推理链记录：按追踪级别保存推理步骤
+    off     —— 不记录
+    summary —— 只记录步骤序号、名称与描述
+    full    —— 另外记录各阶段 LLM 的完整推理结果（details）
+请求过程中步骤以紧凑的槽位对象保存，details 只保存对已有结果的引用，
+输出时才转换为字典
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+TRACE_LEVELS = ("off", "summary", "full")
+
+
+def check_trace_level(level: str) -> str:
+    """校验追踪级别"""
+    if level not in TRACE_LEVELS:
+        raise ValueError(f"不支持的追踪级别：{level}（可选 off / summary / full）")
+    return level
+
+
+class ReasoningStep(Mapping):
+    """
+    推理链中的一个步骤
+
+    支持按字典方式读取（step["name"]、step.get("details")），to_dict() 转换为普通字典。
+    """
+
+    __slots__ = ("step", "name", "description", "details")
+
+    def __init__(
+        self, step: int, name: str, description: str, details: Optional[Any] = None
+    ):
+        self.step = step
+        self.name = name
+        self.description = description
+        self.details = details
+
+    def _keys(self):
+        if self.details:
+            return ("step", "name", "description", "details")
+        return ("step", "name", "description")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._keys():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return f"ReasoningStep({self.step}, {self.name!r}, {self.description!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        step = {"step": self.step, "name": self.name, "description": self.description}
+        if self.details:
+            step["details"] = self.details
+        return step
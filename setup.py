@@ -13,6 +13,7 @@ setup(
     author="Your Name",
     author_email="you@example.com",
     packages=find_packages(),
+    package_data={"philosofia.core": ["data/*.json", "data/*.jsonl"]},
     python_requires=">=3.8",
     install_requires=[],
     classifiers=[
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""测试智能体池对 LLM 客户端与智能体的复用"""
+import sys
+import asyncio
+import threading
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import philosofia
+from philosofia.core import agent_pool as agent_pool_module
+from philosofia.core.agent_pool import AgentPool
+from philosofia.core.llm_interface import MockLLM
+
+
+class ClosableLLM(MockLLM):
+    """记录 close 调用的 Mock LLM"""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+        self.aclosed = 0
+        ClosableLLM.created.append(self)
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.aclosed += 1
+
+
+def use_closable_backend():
+    """让 create_llm 创建 ClosableLLM"""
+    ClosableLLM.created = []
+    original = agent_pool_module.create_llm
+    agent_pool_module.create_llm = lambda backend, **kwargs: ClosableLLM(**kwargs)
+    return original
+
+
+def test_reuses_llm_and_agents():
+    """相同配置复用 LLM 与空闲智能体，不同参数使用不同 LLM"""
+    original = use_closable_backend()
+    try:
+        pool = AgentPool()
+        for _ in range(5):
+            pool.respond("AI是否应该拥有权利？", llm_backend="openai", model="a")
+        pool.respond("AI是否应该拥有权利？", llm_backend="openai", model="b")
+        stats = pool.stats()
+        print(f"池统计: {stats}")
+        assert stats["llms_created"] == 2 and stats["agents_created"] == 2
+        assert [llm.kwargs["model"] for llm in ClosableLLM.created] == ["a", "b"]
+        assert stats["in_use"] == 0 and stats["idle"] == 2
+
+        # 参数中包含不可哈希的值也能生成键
+        pool.respond("问题", llm_backend="openai", model="a", extra={"tags": ["x"]})
+        pool.respond("问题", llm_backend="openai", model="a", extra={"tags": ["x"]})
+        assert pool.stats()["llms_created"] == 3
+    finally:
+        agent_pool_module.create_llm = original
+
+
+def test_concurrent_borrowers_get_distinct_agents():
+    """并发借出时每个调用方拿到不同的智能体，但共享同一个 LLM"""
+    original = use_closable_backend()
+    try:
+        pool = AgentPool()
+        barrier = threading.Barrier(4)
+        agents = []
+        lock = threading.Lock()
+
+        def borrow():
+            with pool.agent("openai") as agent:
+                with lock:
+                    agents.append(agent)
+                barrier.wait()
+
+        threads = [threading.Thread(target=borrow) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(agent) for agent in agents}) == 4
+        assert len({id(agent.llm) for agent in agents}) == 1
+        assert len(ClosableLLM.created) == 1
+    finally:
+        agent_pool_module.create_llm = original
+
+
+def test_close_and_eviction():
+    """close 与上下文管理器关闭 LLM；超出上限时淘汰最久未用的配置"""
+    original = use_closable_backend()
+    try:
+        with AgentPool(max_entries=2) as pool:
+            for model in ("a", "b", "c"):
+                pool.respond("问题", llm_backend="openai", model=model)
+            first = ClosableLLM.created[0]
+            assert first.closed and pool.stats()["entries"] == 2
+
+            agent = pool.acquire("openai", model="c")
+        # 退出时仍被借出的智能体，其 LLM 在归还时才关闭
+        assert ClosableLLM.created[1].closed
+        assert not agent.llm.closed
+        pool.release(agent)
+        assert agent.llm.closed
+        assert pool.stats()["entries"] == 0
+    finally:
+        agent_pool_module.create_llm = original
+
+
+def test_async_close():
+    """async with 退出时关闭当前事件循环上的异步客户端，再关闭 LLM"""
+    original = use_closable_backend()
+    try:
+        async def run():
+            async with AgentPool() as pool:
+                await pool.arespond("问题", llm_backend="openai", model="a")
+            return pool
+
+        pool = asyncio.run(run())
+        llm = ClosableLLM.created[0]
+        assert llm.aclosed == 1 and llm.closed
+        assert pool.stats()["entries"] == 0
+    finally:
+        agent_pool_module.create_llm = original
+
+
+def test_ask_philosophically_uses_default_pool():
+    """ask_philosophically 复用进程级智能体池"""
+    pool = philosofia.get_agent_pool()
+    pool.close()
+    before = pool.stats()["agents_created"]
+    for _ in range(3):
+        result = philosofia.ask_philosophically("隐私与安全如何平衡？")
+        assert result["dialectical_synthesis"]
+    assert pool.stats()["agents_created"] == before + 1
+    pool.close()
+
+
+if __name__ == "__main__":
+    test_reuses_llm_and_agents()
+    test_concurrent_borrowers_get_distinct_agents()
+    test_close_and_eviction()
+    test_async_close()
+    test_ask_philosophically_uses_default_pool()
+    print("智能体池测试通过！")
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""测试智能体的异步回答 arespond 与 aask_philosophically"""
+import sys
+import asyncio
+import time
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia import aask_philosophically
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+
+
+class AsyncOnlyLLM(MockLLM):
+    """只提供异步接口的 Mock LLM（同步调用直接报错），每次调用耗时 delay 秒"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = False
+
+    def generate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        raise AssertionError("arespond 不应调用同步接口")
+
+    async def agenerate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return MockLLM.generate_with_reasoning(self, prompt, system_prompt, temperature)
+
+
+def test_arespond_matches_respond():
+    """异步回答与同步回答的输出结构一致"""
+    query = "AI是否应该拥有权利？"
+    expected = PhilosophicallyAugmentedAgentSystem(llm=MockLLM()).respond(query)
+    llm = AsyncOnlyLLM(delay=0)
+    result = asyncio.run(PhilosophicallyAugmentedAgentSystem(llm=llm).arespond(query))
+    print(f"异步 LLM 调用次数: {llm.calls}")
+    assert result.keys() == expected.keys()
+    assert result["perspectives"] == expected["perspectives"]
+    assert [s["name"] for s in result["reasoning_chain"]] == [
+        s["name"] for s in expected["reasoning_chain"]
+    ]
+
+
+def test_concurrent_arespond():
+    """多个请求在同一事件循环中并发，总耗时接近单个请求"""
+    async def run_many(n):
+        agents = [PhilosophicallyAugmentedAgentSystem(llm=AsyncOnlyLLM()) for _ in range(n)]
+        return await asyncio.gather(*(agent.arespond(f"问题{i}") for i, agent in enumerate(agents)))
+
+    start = time.perf_counter()
+    asyncio.run(run_many(1))
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = asyncio.run(run_many(20))
+    many = time.perf_counter() - start
+    print(f"单个请求 {single:.3f}s，20 个并发请求 {many:.3f}s")
+    assert len(results) == 20
+    assert many < single * 3
+
+
+def test_arespond_cancellation():
+    """取消 arespond 会取消进行中的 LLM 调用"""
+    llm = AsyncOnlyLLM(delay=10)
+
+    async def cancel_soon():
+        task = asyncio.ensure_future(PhilosophicallyAugmentedAgentSystem(llm=llm).arespond("问题"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    start = time.perf_counter()
+    assert asyncio.run(cancel_soon())
+    assert llm.cancelled
+    assert time.perf_counter() - start < 1
+
+
+def test_aask_philosophically():
+    """异步入口函数支持 Mock 与纯规则模式"""
+    result = asyncio.run(aask_philosophically("隐私与安全如何平衡？"))
+    assert result["dialectical_synthesis"]
+    result = asyncio.run(aask_philosophically("隐私与安全如何平衡？", use_llm=False))
+    assert result["moral_status"] in ("passed", "compromised_after_retry")
+
+
+if __name__ == "__main__":
+    test_arespond_matches_respond()
+    test_concurrent_arespond()
+    test_arespond_cancellation()
+    test_aask_philosophically()
+    print("异步回答测试通过！")
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""测试 LLM 异步接口"""
+import sys
+import asyncio
+import importlib.util
+import threading
+import time
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.llm_interface import LLMInterface, MockLLM, OpenAILLM, VolcanoEngineLLM
+
+
+class SlowLLM(LLMInterface):
+    """只实现同步接口的慢速 LLM，用于验证默认的异步实现"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.threads = set()
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return f"回答：{prompt}"
+
+    def generate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        response = self.generate(prompt, system_prompt, temperature)
+        return {
+            "response": response,
+            "reasoning_steps": [{"step": 1, "content": response}],
+            "confidence": 0.5,
+        }
+
+
+def test_mock_async():
+    """MockLLM 的异步接口与同步接口结果一致"""
+    llm = MockLLM()
+    prompt = "AI应该拥有权利吗？"
+
+    async def run():
+        return (
+            await llm.agenerate(prompt),
+            await llm.agenerate_with_reasoning(prompt),
+        )
+
+    text, reasoning = asyncio.run(run())
+    print(f"agenerate: {text[:30]}...")
+    assert text == llm.generate(prompt)
+    assert reasoning == llm.generate_with_reasoning(prompt)
+
+
+def test_default_async_runs_concurrently():
+    """默认异步实现在线程池中执行，多个请求可以并发等待"""
+    llm = SlowLLM(delay=0.2)
+
+    async def run():
+        return await asyncio.gather(
+            *(llm.agenerate(f"问题{i}") for i in range(5)),
+            llm.agenerate_with_reasoning("问题5"),
+        )
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    print(f"6 个请求耗时: {elapsed:.2f}s")
+
+    assert results[:5] == [f"回答：问题{i}" for i in range(5)]
+    assert results[5]["response"] == "回答：问题5"
+    assert elapsed < 0.2 * 6
+    assert threading.get_ident() not in llm.threads
+
+
+def test_aclose_closes_async_clients():
+    """aclose 关闭当前事件循环上的异步客户端，之后按需重新创建"""
+    if importlib.util.find_spec("openai") is not None:
+        llm = OpenAILLM(api_key="sk-test")
+
+        async def run_openai():
+            client = llm._get_async_client()
+            await llm.aclose()
+            assert client.is_closed()
+            assert llm._get_async_client() is not client
+            await llm.aclose()
+            await llm.aclose()  # 可重复调用
+
+        asyncio.run(run_openai())
+        llm.close()
+
+    if importlib.util.find_spec("aiohttp") is not None:
+        import aiohttp
+
+        llm = VolcanoEngineLLM(access_key="ak", secret_key="sk")
+
+        async def run_volcano():
+            session = llm._get_aiohttp_session(aiohttp)
+            await llm.aclose()
+            assert session.closed
+
+        asyncio.run(run_volcano())
+
+    asyncio.run(MockLLM().aclose())  # 默认实现不做任何事
+
+
+if __name__ == "__main__":
+    test_mock_async()
+    test_default_async_runs_concurrently()
+    test_aclose_closes_async_clients()
+    print("异步接口测试通过！")
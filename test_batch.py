@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""测试批量生成接口"""
+import sys
+import asyncio
+import random
+import threading
+import time
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.errors import LLMRateLimitError
+from philosofia.core.llm_interface import MockLLM
+
+
+class FlakyLLM(MockLLM):
+    """随机延迟、记录并发峰值，并对特定提示报错的 Mock LLM"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(random.uniform(0.001, 0.02))
+            if prompt == "坏问题":
+                raise RuntimeError("模拟失败")
+            if prompt == "限流问题":
+                raise LLMRateLimitError("429 Too Many Requests", backend="mock")
+            return f"回答：{prompt}"
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_generate_batch():
+    """保持输入顺序、限制并发，并逐项报告错误"""
+    llm = FlakyLLM()
+    prompts = [f"问题{i}" for i in range(30)] + ["坏问题", "限流问题"]
+    results = llm.generate_batch(prompts, max_concurrency=4)
+
+    print(f"并发峰值: {llm.peak}")
+    assert llm.peak <= 4
+    assert [item["index"] for item in results] == list(range(len(prompts)))
+    assert [item["response"] for item in results[:30]] == [f"回答：问题{i}" for i in range(30)]
+    assert results[30]["response"] is None and "模拟失败" in results[30]["error"]
+    assert results[31]["response"] is None and results[31]["error"] == "[mock] 429 Too Many Requests"
+
+
+def test_agenerate_batch():
+    """异步批量生成结果与同步版本一致"""
+    llm = FlakyLLM()
+    prompts = [f"问题{i}" for i in range(10)] + ["坏问题"]
+    results = asyncio.run(llm.agenerate_batch(prompts, max_concurrency=3))
+    assert llm.peak <= 3
+    assert [item["response"] for item in results[:10]] == [f"回答：问题{i}" for i in range(10)]
+    assert results[10]["error"] == "模拟失败"
+
+
+if __name__ == "__main__":
+    test_generate_batch()
+    test_agenerate_batch()
+    print("批量生成测试通过！")
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""测试回答的截止时间与降级"""
+import sys
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.deadline import Deadline
+from philosofia.core.llm_interface import MockLLM
+from fake_llms import SlowLLM
+
+
+def test_deadline_args():
+    """预算与截止时间同时提供时取较早者；负预算报错"""
+    assert Deadline.from_args() is None
+    deadline = Deadline.from_args(budget_ms=10_000, deadline=time.monotonic() + 1)
+    assert deadline.remaining() <= 1
+    try:
+        Deadline.from_args(budget_ms=-1)
+        assert False, "应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+def test_tight_budget_degrades_to_rules():
+    """预算不足时各 LLM 阶段改用规则路径，并在输出中记录"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=SlowLLM(0.5))
+    start = time.perf_counter()
+    result = agent.respond("AI是否应该拥有权利？", budget_ms=100)
+    elapsed = time.perf_counter() - start
+    print(f"耗时 {elapsed:.3f}s，降级阶段: {result['degraded_stages']}")
+    assert elapsed < 0.4
+    assert {"正态采样生成", "道德三重检验", "归零校准"} <= set(result["degraded_stages"])
+    assert result["dialectical_synthesis"]
+    assert "超出时间预算" in [step["name"] for step in result["reasoning_chain"]]
+
+
+def test_partial_degradation():
+    """只有超出剩余时间的阶段降级"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=SlowLLM(0.1))
+    result = agent.respond("AI是否应该拥有权利？", budget_ms=150)
+    print(f"降级阶段: {result['degraded_stages']}")
+    assert "正态采样生成" not in result["degraded_stages"]
+    assert "道德三重检验" in result["degraded_stages"]
+
+    # 没有预算时不降级；输出结构一致
+    unbounded = PhilosophicallyAugmentedAgentSystem(llm=MockLLM()).respond("AI是否应该拥有权利？")
+    assert unbounded["degraded_stages"] == []
+    assert unbounded.keys() == result.keys()
+
+
+def test_latency_estimate_skips_stage():
+    """阶段近期耗时超过剩余时间时直接降级，不再等待"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=SlowLLM(0.2))
+    agent.respond("AI是否应该拥有权利？", budget_ms=5000)
+    assert agent.stage_latency["正态采样生成"] >= 0.2
+    start = time.perf_counter()
+    result = agent.respond("AI是否应该拥有权利？", budget_ms=150)
+    elapsed = time.perf_counter() - start
+    print(f"按耗时估计降级，耗时 {elapsed:.3f}s")
+    assert "正态采样生成" in result["degraded_stages"]
+    assert elapsed < 0.1
+
+
+def test_saturated_stage_pool_does_not_degrade():
+    """阶段线程池被占满时，限时的 LLM 调用不排在等待它的阶段之后，后端正常时不降级"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=SlowLLM(0.05), parallel_stages=True)
+    with ThreadPoolExecutor(48) as pool:
+        results = list(pool.map(
+            lambda _: agent.respond("AI是否应该拥有权利？", budget_ms=3000), range(48)
+        ))
+    degraded = [result["degraded_stages"] for result in results if result["degraded_stages"]]
+    print(f"并发 48 个请求，降级的请求数: {len(degraded)}")
+    assert not degraded
+
+
+def test_async_deadline_cancels_llm_call():
+    """异步回答超出截止时间时取消进行中的 LLM 调用"""
+    llm = SlowLLM(1.0)
+    agent = PhilosophicallyAugmentedAgentSystem(llm=llm)
+    start = time.perf_counter()
+    result = asyncio.run(agent.arespond("AI是否应该拥有权利？", budget_ms=100))
+    elapsed = time.perf_counter() - start
+    print(f"异步耗时 {elapsed:.3f}s，降级阶段: {result['degraded_stages']}")
+    assert elapsed < 0.5
+    assert "正态采样生成" in result["degraded_stages"]
+    assert llm.cancelled >= 1
+
+
+if __name__ == "__main__":
+    test_deadline_args()
+    test_tight_budget_degrades_to_rules()
+    test_partial_degradation()
+    test_latency_estimate_skips_stage()
+    test_saturated_stage_pool_does_not_degrade()
+    test_async_deadline_cancels_llm_call()
+    print("截止时间测试通过！")
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""测试基于多模式匹配的问题域分类"""
+import sys
+import json
+import os
+import tempfile
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.domain_classifier import (
+    DomainClassifier,
+    get_domain_classifier,
+    load_domain_classifier,
+)
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.normal_sampler import NormalDistributionSamplingGenerator
+
+
+def test_default_vocabulary():
+    """默认词表覆盖原有的三个问题域"""
+    classifier = get_domain_classifier()
+    assert classifier is get_domain_classifier()
+    assert classifier.classify("AI是否应该拥有权利？") == "ai_rights"
+    assert classifier.classify("为了公共安全，应该监控所有公民吗？") == "privacy_vs_security"
+    assert classifier.classify("Should robots have rights?") == "ai_rights"
+    assert classifier.classify("生命伦理的边界在哪里？") == "default"
+
+    ndsg = NormalDistributionSamplingGenerator(llm=MockLLM(), use_llm=False)
+    assert ndsg.generate("人工智能会有意识吗？")["domain"] == "ai_rights"
+
+
+def test_weighted_scores():
+    """得分为命中触发词的权重之和；重叠的触发词都会命中，同一触发词只计一次"""
+    classifier = DomainClassifier({
+        "ethics": {"伦理": 1.0, "生命伦理": 2.0, "moral": 1.0},
+        "bio": {"生命": 0.5, "基因": 1.0},
+    })
+    scores = classifier.scores("生命伦理与基因编辑：生命伦理的边界")
+    print(f"得分: {scores}")
+    assert scores == {"ethics": 3.0, "bio": 1.5}
+    assert list(scores) == ["ethics", "bio"]
+    assert classifier.classify("基因") == "bio"
+    assert classifier.classify("天气") == "default"
+
+    # 得分相同时按词表顺序
+    assert classifier.classify("伦理与基因") == "ethics"
+
+
+def test_word_boundaries():
+    """英文触发词不匹配单词内部，中文触发词不受影响"""
+    classifier = DomainClassifier({"ai": {"ai": 1.0, "AI伦理": 1.0}})
+    assert classifier.scores("He said it was plain") == {}
+    assert classifier.scores("Is AI conscious?") == {"ai": 1.0}
+    assert classifier.scores("ai伦理问题") == {"ai": 2.0}
+
+
+def test_load_from_file():
+    """从 JSON 文件加载词表；空触发词报错"""
+    data = {"default": "other", "domains": {"space": {"宇宙": 1.0, "galaxy": 1.0}}}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "domains.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        classifier = load_domain_classifier(path)
+    assert classifier.classify("宇宙会热寂吗") == "space"
+    assert classifier.classify("Galaxy formation") == "space"
+    assert classifier.classify("你好") == "other"
+
+    try:
+        DomainClassifier({"x": {" ": 1.0}})
+        assert False, "应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_default_vocabulary()
+    test_weighted_scores()
+    test_word_boundaries()
+    test_load_from_file()
+    print("问题域分类测试通过！")
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""测试融合推理模式与 JSON 结构化输出"""
+import sys
+import asyncio
+import json
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.errors import LLMOutputError
+from philosofia.core.fused_reasoner import FUSED_SCHEMA
+from philosofia.core.json_output import extract_json, validate_json
+from philosofia.core.llm_interface import MockLLM
+
+
+def fused_answer(moral_ok=True):
+    return {
+        "perspectives": {
+            "mu": "在保障人类福祉的前提下审慎赋予AI有限权利",
+            "positive_tail": "AI应享有与人类同等的道德地位",
+            "negative_tail": "AI只是工具，不应拥有任何权利",
+        },
+        "synthesis": "应以渐进、可问责的方式讨论AI的道德地位",
+        "moral": {
+            "universalizable": True,
+            "humanity_respected": moral_ok,
+            "autonomous": True,
+            "reasoning": "该立场可普遍化，且尊重人的自主性",
+        },
+        "calibration": {
+            "heat_death_passed": True,
+            "reason": "承认有限性并维护理性尊严",
+            "lens": "道德律无条件有效",
+            "calibrated_response": "应以渐进、可问责的方式讨论AI的道德地位。[宇宙校准] 道德律无条件有效",
+        },
+    }
+
+
+class FusedLLM(MockLLM):
+    """融合提示返回 JSON 的 Mock LLM，记录调用次数"""
+
+    def __init__(self, answer="json", moral_ok=True):
+        self.answer = answer
+        self.moral_ok = moral_ok
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        self.calls += 1
+        if system_prompt and "JSON" in system_prompt:
+            if self.answer == "invalid":
+                return "抱歉，我无法按要求输出。"
+            body = json.dumps(fused_answer(self.moral_ok), ensure_ascii=False)
+            return f"```json\n{body}\n```"
+        return super().generate(prompt, system_prompt, temperature, max_tokens)
+
+    def generate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        self.calls += 1
+        return super().generate_with_reasoning(prompt, system_prompt, temperature)
+
+
+def test_json_helpers():
+    """提取代码块与夹带文字中的 JSON，并按 schema 校验"""
+    assert extract_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert extract_json('结果如下：{"a": [1, 2]} 以上') == {"a": [1, 2]}
+    validate_json(fused_answer(), FUSED_SCHEMA)
+
+    broken = fused_answer()
+    broken["moral"]["autonomous"] = "通过"
+    try:
+        validate_json(broken, FUSED_SCHEMA)
+        assert False, "应当抛出 ValueError"
+    except ValueError as e:
+        print(f"校验错误: {e}")
+        assert "$.moral.autonomous" in str(e)
+
+    try:
+        MockLLM().generate_json("问题", schema=FUSED_SCHEMA)
+        assert False, "应当抛出 LLMOutputError"
+    except LLMOutputError:
+        pass
+
+
+def test_fused_single_call():
+    """融合模式一次 LLM 调用完成回答，输出结构与多次调用路径一致"""
+    query = "AI是否应该拥有权利？"
+    llm = FusedLLM()
+    result = PhilosophicallyAugmentedAgentSystem(llm=llm, fused=True).respond(query)
+    multi_llm = FusedLLM()
+    expected = PhilosophicallyAugmentedAgentSystem(llm=multi_llm).respond(query)
+    print(f"融合模式调用 {llm.calls} 次，多次调用路径 {multi_llm.calls} 次")
+
+    assert llm.calls == 1
+    assert result.keys() == expected.keys()
+    assert result["moral_status"] == "passed"
+    assert result["perspectives"]["稳健共识 (μ)"].startswith("在保障人类福祉")
+    assert "[宇宙校准]" in result["dialectical_synthesis"]
+    assert result["calibration_info"]["heat_death_check"]["passed"]
+    assert "融合推理" in [step["name"] for step in result["reasoning_chain"]]
+
+
+def test_fused_fallbacks():
+    """输出无效时退回多次调用路径；道德检验未通过时转入重新采样"""
+    llm = FusedLLM(answer="invalid")
+    result = PhilosophicallyAugmentedAgentSystem(llm=llm, fused=True).respond("AI是否应该拥有权利？")
+    failures = [s for s in result["reasoning_chain"] if s["name"] == "LLM 调用失败"]
+    assert failures and "结构化输出无效" in failures[0]["description"]
+    assert llm.calls > 1 and result["dialectical_synthesis"]
+
+    llm = FusedLLM(moral_ok=False)
+    result = PhilosophicallyAugmentedAgentSystem(llm=llm, fused=True).respond("AI是否应该拥有权利？")
+    names = [s["name"] for s in result["reasoning_chain"]]
+    assert names.count("道德三重检验") >= 2
+    assert llm.calls > 1
+    # 沿用融合推理的道德结论：先重新采样，不再重复检验同一合题
+    first_check = names.index("道德三重检验")
+    assert names.index("调整采样策略") < names.index("道德三重检验", first_check + 1)
+
+    async_llm = FusedLLM(moral_ok=False)
+    agent = PhilosophicallyAugmentedAgentSystem(llm=async_llm, fused=True)
+    async_names = [s["name"] for s in asyncio.run(agent.arespond("AI是否应该拥有权利？"))["reasoning_chain"]]
+    assert async_names == names and async_llm.calls == llm.calls
+
+
+def test_fused_async():
+    """arespond 同样支持融合模式"""
+    llm = FusedLLM()
+    agent = PhilosophicallyAugmentedAgentSystem(llm=llm, fused=True)
+    result = asyncio.run(agent.arespond("AI是否应该拥有权利？"))
+    assert llm.calls == 1
+    assert result["moral_status"] == "passed"
+
+
+if __name__ == "__main__":
+    test_json_helpers()
+    test_fused_single_call()
+    test_fused_fallbacks()
+    test_fused_async()
+    print("融合推理测试通过！")
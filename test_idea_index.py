@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""测试思想分布的本地向量检索"""
+import sys
+import importlib.util
+import os
+import tempfile
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.idea_index import IdeaIndex, build_idea_index
+from philosofia.core.idea_store import IdeaStore, write_idea_store
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.normal_sampler import NormalDistributionSamplingGenerator
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+DISTRIBUTIONS = {
+    "default": {"mu": "平衡", "positive_tail": "激进", "negative_tail": "保守"},
+    "bioethics": {
+        "mu": "基因编辑应在严格伦理审查下用于治疗疾病",
+        "positive_tail": "应允许基因增强以提升人类能力",
+        "negative_tail": "任何人类胚胎基因编辑都应禁止",
+    },
+    "climate": {
+        "mu": "以碳定价与技术创新逐步实现碳中和",
+        "positive_tail": "立即全面停止化石能源",
+        "negative_tail": "气候政策不应牺牲经济增长",
+    },
+    "education": {
+        "mu": "教育公平需要加大对薄弱学校的投入",
+        "positive_tail": "以个性化学习取代统一的课堂教学",
+        "negative_tail": "应坚持传统的考试选拔制度",
+    },
+}
+
+
+def test_search():
+    """按相似度排序返回最相近的条目，相同文本的相似度为 1"""
+    if not HAS_NUMPY:
+        print("未安装 numpy，跳过")
+        return
+    index = build_idea_index(DISTRIBUTIONS)
+    assert len(index) == 3  # 不含 default
+
+    hits = index.search("可以用基因编辑治疗遗传病吗？", k=3)
+    print(f"检索结果: {hits}")
+    assert hits[0][0] == "bioethics"
+    assert all(0 < score <= 1 for _, score in hits)
+    assert [score for _, score in hits] == sorted((score for _, score in hits), reverse=True)
+    assert index.search("如何实现碳中和", k=1)[0][0] == "climate"
+    assert index.search("", k=3) == [] and index.search("基因", k=0) == []
+
+    index.add("exact", "完全相同的一段文本")
+    key, score = index.search("完全相同的一段文本", k=1)[0]
+    assert key == "exact" and abs(score - 1.0) < 1e-3
+
+
+def test_incremental_inserts():
+    """逐条插入（缓冲区多次转为段并合并）与一次性构建的检索结果一致"""
+    if not HAS_NUMPY:
+        print("未安装 numpy，跳过")
+        return
+    items = [(f"entry_{i}", f"第{i}号条目 关于主题{i % 7}的讨论 {'甲乙丙丁戊'[i % 5] * 3}") for i in range(300)]
+    bulk = IdeaIndex()
+    bulk.add_many(items)
+    incremental = IdeaIndex(buffer_size=8)
+    for key, text in items:
+        incremental.add(key, text)
+
+    segments = incremental._state[0]
+    print(f"段大小: {[len(segment) for segment in segments]}")
+    assert len(segments) <= 8
+    assert all(len(a) > len(b) for a, b in zip(segments, segments[1:]))
+    for query in ("第42号条目", "主题3的讨论", "丙丙丙"):
+        expected, actual = bulk.search(query, k=5), incremental.search(query, k=5)
+        assert [key for key, _ in expected] == [key for key, _ in actual]
+        assert all(abs(a[1] - b[1]) < 1e-5 for a, b in zip(expected, actual))
+
+
+def test_sampler_fallback():
+    """触发词未命中时检索最相近的问题域；相似度过低时仍使用 default"""
+    if not HAS_NUMPY:
+        print("未安装 numpy，跳过")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ideas.jsonl")
+        write_idea_store(DISTRIBUTIONS, path)
+        with IdeaStore(path) as store:
+            ndsg = NormalDistributionSamplingGenerator(
+                llm=MockLLM(), use_llm=False, idea_store=store, idea_index=build_idea_index(store)
+            )
+            result = ndsg.generate("考试选拔制度是否公平？")
+            assert result["domain"] == "education"
+            assert result["perspectives"]["传统警示 (-2σ)"] == "应坚持传统的考试选拔制度"
+            assert ndsg.generate("今天天气怎么样")["domain"] == "default"
+
+
+def test_invalid_and_missing_numpy():
+    """哈希维数必须是 2 的幂；未安装 numpy 时给出安装提示"""
+    if HAS_NUMPY:
+        try:
+            IdeaIndex(dim=1000)
+            assert False, "应当抛出 ValueError"
+        except ValueError:
+            pass
+
+    saved = sys.modules.get("numpy")
+    sys.modules["numpy"] = None
+    try:
+        IdeaIndex()
+        assert False, "应当抛出 ImportError"
+    except ImportError as e:
+        assert "pip install numpy" in str(e)
+    finally:
+        if saved is None:
+            del sys.modules["numpy"]
+        else:
+            sys.modules["numpy"] = saved
+
+
+if __name__ == "__main__":
+    test_search()
+    test_incremental_inserts()
+    test_sampler_fallback()
+    test_invalid_and_missing_numpy()
+    print("向量检索测试通过！")
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""测试磁盘上的思想分布目录"""
+import sys
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.idea_store import IdeaStore, get_idea_store, write_idea_store
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.normal_sampler import NormalDistributionSamplingGenerator
+
+
+def make_distributions(count):
+    return {
+        f"domain_{i:05d}": {
+            "mu": f"平衡观点 {i}",
+            "positive_tail": f"激进观点 {i}",
+            "negative_tail": f"保守观点 {i}",
+        }
+        for i in range(count)
+    }
+
+
+def test_lookup():
+    """二分查找命中每个问题域；不存在的问题域返回默认值"""
+    distributions = make_distributions(2000)
+    distributions["中文问题域"] = {"mu": "μ", "positive_tail": "+2σ", "negative_tail": "-2σ"}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ideas.jsonl")
+        write_idea_store(distributions, path)
+        with IdeaStore(path, cache_size=16) as store:
+            for domain, dist in distributions.items():
+                assert store[domain] == dist
+            assert "中文问题域" in store and "domain_99999" not in store
+            assert store.get("missing") is None
+            assert store.get("missing", {"mu": "x"}) == {"mu": "x"}
+            assert len(store._cache) == 16
+
+            # 返回的是副本
+            store["domain_00001"]["mu"] = "被修改"
+            assert store["domain_00001"]["mu"] == "平衡观点 1"
+
+            # 多线程查找
+            with ThreadPoolExecutor(8) as pool:
+                found = list(pool.map(store.get, distributions))
+            assert found == list(distributions.values())
+
+            assert [domain for domain, _ in store.items()] == sorted(distributions)
+
+        try:
+            store["domain_00001"]
+            assert False, "关闭后不应再命中"
+        except KeyError:
+            pass
+
+
+def test_empty_and_invalid():
+    """空目录没有任何问题域；缺少字段时写入报错"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "empty.jsonl")
+        write_idea_store({}, path)
+        with IdeaStore(path) as store:
+            assert "default" not in store and list(store.items()) == []
+
+        try:
+            write_idea_store({"x": {"mu": "只有 μ"}}, path)
+            assert False, "应当抛出 ValueError"
+        except ValueError as e:
+            print(f"缺少字段: {e}")
+
+
+def test_shared_store():
+    """采样器默认共享进程内的同一个目录，也可以指定自己的目录"""
+    a = NormalDistributionSamplingGenerator(llm=MockLLM(), use_llm=False)
+    b = NormalDistributionSamplingGenerator(llm=MockLLM(), use_llm=False)
+    assert a.idea_distributions is b.idea_distributions is get_idea_store()
+    assert a.generate("AI是否应该拥有权利？")["perspectives"]["稳健共识 (μ)"] == "AI是工具，无权利但需安全监管"
+
+    distributions = make_distributions(3)
+    distributions["default"] = {"mu": "自定义 μ", "positive_tail": "自定义 +2σ", "negative_tail": "自定义 -2σ"}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ideas.jsonl")
+        write_idea_store(distributions, path)
+        with IdeaStore(path) as store:
+            ndsg = NormalDistributionSamplingGenerator(llm=MockLLM(), use_llm=False, idea_store=store)
+            result = ndsg.generate("生命伦理的边界在哪里？")
+            assert result["perspectives"]["稳健共识 (μ)"] == "自定义 μ"
+            assert ndsg.generate("问题", domain="domain_00002")["domain"] == "domain_00002"
+
+
+if __name__ == "__main__":
+    test_lookup()
+    test_empty_and_invalid()
+    test_shared_store()
+    print("思想分布目录测试通过！")
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""测试惰性导入：import philosofia 不加载核心模块与可选 SDK"""
+import sys
+import json
+import subprocess
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+HEAVY_MODULES = [
+    "philosofia.core.agent_system",
+    "philosofia.core.llm_interface",
+    "asyncio",
+    "sqlite3",
+    "openai",
+    "dashscope",
+    "transformers",
+    "requests",
+    "aiohttp",
+]
+
+
+def loaded_after(statement):
+    """在全新解释器中执行 statement，返回其中已加载的重模块"""
+    code = (
+        "import json, sys\n"
+        f"{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_is_lazy():
+    """import philosofia 不导入任何核心模块"""
+    loaded = loaded_after("import philosofia")
+    print(f"import philosofia 后已加载: {loaded}")
+    assert loaded == []
+
+
+def test_mock_mode_skips_sdks():
+    """Mock 后端完整回答一次问题，不导入 sqlite3 与可选 SDK（标准库在核心模块顶部导入）"""
+    loaded = loaded_after(
+        "from philosofia import ask_philosophically\n"
+        "ask_philosophically('AI应该拥有权利吗？', llm_backend='mock')"
+    )
+    print(f"Mock 模式回答后已加载: {loaded}")
+    assert loaded == ["philosofia.core.agent_system", "philosofia.core.llm_interface", "asyncio"]
+
+
+def test_lazy_exports():
+    """导出名在首次访问时解析，与直接导入的对象一致"""
+    import philosofia
+    from philosofia.core.llm_interface import create_llm
+
+    assert philosofia.create_llm is create_llm
+    assert "CachedLLM" in dir(philosofia)
+    try:
+        philosofia.not_exported
+        assert False, "应当抛出 AttributeError"
+    except AttributeError:
+        pass
+
+
+if __name__ == "__main__":
+    test_import_is_lazy()
+    test_mock_mode_skips_sdks()
+    test_lazy_exports()
+    print("惰性导入测试通过！")
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""测试 LLM 响应缓存"""
+import sys
+import asyncio
+import os
+import tempfile
+import time
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia import CachedLLM
+from philosofia.core.llm_interface import MockLLM
+
+
+class CountingLLM(MockLLM):
+    """记录实际调用次数的 Mock LLM"""
+
+    def __init__(self):
+        self.calls = 0
+        self.closed = False
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        self.calls += 1
+        return super().generate(prompt, system_prompt, temperature, max_tokens)
+
+    def close(self):
+        self.closed = True
+
+
+def test_memory_cache():
+    """相同请求命中缓存，参数不同则视为不同请求"""
+    inner = CountingLLM()
+    llm = CachedLLM(inner, max_entries=2)
+
+    first = llm.generate("AI应该拥有权利吗？", system_prompt="哲学家")
+    assert llm.generate("AI应该拥有权利吗？", system_prompt="哲学家") == first
+    llm.generate("AI应该拥有权利吗？", system_prompt="哲学家", temperature=0.1)
+    assert inner.calls == 2
+
+    # 第三个不同请求触发 LRU 淘汰
+    llm.generate("隐私和安全哪个更重要？")
+    stats = llm.stats()
+    print(f"内存缓存统计: {stats}")
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_ttl_expiry():
+    """过期条目不再命中"""
+    inner = CountingLLM()
+    llm = CachedLLM(inner, ttl=0.05)
+    llm.generate("问题")
+    llm.generate("问题")
+    time.sleep(0.1)
+    llm.generate("问题")
+    assert inner.calls == 2
+    assert llm.stats()["expirations"] == 1
+
+
+def test_disk_cache_survives_restart():
+    """磁盘层在新实例中仍然有效"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm_cache.sqlite")
+
+        llm = CachedLLM(CountingLLM(), disk_path=path)
+        reasoning = llm.generate_with_reasoning("AI应该拥有权利吗？")
+        llm.close()
+
+        inner = CountingLLM()
+        restarted = CachedLLM(inner, disk_path=path)
+        assert restarted.generate_with_reasoning("AI应该拥有权利吗？") == reasoning
+        assert restarted.generate_with_reasoning("AI应该拥有权利吗？") == reasoning
+        stats = restarted.stats()
+        print(f"磁盘缓存统计: {stats}")
+        assert inner.calls == 0
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        restarted.close()
+
+
+def test_close_closes_wrapped_llm():
+    """close() 同时关闭磁盘缓存与被包装的 LLM"""
+    with tempfile.TemporaryDirectory() as tmp:
+        inner = CountingLLM()
+        llm = CachedLLM(inner, disk_path=os.path.join(tmp, "llm_cache.sqlite"))
+        llm.generate("问题")
+        llm.close()
+        assert inner.closed
+
+
+def test_cached_results_are_isolated():
+    """调用方修改返回的推理结果不会影响缓存"""
+    llm = CachedLLM(MockLLM())
+    first = llm.generate_with_reasoning("AI应该拥有权利吗？")
+    expected = first["response"]
+    first["response"] = "被调用方改写"
+    first["reasoning_steps"].append({"step": 99, "content": "追加"})
+
+    second = llm.generate_with_reasoning("AI应该拥有权利吗？")
+    assert second["response"] == expected
+    assert all(step["step"] != 99 for step in second["reasoning_steps"])
+    second["reasoning_steps"].clear()
+
+    third = asyncio.run(llm.agenerate_with_reasoning("AI应该拥有权利吗？"))
+    assert third["response"] == expected and third["reasoning_steps"]
+    assert llm.stats()["hits"] == 2
+
+
+if __name__ == "__main__":
+    test_memory_cache()
+    test_ttl_expiry()
+    test_disk_cache_survives_restart()
+    test_close_closes_wrapped_llm()
+    test_cached_results_are_isolated()
+    print("缓存测试通过！")
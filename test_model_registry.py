@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""测试本地模型注册表"""
+import sys
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.llm_interface import LocalLLM
+from philosofia.core.model_registry import ModelRegistry
+
+
+class FakeLoader:
+    """记录加载次数的模拟加载函数（加载耗时 50ms）"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, model_name, device):
+        with self.lock:
+            self.calls.append(model_name)
+        time.sleep(0.05)
+        return f"pipeline:{model_name}"
+
+
+def test_concurrent_acquire_loads_once():
+    """并发获取同一模型只加载一次"""
+    loader = FakeLoader()
+    registry = ModelRegistry(loader=loader)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pipelines = list(pool.map(lambda _: registry.acquire("gpt2"), range(8)))
+    print(f"加载次数: {len(loader.calls)}")
+    assert loader.calls == ["gpt2"]
+    assert set(pipelines) == {"pipeline:gpt2"}
+    assert registry.stats()["models"] == {"gpt2": 8}
+
+
+def test_lru_eviction_skips_referenced_models():
+    """超出上限时按 LRU 卸载无人引用的模型，仍被引用的模型保留"""
+    loader = FakeLoader()
+    registry = ModelRegistry(max_models=2, loader=loader)
+    registry.acquire("a")
+    registry.acquire("b")
+    registry.release("b")
+    registry.acquire("c")  # 超出上限：a 仍被引用，卸载 b
+    assert set(registry.stats()["models"]) == {"a", "c"}
+
+    registry.release("a")
+    registry.release("c")
+    registry.acquire("c")
+    registry.release("c")
+    registry.acquire("d")  # a 最久未使用，被卸载
+    stats = registry.stats()
+    print(f"注册表状态: {stats}")
+    assert set(stats["models"]) == {"c", "d"}
+    assert stats["evictions"] == 2
+
+    registry.acquire("a")  # 被卸载的模型重新加载
+    assert loader.calls == ["a", "b", "c", "d", "a"]
+
+
+def test_failed_load_is_not_cached():
+    """加载失败不占用注册表，下次获取重新加载"""
+    attempts = []
+
+    def flaky_loader(model_name, device):
+        attempts.append(model_name)
+        if len(attempts) == 1:
+            raise OSError("模型文件不存在")
+        return "pipeline"
+
+    registry = ModelRegistry(loader=flaky_loader)
+    try:
+        registry.acquire("gpt2")
+        assert False, "应当抛出 OSError"
+    except OSError:
+        pass
+    assert registry.stats()["models"] == {}
+    assert registry.acquire("gpt2") == "pipeline"
+
+
+def test_local_llm_shares_registry():
+    """多个 LocalLLM 共享同一模型，实例关闭或回收后释放引用"""
+    loader = FakeLoader()
+    registry = ModelRegistry(loader=loader)
+    first = LocalLLM(model_name="gpt2", registry=registry)
+    second = LocalLLM(model_name="gpt2", registry=registry)
+    assert first.generator is second.generator
+    assert loader.calls == ["gpt2"]
+    assert registry.stats()["models"] == {"gpt2": 2}
+
+    first.close()
+    first.close()  # 重复关闭不会重复释放
+    del second
+    gc.collect()
+    assert registry.stats()["models"] == {"gpt2": 0}
+
+
+if __name__ == "__main__":
+    test_concurrent_acquire_loads_once()
+    test_lru_eviction_skips_referenced_models()
+    test_failed_load_is_not_cached()
+    test_local_llm_shares_registry()
+    print("模型注册表测试通过！")
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""测试客户端限流"""
+import sys
+import asyncio
+import threading
+import time
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    RateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+)
+
+
+class FakeAPIError(Exception):
+    """带 HTTP 状态码的模拟 API 异常"""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_token_bucket_rate():
+    """突发量用尽后按速率放行"""
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.perf_counter()
+    for _ in range(15):
+        bucket.acquire()
+    elapsed = time.perf_counter() - start
+    print(f"15 次获取耗时: {elapsed:.3f}s")
+    assert 0.15 <= elapsed < 0.5  # 5 个突发 + 10 个按 50/s 放行
+
+
+def test_aimd_limits():
+    """过载时乘性减小，成功时加性增大"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, min_limit=1, max_limit=10)
+    limiter.acquire()
+    limiter.release(overloaded=True)
+    assert limiter.limit == 4
+    for _ in range(8):
+        limiter.acquire()
+        limiter.release()
+    assert 5 <= limiter.limit < 6
+    for _ in range(10):
+        limiter.acquire()
+        limiter.release(overloaded=True)
+    assert limiter.limit == 1
+
+
+def test_slot_detects_overload_and_bounds_concurrency():
+    """429 异常触发退避，在途请求数不超过并发上限"""
+    limiter = RateLimiter(initial_concurrency=4, max_concurrency=4)
+    peak = []
+    active = [0]
+    lock = threading.Lock()
+
+    def call(i):
+        try:
+            with limiter.slot():
+                with lock:
+                    active[0] += 1
+                    peak.append(active[0])
+                time.sleep(0.01)
+                with lock:
+                    active[0] -= 1
+                if i == 0:
+                    raise FakeAPIError(429)
+        except FakeAPIError:
+            pass
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = limiter.stats()
+    print(f"限流统计: {stats}, 并发峰值: {max(peak)}")
+    assert max(peak) <= 4
+    assert stats["overloads"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_async_slot_records_status():
+    """异步配额同样记录过载状态码"""
+    limiter = RateLimiter(initial_concurrency=2, requests_per_second=1000)
+
+    async def run():
+        async with limiter.aslot(tokens=10) as slot:
+            slot.record_status(503)
+
+    asyncio.run(run())
+    assert limiter.stats()["overloads"] == 1
+    assert limiter.concurrency.limit == 1
+
+
+def test_async_waiter_woken_on_release():
+    """同步调用方释放槽位时，等待中的异步调用方立即获得槽位，不等退避轮询"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    limiter.acquire()
+    released = []
+
+    def release_later():
+        time.sleep(0.3)  # 此时异步等待方的轮询间隔已退避到 100ms
+        released.append(time.perf_counter())
+        limiter.release()
+
+    async def run():
+        threading.Thread(target=release_later).start()
+        await limiter.aacquire()
+        return time.perf_counter() - released[0]
+
+    latency = asyncio.run(run())
+    print(f"释放到获得槽位: {latency * 1000:.1f}ms")
+    assert latency < 0.03
+    assert limiter.in_flight == 1
+
+
+def test_cancelled_async_waiter_returns_slot():
+    """被取消的异步等待方不占用槽位"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    limiter.acquire()
+
+    async def run():
+        waiter = asyncio.ensure_future(limiter.aacquire())
+        await asyncio.sleep(0.02)
+        limiter.release()  # 槽位移交给 waiter，唤醒回调执行前取消
+        waiter.cancel()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert limiter.in_flight == 0
+    limiter.acquire()
+    assert limiter.in_flight == 1
+
+
+def test_shared_registry():
+    """同名后端共享同一个限流器"""
+    first = get_rate_limiter("test-backend", requests_per_second=5)
+    assert get_rate_limiter("test-backend") is first
+    assert get_rate_limiter("other-backend") is not first
+
+
+if __name__ == "__main__":
+    test_token_bucket_rate()
+    test_aimd_limits()
+    test_slot_detects_overload_and_bounds_concurrency()
+    test_async_slot_records_status()
+    test_async_waiter_woken_on_release()
+    test_cancelled_async_waiter_returns_slot()
+    test_shared_registry()
+    print("限流测试通过！")
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""测试逐阶段产出事件的 respond_iter / arespond_iter"""
+import sys
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.stage_events import StageEvent
+from philosofia.core.stage_graph import StageGraph
+from fake_llms import SlowLLM
+
+DELAY = 0.1
+QUERY = "AI是否应该拥有权利？"
+GRAPH_STAGES = {"moral", "lifecycle", "cosmic", "entropy", "calibration"}
+
+
+def check_events(events, expected):
+    stages = [event.stage for event in events]
+    print(f"事件序列: {stages}")
+    assert all(isinstance(event, StageEvent) for event in events)
+    assert stages[:2] == ["domain", "perspectives"] and stages[-1] == "result"
+    assert sorted(stages[2:-1]) == sorted(GRAPH_STAGES)
+
+    by_stage = {event.stage: event.data for event in events}
+    result = by_stage["result"]
+    assert result.keys() == expected.keys()
+    assert result["dialectical_synthesis"] == expected["dialectical_synthesis"]
+    assert by_stage["calibration"]["dialectical_synthesis"] == result["dialectical_synthesis"]
+    assert by_stage["moral"]["passed"] == (result["moral_status"] == "passed")
+    assert by_stage["moral"]["perspectives"] == result["perspectives"]
+    assert by_stage["cosmic"] == result["cosmic_state"]
+    assert [s["name"] for s in result["reasoning_chain"]] == [
+        s["name"] for s in expected["reasoning_chain"]
+    ]
+
+
+def test_stage_graph_iter_run():
+    """阶段图按完成顺序产出阶段结果"""
+    graph = StageGraph()
+    graph.add("slow", lambda: time.sleep(0.1) or "slow")
+    graph.add("fast", lambda: "fast")
+    graph.add("both", lambda slow, fast: slow + fast, deps=("slow", "fast"))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert [name for name, _ in graph.iter_run(pool)] == ["fast", "slow", "both"]
+    assert [name for name, _ in graph.iter_run()] == ["slow", "fast", "both"]
+
+
+def test_respond_iter_events():
+    """事件按阶段产出，最后的结果与 respond 一致；三视角在后续 LLM 阶段完成前即可展示"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=SlowLLM(DELAY))
+    expected = agent.respond(QUERY)
+
+    start = time.perf_counter()
+    events, arrival = [], {}
+    for event in agent.respond_iter(QUERY):
+        arrival[event.stage] = time.perf_counter() - start
+        events.append(event)
+    print(f"三视角 {arrival['perspectives']:.3f}s，完整结果 {arrival['result']:.3f}s")
+
+    check_events(events, expected)
+    assert arrival["perspectives"] < DELAY * 1.5 < arrival["result"]
+    assert arrival["calibration"] > arrival["moral"]
+
+
+def test_arespond_iter_events():
+    """异步版本产出相同的事件"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=SlowLLM(DELAY))
+    expected = agent.respond(QUERY)
+
+    async def collect():
+        return [event async for event in agent.arespond_iter(QUERY)]
+
+    check_events(asyncio.run(collect()), expected)
+
+
+def test_early_stop_and_rules_mode():
+    """提前停止迭代不报错；纯规则模式同样产出全部事件"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=SlowLLM(DELAY))
+    events = agent.respond_iter(QUERY)
+    for event in events:
+        if event.stage == "perspectives":
+            break
+    events.close()
+
+    agent = PhilosophicallyAugmentedAgentSystem(llm=MockLLM(), use_llm=False)
+    events = list(agent.respond_iter(QUERY))
+    check_events(events, agent.respond(QUERY))
+    assert events[-1].to_dict()["stage"] == "result"
+
+
+if __name__ == "__main__":
+    test_stage_graph_iter_run()
+    test_respond_iter_events()
+    test_arespond_iter_events()
+    test_early_stop_and_rules_mode()
+    print("逐阶段事件测试通过！")
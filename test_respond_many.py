@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""测试批量回答 respond_many"""
+import sys
+import itertools
+import threading
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+from fake_llms import SlowLLM
+
+
+def test_ordered_results():
+    """默认按输入顺序产出，结果与逐个调用 respond 一致"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=MockLLM())
+    questions = [f"问题{i}：AI是否应该拥有权利？" for i in range(20)]
+    items = list(agent.respond_many(questions, max_workers=4))
+    assert [item["index"] for item in items] == list(range(20))
+    assert all(item["error"] is None for item in items)
+    expected = agent.respond(questions[0])
+    assert items[0]["question"] == questions[0]
+    assert items[0]["result"]["perspectives"] == expected["perspectives"]
+    assert [s["name"] for s in items[0]["result"]["reasoning_chain"]] == [
+        s["name"] for s in expected["reasoning_chain"]
+    ]
+
+
+def test_completion_order():
+    """按完成顺序产出时，慢问题不阻塞后续问题"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=SlowLLM(0.01, slow_marker="慢", slow_delay=0.2))
+    questions = ["慢问题"] + [f"快问题{i}" for i in range(5)]
+    indices = [item["index"] for item in agent.respond_many(questions, max_workers=3, ordered=False)]
+    print(f"完成顺序: {indices}")
+    assert sorted(indices) == list(range(6))
+    assert indices[-1] == 0
+
+
+def test_backpressure():
+    """问题按需读取，在途问题数不超过 max_pending"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=MockLLM(), use_llm=False)
+    consumed = []
+
+    def questions():
+        for i in itertools.count():
+            consumed.append(i)
+            yield f"问题{i}"
+
+    results = agent.respond_many(questions(), max_workers=2, max_pending=4)
+    first = [next(results) for _ in range(3)]
+    results.close()
+    print(f"产出 3 项时已读取 {len(consumed)} 个问题")
+    assert [item["index"] for item in first] == [0, 1, 2]
+    assert len(consumed) <= 3 + 4 + 1
+
+
+class FailingAgent(PhilosophicallyAugmentedAgentSystem):
+    def respond(self, user_query):
+        if "坏" in user_query:
+            raise RuntimeError("处理失败")
+        return super().respond(user_query)
+
+
+def test_errors_and_factory():
+    """单个问题失败不影响其他问题；agent_factory 为每个线程创建智能体"""
+    created = []
+    lock = threading.Lock()
+
+    def factory():
+        with lock:
+            created.append(threading.current_thread().name)
+        return FailingAgent(llm=MockLLM(), use_llm=False)
+
+    agent = PhilosophicallyAugmentedAgentSystem(llm=MockLLM(), use_llm=False)
+    items = list(agent.respond_many(["好", "坏", "好"] * 4, max_workers=2, agent_factory=factory))
+    assert [item["error"] for item in items[:3]] == [None, "处理失败", None]
+    assert items[1]["result"] is None
+    assert len(created) <= 2
+
+    try:
+        list(agent.respond_many(["问题"], executor="fiber"))
+        assert False, "应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+def test_process_pool():
+    """进程池模式在子进程中创建智能体"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=MockLLM(), use_llm=False)
+    items = list(agent.respond_many([f"问题{i}" for i in range(6)], max_workers=2, executor="process"))
+    assert [item["index"] for item in items] == list(range(6))
+    assert all(item["result"]["dialectical_synthesis"] for item in items)
+
+
+if __name__ == "__main__":
+    test_ordered_results()
+    test_completion_order()
+    test_backpressure()
+    test_errors_and_factory()
+    test_process_pool()
+    print("批量回答测试通过！")
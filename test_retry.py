@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""测试结构化错误、重试退避与对冲请求"""
+import sys
+import asyncio
+import threading
+import time
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.errors import (
+    LLMAPIError,
+    LLMRateLimitError,
+    LLMServerError,
+    LLMTimeoutError,
+    classify_error,
+)
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.moral_validator import MoralValidator
+from philosofia.core.normal_sampler import NormalDistributionSamplingGenerator
+from philosofia.core.retry import (
+    HedgePolicy,
+    RetryPolicy,
+    acall_with_retry,
+    call_with_retry,
+)
+
+
+class FakeAPIError(Exception):
+    """带 HTTP 状态码的模拟 SDK 异常"""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FailingLLM(MockLLM):
+    """始终抛出 LLMError 的 Mock LLM"""
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        raise LLMServerError("服务不可用", backend="mock", status_code=503)
+
+    def generate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        self.generate(prompt, system_prompt, temperature)
+
+    def generate_stream(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        yield "部分"
+        self.generate(prompt, system_prompt, temperature, max_tokens)
+
+
+def test_classify_error():
+    """SDK 异常按状态码与类型归类"""
+    assert isinstance(classify_error(FakeAPIError(429), "qwen"), LLMRateLimitError)
+    assert isinstance(classify_error(FakeAPIError(502), "qwen"), LLMServerError)
+    assert isinstance(classify_error(FakeAPIError(401), "qwen"), LLMAPIError)
+    assert isinstance(classify_error(TimeoutError("read timed out")), LLMTimeoutError)
+    error = classify_error(FakeAPIError(503), "deepseek")
+    print(f"归类结果: {type(error).__name__} {error}")
+    assert error.retryable and error.status_code == 503
+    assert str(error) == "[deepseek] HTTP 503"
+    assert not classify_error(FakeAPIError(400)).retryable
+
+
+def test_retry_until_success():
+    """可重试错误退避后重试，成功即返回"""
+    calls = []
+
+    def flaky():
+        calls.append(time.perf_counter())
+        if len(calls) < 3:
+            raise LLMServerError("临时故障", status_code=500)
+        return "成功"
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.02, jitter=False)
+    assert call_with_retry(flaky, policy) == "成功"
+    gaps = [b - a for a, b in zip(calls, calls[1:])]
+    print(f"重试间隔: {[round(g, 3) for g in gaps]}")
+    assert len(calls) == 3
+    assert gaps[0] >= 0.02 and gaps[1] >= 0.04  # 指数退避
+
+
+def test_non_retryable_and_exhausted():
+    """不可重试错误立即抛出，重试次数耗尽后抛出最后一次错误"""
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise LLMAPIError("参数错误", status_code=400)
+
+    try:
+        call_with_retry(bad_request, RetryPolicy(max_attempts=5, base_delay=0))
+        assert False, "应当抛出 LLMAPIError"
+    except LLMAPIError:
+        pass
+    assert len(calls) == 1
+
+    async def always_down():
+        calls.append(1)
+        raise LLMServerError("宕机", status_code=503)
+
+    calls.clear()
+    try:
+        asyncio.run(acall_with_retry(always_down, RetryPolicy(max_attempts=3, base_delay=0)))
+        assert False, "应当抛出 LLMServerError"
+    except LLMServerError:
+        pass
+    assert len(calls) == 3
+
+
+def test_retry_after_and_jitter():
+    """全抖动不超过退避上限，Retry-After 作为等待下限"""
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    assert all(0 <= policy.delay(3) <= 4.0 for _ in range(100))
+    error = LLMRateLimitError("限流", status_code=429, retry_after=2.5)
+    assert all(policy.delay(0, error) >= 2.5 for _ in range(20))
+
+
+def test_hedged_request():
+    """首个请求卡住时，对冲请求先返回"""
+    lock = threading.Lock()
+    calls = []
+
+    def slow_then_fast():
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        time.sleep(0.5 if first else 0.01)
+        return "慢" if first else "快"
+
+    hedge = HedgePolicy(delay=0.05)
+    start = time.perf_counter()
+    result = call_with_retry(slow_then_fast, hedge=hedge)
+    elapsed = time.perf_counter() - start
+    print(f"对冲结果: {result}，耗时 {elapsed:.3f}s")
+    assert result == "快" and elapsed < 0.3
+    assert hedge.hedged == 1 and hedge.hedge_wins == 1
+
+
+def test_hedge_adaptive_delay():
+    """对冲延迟在样本足够后取 p95"""
+    hedge = HedgePolicy(initial_delay=1.0, min_samples=10)
+    assert hedge.delay() == 1.0
+    for i in range(100):
+        hedge.observe(i / 100)
+    assert abs(hedge.delay() - 0.95) < 1e-9
+
+
+def test_modules_fall_back():
+    """LLM 调用失败时模块退回规则路径，并记录 llm_error"""
+    llm = FailingLLM()
+    ndsg = NormalDistributionSamplingGenerator(llm=llm)
+    result = ndsg.generate("AI是否应该拥有权利？")
+    assert result["perspectives"]["稳健共识 (μ)"] == ndsg.idea_distributions["ai_rights"]["mu"]
+    assert result["llm_error"] == "[mock] 服务不可用"
+
+    stream = ndsg.generate_stream("AI是否应该拥有权利？")
+    assert next(stream) == "部分"
+    try:
+        next(stream)
+    except StopIteration as stop:
+        assert "llm_error" in stop.value
+
+    biased = ndsg.generate_with_bias("AI是否应该拥有权利？", "ai_rights", bias_toward_mu=True)
+    assert biased["perspectives"]["前沿探索 (+2σ)"].startswith("[经伦理审查调整]")
+
+    moral = MoralValidator(llm=llm).validate("尊重每个人的选择")
+    assert "llm_error" in moral and "reasoning" not in moral
+
+
+if __name__ == "__main__":
+    test_classify_error()
+    test_retry_until_success()
+    test_non_retryable_and_exhausted()
+    test_retry_after_and_jitter()
+    test_hedged_request()
+    test_hedge_adaptive_delay()
+    test_modules_fall_back()
+    print("重试与对冲测试通过！")
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""测试多后端路由与故障切换"""
+import sys
+import asyncio
+import time
+from collections import Counter
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.errors import LLMServerError
+from philosofia.core.llm_interface import MockLLM, create_llm
+from philosofia.core.llm_router import RouterLLM
+
+
+class FakeBackend(MockLLM):
+    """固定延迟、可设置为故障的模拟后端"""
+
+    def __init__(self, name, latency=0.0, failing=False):
+        self.name = name
+        self.latency = latency
+        self.failing = failing
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self.failing:
+            raise LLMServerError("服务不可用", backend=self.name, status_code=503)
+        return f"{self.name}: {prompt}"
+
+    async def agenerate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        return self.generate(prompt, system_prompt, temperature, max_tokens)
+
+    def generate_stream(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        yield self.generate(prompt, system_prompt, temperature, max_tokens)
+
+
+def test_prefers_fastest_backend():
+    """试探过所有后端后，流量集中到 EWMA 延迟最低的后端"""
+    fast = FakeBackend("fast", latency=0.001)
+    slow = FakeBackend("slow", latency=0.02)
+    router = RouterLLM({"slow": slow, "fast": fast}, explore=0.0)
+    for i in range(20):
+        router.generate(f"问题{i}")
+    stats = router.stats()
+    print(f"路由统计: {stats}")
+    assert slow.calls == 1  # 仅首次试探
+    assert fast.calls == 19
+    assert stats["fast"]["latency_ms"] < stats["slow"]["latency_ms"]
+
+
+def test_failover_and_circuit_breaker():
+    """后端失败时切换到下一个后端，连续失败后熔断"""
+    primary = FakeBackend("primary", latency=0.001)
+    backup = FakeBackend("backup", latency=0.02)
+    router = RouterLLM(
+        {"primary": primary, "backup": backup},
+        explore=0.0,
+        failure_threshold=2,
+        cooldown=60,
+    )
+    for _ in range(3):
+        router.generate("你好")
+    assert primary.calls == 2 and backup.calls == 1
+
+    primary.failing = True
+    assert router.generate("你好") == "backup: 你好"  # 切换
+    assert router.generate("你好") == "backup: 你好"  # 第二次连续失败，熔断
+    calls = primary.calls
+    for _ in range(5):
+        assert router.generate("你好") == "backup: 你好"
+    stats = router.stats()
+    print(f"熔断后统计: {stats}")
+    assert primary.calls == calls  # 熔断期间不再尝试
+    assert stats["primary"]["open"] and stats["primary"]["failures"] == 2
+
+
+def test_all_backends_fail():
+    """全部后端失败时抛出最后一个 LLMError"""
+    router = RouterLLM(
+        {"a": FakeBackend("a", failing=True), "b": FakeBackend("b", failing=True)}
+    )
+    try:
+        router.generate("你好")
+        assert False, "应当抛出 LLMServerError"
+    except LLMServerError as e:
+        assert e.backend in ("a", "b")
+
+
+def test_weighted_split():
+    """提供权重时按权重随机分流"""
+    a = FakeBackend("a")
+    b = FakeBackend("b")
+    router = RouterLLM({"a": a, "b": b}, weights={"a": 3, "b": 1})
+    counts = Counter(router.generate("问题").split(":")[0] for _ in range(400))
+    print(f"分流结果: {dict(counts)}")
+    assert 240 <= counts["a"] <= 360
+
+
+def test_async_and_stream_failover():
+    """异步调用与流式调用同样会切换后端"""
+    router = RouterLLM(
+        {"broken": FakeBackend("broken", failing=True), "ok": FakeBackend("ok")},
+        explore=0.0,
+    )
+    assert asyncio.run(router.agenerate("你好")) == "ok: 你好"
+    router = RouterLLM(
+        {"broken": FakeBackend("broken", failing=True), "ok": FakeBackend("ok")},
+        explore=0.0,
+    )
+    assert "".join(router.generate_stream("你好")) == "ok: 你好"
+
+
+def test_create_router():
+    """create_llm 可以按配置创建路由"""
+    router = create_llm("router", backends={"mock": {}, "backup": FakeBackend("backup")})
+    assert isinstance(router, RouterLLM)
+    assert set(router.backends) == {"mock", "backup"}
+    try:
+        create_llm("router", backends={"mock": {}}, weights={"openai": 1})
+        assert False, "应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_prefers_fastest_backend()
+    test_failover_and_circuit_breaker()
+    test_all_backends_fail()
+    test_weighted_split()
+    test_async_and_stream_failover()
+    test_create_router()
+    print("多后端路由测试通过！")
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""测试初始采样的 single / parallel 模式"""
+import sys
+import asyncio
+import threading
+import time
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.errors import LLMTimeoutError
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.normal_sampler import (
+    PERSPECTIVE_MAX_TOKENS,
+    NormalDistributionSamplingGenerator,
+)
+
+DELAY = 0.1
+QUERY = "AI是否应该拥有权利？"
+
+
+class PerspectiveLLM(MockLLM):
+    """按提示返回单个视角或合题，每次调用耗时 DELAY 秒，并记录 max_tokens"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.max_tokens = []
+        self.lock = threading.Lock()
+
+    def _answer(self, prompt, max_tokens):
+        with self.lock:
+            self.max_tokens.append(max_tokens)
+        if self.fail_on and self.fail_on in prompt:
+            raise LLMTimeoutError("请求超时", backend="mock")
+        if "前沿探索" in prompt and "请给出" in prompt:
+            return "前沿探索 (+2σ): AI应享有有限的法律人格"
+        if "传统警示" in prompt and "请给出" in prompt:
+            return "AI只是工具，不应拥有权利"
+        if "请给出" in prompt:
+            return "在安全监管下讨论AI的道德地位"
+        if "请综合这三个视角" in prompt:
+            return "辩证合题: 应以渐进、可问责的方式讨论AI的道德地位"
+        return super().generate(prompt)
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        time.sleep(DELAY)
+        return self._answer(prompt, max_tokens)
+
+    async def agenerate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000):
+        await asyncio.sleep(DELAY)
+        return self._answer(prompt, max_tokens)
+
+
+def test_parallel_mode():
+    """三个视角并发生成（耗时约两轮调用），再生成合题"""
+    llm = PerspectiveLLM()
+    ndsg = NormalDistributionSamplingGenerator(llm=llm, sampling_mode="parallel")
+    start = time.perf_counter()
+    result = ndsg.generate(QUERY)
+    elapsed = time.perf_counter() - start
+    print(f"parallel 采样耗时 {elapsed:.3f}s: {result['perspectives']}")
+
+    assert elapsed < DELAY * 3
+    assert result["perspectives"] == {
+        "稳健共识 (μ)": "在安全监管下讨论AI的道德地位",
+        "前沿探索 (+2σ)": "AI应享有有限的法律人格",
+        "传统警示 (-2σ)": "AI只是工具，不应拥有权利",
+    }
+    assert result["synthesis"] == "应以渐进、可问责的方式讨论AI的道德地位"
+    assert "辩证合题:" in result["reasoning"]["response"]
+    assert sorted(llm.max_tokens)[:3] == [PERSPECTIVE_MAX_TOKENS] * 3
+
+    async_result = asyncio.run(ndsg.agenerate(QUERY))
+    assert async_result["perspectives"] == result["perspectives"]
+    assert async_result["synthesis"] == result["synthesis"]
+
+
+def test_mode_per_request():
+    """采样模式可以在每次回答时覆盖；无效模式报错"""
+    llm = PerspectiveLLM()
+    agent = PhilosophicallyAugmentedAgentSystem(llm=llm)
+    assert agent.respond(QUERY).keys() == agent.respond(QUERY, sampling_mode="parallel").keys()
+
+    # 初始采样的三视角（道德检验可能触发重新采样，最终输出中的视角不一定是初始视角）
+    def initial_perspectives(**kwargs):
+        for event in agent.respond_iter(QUERY, **kwargs):
+            if event.stage == "perspectives":
+                return event.data
+
+    parallel = initial_perspectives(sampling_mode="parallel")
+    assert parallel["前沿探索 (+2σ)"] == "AI应享有有限的法律人格"
+    assert initial_perspectives() != parallel
+
+    try:
+        agent.respond(QUERY, sampling_mode="fast")
+        assert False, "应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+def test_parallel_failure_falls_back():
+    """任一视角调用失败时退回预设答案，并记录失败原因"""
+    ndsg = NormalDistributionSamplingGenerator(
+        llm=PerspectiveLLM(fail_on="传统警示"), sampling_mode="parallel"
+    )
+    result = ndsg.generate(QUERY)
+    print(f"失败原因: {result['llm_error']}")
+    assert "传统警示" in result["llm_error"]
+    assert result["perspectives"] == ndsg._preset_answer("ai_rights")[0]
+
+
+if __name__ == "__main__":
+    test_parallel_mode()
+    test_mode_per_request()
+    test_parallel_failure_falls_back()
+    print("采样模式测试通过！")
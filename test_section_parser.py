@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""测试采样、道德检验与归零校准共用的分段解析"""
+import sys
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.heat_death_calibrator import HeatDeathCalibrationModule
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.moral_validator import MoralValidator
+from philosofia.core.normal_sampler import NormalDistributionSamplingGenerator
+from philosofia.core.section_parser import SectionParser, parse_verdict, strip_verdict
+
+SAMPLING_RESPONSE = """以下是三个视角：
+
+1. **稳健共识 (μ)**：在安全监管下讨论AI的道德地位，
+   并以现有法律框架为基础。
+2. **前沿探索 (+2σ)**: AI应享有有限的法律人格
+- 传统警示 (-2σ)：AI只是工具，不应拥有权利
+
+辩证合题:
+应以渐进、可问责的方式讨论AI的道德地位。
+"""
+
+
+def test_sections():
+    """标题行可带编号与 Markdown 标记，内容跨行拼接，中英文冒号均可"""
+    parser = SectionParser({"a": ("甲",), "b": ("乙", "beta")})
+    sections = parser.parse("前言\n1. **甲**：第一行\n第二行\n\nBETA: 英文标签\n甲: 重复段被忽略")
+    print(sections)
+    assert sections["a"].text == "第一行 第二行"
+    assert sections["a"].header == "1. **甲**：第一行"
+    assert sections["b"].text == "英文标签"
+
+    # 标签不在行首时不算标题
+    assert parser.parse("这一行提到了甲: 但不是标题") == {}
+
+
+def test_short_labels_and_repeated_headers():
+    """短标签后必须紧跟冒号；没有冒号的标题行被之后带冒号的同名标题取代"""
+    parser = SectionParser({"a": ("甲",), "s": ("辩证合题", "合题:")})
+    sections = parser.parse("甲: 内容\n- 合题思维很重要\n**合题**：D")
+    assert sections["a"].text == "内容 - 合题思维很重要"
+    assert sections["s"].text == "D"
+
+    sections = parser.parse("辩证合题思维很重要\n辩证合题: D\n辩证合题: 重复段被忽略")
+    assert sections["s"].text == "D"
+
+    # 回归：正文中以“合题”开头的行不再截断合题
+    ndsg = NormalDistributionSamplingGenerator(llm=MockLLM())
+    perspectives, synthesis = ndsg._parse_sections(
+        "稳健共识 (μ): A\n前沿探索 (+2σ): B\n- 合题思维很重要\n传统警示 (-2σ): C\n辩证合题: D"
+    )
+    print(perspectives, synthesis)
+    assert synthesis == "D"
+    assert perspectives["前沿探索 (+2σ)"] == "B - 合题思维很重要"
+    assert ndsg._parse_sections("μ: A\nSynthesis: D")[1] == "D"
+
+
+def test_verdicts():
+    """检验结论：失败优先于通过，“不通过 / 未通过”视为失败"""
+    assert parse_verdict("可普遍化: 通过 - 推理") is True
+    assert parse_verdict("Humanity: PASS") is True
+    assert parse_verdict("自主性: 不通过") is False
+    assert parse_verdict("通过与否：失败") is False
+    assert parse_verdict("尚无结论") is None
+    assert strip_verdict("通过 - 承认有限性") == "承认有限性"
+    assert strip_verdict("[失败]：陷入虚无主义") == "陷入虚无主义"
+
+
+def test_sampler_response():
+    """三视角与合题一次解析；没有合题段时以最后一段作为合题"""
+    ndsg = NormalDistributionSamplingGenerator(llm=MockLLM())
+    perspectives, synthesis = ndsg._parse_sections(SAMPLING_RESPONSE)
+    print(perspectives)
+    assert perspectives == {
+        "稳健共识 (μ)": "在安全监管下讨论AI的道德地位， 并以现有法律框架为基础。",
+        "前沿探索 (+2σ)": "AI应享有有限的法律人格",
+        "传统警示 (-2σ)": "AI只是工具，不应拥有权利",
+    }
+    assert synthesis == "应以渐进、可问责的方式讨论AI的道德地位。"
+
+    _, synthesis = ndsg._parse_sections("第一段\n\n最后一段")
+    assert synthesis == "最后一段"
+
+
+def test_validator_and_calibrator():
+    """道德检验与归零校准的文本回答"""
+    validator = MoralValidator(llm=MockLLM())
+    result = validator._parse_validation_response(
+        "可普遍化: 通过 - 不会导致矛盾\n人性目的: 失败 - 把人当作手段\nAutonomy: pass"
+    )
+    assert result == {"universalizable": True, "humanity_respected": False, "autonomous": True}
+
+    # 结果写在检验标题下一行
+    result = validator._parse_validation_response(
+        "1. **可普遍化检验**：\n   - 推理：不会导致矛盾\n   - 结果：通过"
+    )
+    assert result["universalizable"] is True and result["autonomous"] is False
+
+    calibrator = HeatDeathCalibrationModule(llm=MockLLM())
+    result = calibrator._calibration_result(
+        {"response": "归零检验: 通过 - 承认有限性并维护理性尊严\n校准透镜: 星辰终将熄灭\n"
+                     "校准后的回答: 在有限中守护尊严。"},
+        "原始回答",
+        "moral",
+    )
+    assert result["heat_death_check"] == {"passed": True, "reason": "承认有限性并维护理性尊严"}
+    assert result["calibrated_response"] == "在有限中守护尊严。"
+
+    result = calibrator._calibration_result(
+        {"response": "校准透镜: 星辰终将熄灭"}, "原始回答", "moral"
+    )
+    assert result["heat_death_check"]["passed"] is False
+    assert result["calibrated_response"] == "原始回答\n\n[宇宙校准] 星辰终将熄灭"
+
+
+def test_json_responses():
+    """JSON 回答直接按字段名读取"""
+    validator = MoralValidator(llm=MockLLM())
+    result = validator._parse_validation_response(
+        '```json\n{"universalizable": true, "humanity_respected": false, "autonomous": true}\n```'
+    )
+    assert result == {"universalizable": True, "humanity_respected": False, "autonomous": True}
+
+    calibrator = HeatDeathCalibrationModule(llm=MockLLM())
+    result = calibrator._calibration_result(
+        {"response": '{"heat_death_passed": true, "reason": "维护了理性尊严", '
+                     '"lens": "星辰终将熄灭", "calibrated_response": "在有限中守护尊严。"}'},
+        "原始回答",
+        "moral",
+    )
+    assert result["heat_death_check"] == {"passed": True, "reason": "维护了理性尊严"}
+    assert result["calibrated_response"] == "在有限中守护尊严。"
+
+    ndsg = NormalDistributionSamplingGenerator(llm=MockLLM())
+    perspectives, synthesis = ndsg._parse_sections(
+        '{"mu": "平衡", "positive_tail": "激进", "negative_tail": "保守", "synthesis": "合题"}'
+    )
+    assert list(perspectives.values()) == ["平衡", "激进", "保守"] and synthesis == "合题"
+
+    # 看似 JSON 但无法解析时按文本处理
+    _, synthesis = ndsg._parse_sections("{不是 JSON\n辩证合题: 合题")
+    assert synthesis == "合题"
+
+
+if __name__ == "__main__":
+    test_sections()
+    test_short_labels_and_repeated_headers()
+    test_verdicts()
+    test_sampler_response()
+    test_validator_and_calibrator()
+    test_json_responses()
+    print("分段解析测试通过！")
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""测试推测式道德重试"""
+import sys
+import asyncio
+import threading
+import time
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.speculation import SpeculationStats
+
+DELAY = 0.15
+
+
+class MoralRetryLLM(MockLLM):
+    """每次调用耗时 DELAY 秒；前 failures 次道德检验返回失败"""
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.validations = 0
+        self.resamples = 0
+        self.cancelled = 0
+        self.lock = threading.Lock()
+
+    def _answer(self, prompt, system_prompt):
+        if system_prompt and "康德式道德哲学家" in system_prompt:
+            with self.lock:
+                self.validations += 1
+                failed = self.validations <= self.failures
+            verdict = "失败" if failed else "通过"
+            return f"可普遍化: {verdict} - 推理\n人性目的: 通过 - 推理\n自主性: 通过 - 推理"
+        if system_prompt and "未能通过道德检验" in system_prompt:
+            with self.lock:
+                self.resamples += 1
+            return (
+                "稳健共识 (μ): 审慎推进\n前沿探索 (+2σ): [经伦理审查调整] 积极探索\n"
+                "传统警示 (-2σ): [经伦理审查调整] 保持警惕\n辩证合题: 应在尊重人的前提下审慎推进"
+            )
+        return super().generate(prompt, system_prompt)
+
+    def generate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        time.sleep(DELAY)
+        return {"response": self._answer(prompt, system_prompt), "reasoning_steps": [], "confidence": 0.7}
+
+    async def agenerate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        try:
+            await asyncio.sleep(DELAY)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"response": self._answer(prompt, system_prompt), "reasoning_steps": [], "confidence": 0.7}
+
+
+def timed_respond(speculative, stats=None):
+    llm = MoralRetryLLM(failures=1)
+    agent = PhilosophicallyAugmentedAgentSystem(
+        llm=llm, speculative_retry=speculative, speculation_stats=stats
+    )
+    start = time.perf_counter()
+    result = agent.respond("AI是否应该拥有权利？")
+    return time.perf_counter() - start, result, llm
+
+
+def test_speculative_retry_saves_round_trip():
+    """道德检验失败时，推测启动的重新采样节省一轮往返"""
+    stats = SpeculationStats()
+    serial, serial_result, _ = timed_respond(False)
+    speculative, result, llm = timed_respond(True, stats)
+    time.sleep(DELAY * 2)  # 等待被丢弃的推测调用结束并计入统计
+    snapshot = stats.snapshot()
+    print(f"串行 {serial:.3f}s，推测 {speculative:.3f}s，统计: {snapshot}")
+
+    assert result["moral_status"] == serial_result["moral_status"] == "passed"
+    assert [s["name"] for s in result["reasoning_chain"]] == [
+        s["name"] for s in serial_result["reasoning_chain"]
+    ]
+    assert speculative < serial - DELAY * 0.5
+    assert snapshot["speculations"] == 2 and snapshot["used"] == 1 and snapshot["discarded"] == 1
+    assert snapshot["saved_seconds"] > DELAY * 0.5
+    assert snapshot["wasted_tokens"] > 0
+    assert llm.resamples == 2  # 第二次推测的采样被丢弃
+
+
+def test_speculation_disabled_without_llm():
+    """纯规则模式不做推测"""
+    stats = SpeculationStats()
+    agent = PhilosophicallyAugmentedAgentSystem(
+        llm=MockLLM(), use_llm=False, speculative_retry=True, speculation_stats=stats
+    )
+    agent.respond("AI是否应该拥有权利？")
+    assert stats.snapshot()["speculations"] == 0
+
+
+def test_async_speculation_cancels_discarded_call():
+    """异步模式下检验通过时，进行中的推测调用被取消"""
+    stats = SpeculationStats()
+    llm = MoralRetryLLM(failures=0)
+    agent = PhilosophicallyAugmentedAgentSystem(
+        llm=llm, speculative_retry=True, speculation_stats=stats
+    )
+    result = asyncio.run(agent.arespond("AI是否应该拥有权利？"))
+    snapshot = stats.snapshot()
+    print(f"异步统计: {snapshot}")
+    assert result["moral_status"] == "passed"
+    assert snapshot["discarded"] == 1 and snapshot["used"] == 0
+    assert llm.cancelled >= 1
+
+
+if __name__ == "__main__":
+    test_speculative_retry_saves_round_trip()
+    test_speculation_disabled_without_llm()
+    test_async_speculation_cancels_discarded_call()
+    print("推测式重试测试通过！")
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""测试阶段依赖图与智能体阶段并发执行"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.stage_graph import StageGraph
+
+
+def sleep_then(value, seconds=0.1):
+    def stage(**deps):
+        time.sleep(seconds)
+        return value
+    return stage
+
+
+def test_independent_stages_run_concurrently():
+    """独立阶段并发执行，总耗时约为关键路径"""
+    graph = StageGraph()
+    graph.add("a", sleep_then(1))
+    graph.add("b", sleep_then(2))
+    graph.add("c", sleep_then(3))
+    graph.add("sum", lambda a, b, c: a + b + c, deps=("a", "b", "c"))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        start = time.perf_counter()
+        results = graph.run(pool)
+        elapsed = time.perf_counter() - start
+    print(f"并发执行耗时: {elapsed:.3f}s，阶段耗时: {graph.durations}")
+    assert results["sum"] == 6
+    assert elapsed < 0.25  # 串行需 0.3s
+
+
+def test_sequential_run_and_validation():
+    """不提供执行器时按添加顺序串行执行；依赖未定义的阶段时报错"""
+    order = []
+    graph = StageGraph()
+    graph.add("first", lambda: order.append("first") or 1)
+    graph.add("second", lambda first: order.append("second") or first + 1, deps=["first"])
+    assert graph.run() == {"first": 1, "second": 2}
+    assert order == ["first", "second"]
+
+    try:
+        StageGraph().add("x", lambda y: y, deps=("y",))
+        assert False, "应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+def test_stage_error_propagates():
+    """阶段异常原样抛出"""
+    graph = StageGraph()
+    graph.add("ok", sleep_then(1, 0.01))
+    graph.add("bad", lambda: 1 / 0)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        try:
+            graph.run(pool)
+            assert False, "应当抛出 ZeroDivisionError"
+        except ZeroDivisionError:
+            pass
+
+
+class ThreadRecordingLLM(MockLLM):
+    """记录 LLM 调用所在线程的 Mock LLM"""
+
+    def __init__(self):
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def generate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        with self.lock:
+            self.threads.add(threading.current_thread().name)
+        return super().generate_with_reasoning(prompt, system_prompt, temperature)
+
+
+def test_agent_parallel_matches_sequential():
+    """并发与串行执行的回答结构、推理链一致"""
+    query = "AI是否应该拥有权利？"
+    llm = ThreadRecordingLLM()
+    parallel = PhilosophicallyAugmentedAgentSystem(llm=llm, parallel_stages=True).respond(query)
+    sequential = PhilosophicallyAugmentedAgentSystem(
+        llm=MockLLM(), parallel_stages=False
+    ).respond(query)
+
+    print(f"LLM 调用线程: {sorted(llm.threads)}")
+    assert any(name.startswith("philosofia-stage") for name in llm.threads)
+    assert parallel.keys() == sequential.keys()
+    assert parallel["lifecycle_analyses"] == sequential["lifecycle_analyses"]
+    assert [step["name"] for step in parallel["reasoning_chain"]] == [
+        step["name"] for step in sequential["reasoning_chain"]
+    ]
+
+
+if __name__ == "__main__":
+    test_independent_stages_run_concurrently()
+    test_sequential_run_and_validation()
+    test_stage_error_propagates()
+    test_agent_parallel_matches_sequential()
+    print("阶段依赖图测试通过！")
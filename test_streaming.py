@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""测试流式生成"""
+import sys
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+
+
+def test_mock_generate_stream():
+    """MockLLM 的流式片段拼接后与 generate 一致"""
+    llm = MockLLM()
+    prompt = "AI应该拥有权利吗？"
+    pieces = list(llm.generate_stream(prompt))
+    print(f"流式片段数: {len(pieces)}")
+    assert len(pieces) > 1
+    assert "".join(pieces) == llm.generate(prompt)
+
+
+def test_respond_stream():
+    """respond_stream 按顺序产出事件，最终结果与 respond 一致"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=MockLLM())
+    query = "AI应该拥有权利吗？"
+
+    events = list(agent.respond_stream(query))
+    kinds = [event["event"] for event in events]
+    print(f"事件序列: {kinds}")
+
+    assert kinds[0] == "delta"
+    assert kinds[-3:] == ["perspectives", "synthesis", "done"]
+    assert set(kinds[:-3]) == {"delta"}
+
+    streamed = events[-1]["result"]
+    expected = agent.respond(query)
+    assert events[-3]["perspectives"] == agent.ndsg.generate(query)["perspectives"]
+    assert streamed["perspectives"] == expected["perspectives"]
+    assert streamed["dialectical_synthesis"] == events[-2]["text"]
+    assert streamed["dialectical_synthesis"] == expected["dialectical_synthesis"]
+    assert streamed["moral_status"] == expected["moral_status"]
+    assert [s["name"] for s in streamed["reasoning_chain"]] == [
+        s["name"] for s in expected["reasoning_chain"]
+    ]
+
+
+if __name__ == "__main__":
+    test_mock_generate_stream()
+    test_respond_stream()
+    print("流式生成测试通过！")
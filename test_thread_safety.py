@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""测试同一智能体被多个线程 / 协程同时调用时各请求的推理链互不干扰"""
+import sys
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+
+QUESTIONS = [
+    "AI是否应该拥有权利？",
+    "监控与隐私如何平衡？",
+    "生命的意义是什么？",
+    "科技发展是否需要伦理约束？",
+    "死亡是否赋予生命意义？",
+    "基因编辑是否道德？",
+]
+THREADS = 16
+ROUNDS = 12
+
+
+class JitterLLM(MockLLM):
+    """每次调用随机等待几毫秒，让不同请求的阶段交错执行"""
+
+    def __init__(self, max_delay=0.005):
+        self.max_delay = max_delay
+
+    def generate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        time.sleep(random.uniform(0, self.max_delay))
+        return super().generate_with_reasoning(prompt, system_prompt, temperature)
+
+    async def agenerate_with_reasoning(self, prompt, system_prompt=None, temperature=0.7):
+        await asyncio.sleep(random.uniform(0, self.max_delay))
+        return super().generate_with_reasoning(prompt, system_prompt, temperature)
+
+
+def chain_signature(result):
+    return [(step["name"], step["description"]) for step in result["reasoning_chain"]]
+
+
+def check_result(question, result, expected):
+    chain = result["reasoning_chain"]
+    assert [step["step"] for step in chain] == list(range(1, len(chain) + 1)), question
+    assert chain_signature(result) == expected[question], question
+    assert result["degraded_stages"] == []
+
+
+def sequential_baseline():
+    """单线程逐个回答得到的推理链，作为并发结果的对照"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=MockLLM())
+    return {q: chain_signature(agent.respond(q)) for q in QUESTIONS}
+
+
+def test_threads_share_one_agent():
+    """多个线程同时调用同一个智能体，每个结果的推理链与单独调用时一致"""
+    expected = sequential_baseline()
+    agent = PhilosophicallyAugmentedAgentSystem(llm=JitterLLM())
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(THREADS * ROUNDS)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(agent.respond, questions))
+    print(f"{len(results)} 个请求，{THREADS} 个线程，耗时 {time.perf_counter() - start:.2f}s")
+
+    for question, result in zip(questions, results):
+        check_result(question, result, expected)
+
+
+def test_concurrent_deadlines_are_isolated():
+    """一个请求的截止时间与降级记录不影响同时进行的其他请求"""
+    agent = PhilosophicallyAugmentedAgentSystem(llm=JitterLLM(max_delay=0.2))
+    jobs = [(q, 30 if i % 2 else None) for i, q in enumerate(QUESTIONS * 2)]
+
+    with ThreadPoolExecutor(len(jobs)) as pool:
+        results = list(pool.map(lambda job: agent.respond(job[0], budget_ms=job[1]), jobs))
+
+    for (question, budget), result in zip(jobs, results):
+        if budget is None:
+            assert result["degraded_stages"] == [], question
+            assert "超出时间预算" not in [s["name"] for s in result["reasoning_chain"]]
+        else:
+            assert result["degraded_stages"], question
+    print(f"限时请求的降级阶段: {results[1]['degraded_stages']}")
+
+
+def test_async_requests_share_one_agent():
+    """同一事件循环中并发等待多个 arespond"""
+    expected = sequential_baseline()
+    agent = PhilosophicallyAugmentedAgentSystem(llm=JitterLLM())
+    questions = QUESTIONS * 8
+
+    async def main():
+        return await asyncio.gather(*(agent.arespond(q) for q in questions))
+
+    for question, result in zip(questions, asyncio.run(main())):
+        check_result(question, result, expected)
+
+
+if __name__ == "__main__":
+    test_threads_share_one_agent()
+    test_concurrent_deadlines_are_isolated()
+    test_async_requests_share_one_agent()
+    print("并发调用测试通过！")
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""测试推理链追踪级别"""
+import sys
+import json
+
+# 设置UTF-8编码
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from philosofia.core.agent_system import PhilosophicallyAugmentedAgentSystem
+from philosofia.core.llm_interface import MockLLM
+from philosofia.core.trace import ReasoningStep
+
+QUERY = "AI是否应该拥有权利？"
+
+
+def respond(trace):
+    return PhilosophicallyAugmentedAgentSystem(llm=MockLLM(), trace=trace).respond(QUERY)
+
+
+def test_trace_levels():
+    """full 保留 details，summary 只保留名称与描述，off 不记录"""
+    full = respond("full")
+    summary = respond("summary")
+    off = respond("off")
+
+    assert any("details" in step for step in full["reasoning_chain"])
+    assert all(set(step) == {"step", "name", "description"} for step in summary["reasoning_chain"])
+    assert [s["name"] for s in summary["reasoning_chain"]] == [s["name"] for s in full["reasoning_chain"]]
+    assert off["reasoning_chain"] == []
+    # 输出中的步骤是普通字典，结果可以直接 json.dump
+    assert all(type(step) is dict for step in full["reasoning_chain"])
+    assert full.keys() == summary.keys() == off.keys()
+    assert off["dialectical_synthesis"] == full["dialectical_synthesis"]
+
+    sizes = {
+        name: len(json.dumps(result, ensure_ascii=False))
+        for name, result in (("full", full), ("summary", summary), ("off", off))
+    }
+    print(f"序列化大小: {sizes}")
+    assert sizes["full"] > sizes["summary"] > sizes["off"]
+
+
+def test_reasoning_step_record():
+    """步骤记录是槽位对象，支持字典式读取"""
+    step = ReasoningStep(1, "问题域分类", "识别问题域：ai_rights")
+    assert not hasattr(step, "__dict__")
+    assert step["name"] == "问题域分类" and step.get("details") is None
+    assert "details" not in step
+    assert dict(step) == step.to_dict() == {"step": 1, "name": "问题域分类", "description": "识别问题域：ai_rights"}
+
+    details = {"response": "…"}
+    step = ReasoningStep(2, "正态采样生成", "生成三视角", details)
+    assert step.to_dict()["details"] is details  # 只保存引用，不复制
+
+
+def test_invalid_trace_level():
+    try:
+        PhilosophicallyAugmentedAgentSystem(llm=MockLLM(), trace="verbose")
+        assert False, "应当抛出 ValueError"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_trace_levels()
+    test_reasoning_step_record()
+    test_invalid_trace_level()
+    print("推理链追踪级别测试通过！")